@@ -81,6 +81,10 @@ DATABASES = {
     }
 }
 
+# SQLite 연결 PRAGMA (scheduler/sqlite.py). 기본은 busy_timeout과 mmap만 설정한다.
+# WAL은 DB 파일에 기록되므로 운영 DB에서만 켠다.
+# SQLITE_PRAGMAS = {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 20000, 'mmap_size': 268435456}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
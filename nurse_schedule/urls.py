@@ -25,4 +25,13 @@ urlpatterns = [
     path('staffing/<int:pk>/', views.update_staffing, name='update_staffing'),
     path('regenerate/', views.regenerate_schedule, name='regenerate_schedule'),
     path('delete/', views.delete_schedule, name='delete_schedule'),
+    path('shifts/edit/', views.edit_shifts, name='edit_shifts'),
+    path('substitutes/', views.substitute_candidates, name='substitute_candidates'),
+    path('swaps/', views.swap_partners, name='swap_partners'),
+    path('reports/', views.generation_reports, name='generation_reports'),
+    path('reports/<int:pk>/', views.generation_report, name='generation_report'),
+    path('candidates/', views.roster_candidates, name='roster_candidates'),
+    path('candidates/compare/', views.compare_roster_candidates, name='compare_roster_candidates'),
+    path('candidates/<int:pk>/', views.roster_candidate, name='roster_candidate'),
+    path('candidates/<int:pk>/activate/', views.activate_roster_candidate, name='activate_roster_candidate'),
 ]
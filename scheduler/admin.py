@@ -1,18 +1,46 @@
 from django.contrib import admin
-from .models import Nurse, Schedule, StaffingRequirement
+from .models import Ward, Nurse, Schedule, StaffingRequirement, WantedOff, FairnessLedger, GenerationReport, RosterCandidate
+
+@admin.register(Ward)
+class WardAdmin(admin.ModelAdmin):
+    list_display = ['code', 'name']
+    search_fields = ['code', 'name']
 
 @admin.register(Nurse)
 class NurseAdmin(admin.ModelAdmin):
-    list_display = ['name', 'employee_id', 'skill_level', 'is_night_keeper']
+    list_display = ['name', 'employee_id', 'ward', 'skill_level', 'is_night_keeper']
     search_fields = ['name', 'employee_id']
-    list_filter = ['skill_level', 'is_night_keeper']
+    list_filter = ['ward', 'skill_level', 'is_night_keeper']
 
 @admin.register(Schedule)
 class ScheduleAdmin(admin.ModelAdmin):
-    list_display = ['nurse', 'date', 'shift']
-    list_filter = ['date', 'shift']
+    list_display = ['nurse', 'date', 'shift', 'ward']
+    list_filter = ['ward', 'date', 'shift']
     search_fields = ['nurse__name']
 
 @admin.register(StaffingRequirement)
 class StaffingRequirementAdmin(admin.ModelAdmin):
-    list_display = ['shift', 'required_staff']
+    list_display = ['ward', 'shift', 'required_staff']
+    list_filter = ['ward']
+
+@admin.register(WantedOff)
+class WantedOffAdmin(admin.ModelAdmin):
+    list_display = ['nurse', 'date', 'reason', 'status', 'decided_at']
+    list_filter = ['status', 'date']
+    search_fields = ['nurse__name', 'nurse__employee_id']
+
+@admin.register(FairnessLedger)
+class FairnessLedgerAdmin(admin.ModelAdmin):
+    list_display = ['nurse', 'd_count', 'e_count', 'n_count', 'off_count', 'weekend_count', 'holiday_count', 'updated_at']
+    search_fields = ['nurse__name']
+
+@admin.register(GenerationReport)
+class GenerationReportAdmin(admin.ModelAdmin):
+    list_display = ['id', 'created_at', 'start_date', 'end_date', 'ward', 'engine', 'saved_count', 'elapsed', 'timed_out']
+    list_filter = ['ward', 'engine', 'timed_out']
+
+@admin.register(RosterCandidate)
+class RosterCandidateAdmin(admin.ModelAdmin):
+    list_display = ['id', 'start_date', 'end_date', 'ward', 'engine', 'seed', 'score', 'is_active', 'created_at']
+    list_filter = ['ward', 'is_active']
+    exclude = ['packed']
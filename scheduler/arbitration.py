@@ -0,0 +1,102 @@
+"""
+원티드 OFF 요청 조정 모듈
+
+하루에 OFF를 줄 수 있는 인원(전체 간호사 - 필요 근무 인원)보다 요청이 많으면
+우선순위 힙으로 승인할 요청을 고른다.
+
+우선순위 (작을수록 먼저 승인):
+    1. 누적 (승인 수 - 반려 수) - 이전 기간 이력에서 시작해 이번 조정 결과로 갱신
+    2. 연차(숙련도)가 높은 간호사
+    3. 먼저 등록한 요청
+
+경쟁이 심한 날부터 처리하므로 한 사람이 여러 날을 연달아 독차지하지 않는다.
+"""
+import heapq
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import WantedOff
+
+
+def off_capacity(nurse_count, shift_requirements):
+    """하루에 OFF를 줄 수 있는 최대 인원"""
+    required = sum(shift_requirements.get(shift, 0) for shift in ('D', 'E', 'N'))
+    return max(0, nurse_count - required)
+
+
+def arbitrate_wanted_offs(nurse_list, start_date, end_date, shift_requirements, commit=True):
+    """
+    기간 내 원티드 OFF 요청을 승인/반려로 조정하는 함수
+
+    Args:
+        nurse_list: 간호사 목록
+        start_date: 시작 날짜
+        end_date: 종료 날짜
+        shift_requirements: 각 근무별 필요 인원 수 {'D': int, 'E': int, 'N': int}
+        commit: True이면 조정 결과를 WantedOff.status에 저장
+
+    Returns:
+        {
+            'granted': 승인된 요청 수,
+            'denied': [(nurse_id, date), ...] 반려된 요청,
+            'contested_days': [(date, 요청 수, 가능 인원), ...] 요청이 가능 인원을 넘은 날,
+        }
+    """
+    nurses_by_id = {nurse.id: nurse for nurse in nurse_list}
+    capacity = off_capacity(len(nurse_list), shift_requirements)
+    result = {'granted': 0, 'denied': [], 'contested_days': []}
+
+    requests = list(WantedOff.objects.filter(
+        date__range=[start_date, end_date], nurse_id__in=list(nurses_by_id)
+    ).order_by('created_at', 'id').values_list('id', 'nurse_id', 'date'))
+    if not requests:
+        return result
+
+    # 이전 기간의 승인/반려 이력을 한 번에 집계
+    balance = {nurse_id: 0 for nurse_id in nurses_by_id}
+    for row in WantedOff.objects.filter(
+        date__lt=start_date, nurse_id__in=list(nurses_by_id)
+    ).values('nurse_id').annotate(
+        granted=Count('id', filter=Q(status='granted')),
+        denied=Count('id', filter=Q(status='denied')),
+    ):
+        balance[row['nurse_id']] = row['granted'] - row['denied']
+
+    requests_by_day = {}
+    for order, (request_id, nurse_id, day) in enumerate(requests):
+        requests_by_day.setdefault(day, []).append((order, request_id, nurse_id))
+
+    # 경쟁이 심한 날부터 처리
+    denied_ids = set()
+    contested = sorted(
+        (day for day, day_requests in requests_by_day.items() if len(day_requests) > capacity),
+        key=lambda day: (capacity - len(requests_by_day[day]), day),
+    )
+    for day in contested:
+        day_requests = requests_by_day[day]
+        result['contested_days'].append((day, len(day_requests), capacity))
+        heap = [
+            (balance[nurse_id], -nurses_by_id[nurse_id].skill_level, order, request_id, nurse_id)
+            for order, request_id, nurse_id in day_requests
+        ]
+        heapq.heapify(heap)
+        for _ in range(capacity):
+            *_, nurse_id = heapq.heappop(heap)
+            balance[nurse_id] += 1
+        for *_, request_id, nurse_id in heap:
+            denied_ids.add(request_id)
+            balance[nurse_id] -= 1
+            result['denied'].append((nurse_id, day))
+
+    # 경쟁이 없는 날의 요청은 모두 승인
+    result['granted'] = len(requests) - len(denied_ids)
+
+    if commit:
+        now = timezone.now()
+        WantedOff.objects.filter(
+            date__range=[start_date, end_date], nurse_id__in=list(nurses_by_id)
+        ).update(status='granted', decided_at=now)
+        if denied_ids:
+            WantedOff.objects.filter(id__in=denied_ids).update(status='denied', decided_at=now)
+    return result
@@ -0,0 +1,249 @@
+"""
+마감된 근무표 보관 모듈
+
+지난 달의 Schedule 행(간호사-일 하나당 한 행)을 간호사-월 하나당 한 행인 ArchivedSchedule로
+옮겨 근무 테이블을 작게 유지한다. 한 달의 근무는 1일부터 하루 한 글자인 문자열로 저장한다.
+
+    D/E/N - 근무, O - OFF, . - 근무표가 없던 날
+
+조회는 schedule_rows()로 하면 보관된 달과 근무 테이블을 구분하지 않고 (nurse_id, date, shift)로
+돌려받는다. 같은 칸이 두 곳에 있으면 근무 테이블의 값이 우선한다.
+누적 근무 통계(FairnessLedger)는 보관된 근무도 그대로 포함한다.
+"""
+import calendar
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max, Min
+
+from .ledger import apply_changes
+from .models import ArchivedSchedule, Schedule
+
+# 근무 한 칸을 한 글자로 (근무표 후보 풀의 근무 문자열도 같은 코드를 씀)
+SHIFT_CODES = {'D': 'D', 'E': 'E', 'N': 'N', 'OFF': 'O'}
+CODE_SHIFTS = {code: shift for shift, code in SHIFT_CODES.items()}
+EMPTY_CODE = '.'
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(day):
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def next_month(day):
+    return month_end(day) + timedelta(days=1)
+
+
+def unpack_month(month, shifts):
+    """보관 문자열을 (date, shift)로 펼침 (근무표가 없던 날 제외)"""
+    for offset, code in enumerate(shifts):
+        if code != EMPTY_CODE:
+            yield month + timedelta(days=offset), CODE_SHIFTS[code]
+
+
+def schedule_rows(start_date, end_date, nurse_ids=None):
+    """
+    기간의 근무를 근무 테이블과 보관 근무표에서 함께 조회하는 함수
+
+    Args:
+        start_date: 시작 날짜
+        end_date: 종료 날짜
+        nurse_ids: 대상 간호사 id 목록 (None이면 전체)
+
+    Returns:
+        [(nurse_id, date, shift), ...]
+    """
+    rows = {}
+    archived = ArchivedSchedule.objects.filter(month__range=[month_start(start_date), end_date])
+    if nurse_ids is not None:
+        archived = archived.filter(nurse_id__in=list(nurse_ids))
+    for nurse_id, month, shifts in archived.values_list('nurse_id', 'month', 'shifts'):
+        for day, shift in unpack_month(month, shifts):
+            if start_date <= day <= end_date:
+                rows[(nurse_id, day)] = shift
+
+    live = Schedule.objects.filter(date__range=[start_date, end_date])
+    if nurse_ids is not None:
+        live = live.filter(nurse_id__in=list(nurse_ids))
+    if not rows:
+        return list(live.values_list('nurse_id', 'date', 'shift'))
+    for nurse_id, day, shift in live.values_list('nurse_id', 'date', 'shift'):
+        rows[(nurse_id, day)] = shift
+    return [(nurse_id, day, shift) for (nurse_id, day), shift in rows.items()]
+
+
+def has_archived(start_date, end_date):
+    """기간에 보관된 달이 있는지 여부"""
+    return ArchivedSchedule.objects.filter(month__range=[month_start(start_date), end_date]).exists()
+
+
+def schedule_bounds():
+    """근무 테이블과 보관 근무표 전체의 첫 날짜와 마지막 날짜 (근무표가 없으면 (None, None))"""
+    live = Schedule.objects.aggregate(first=Min('date'), last=Max('date'))
+    bounds = [day for day in (live['first'], live['last']) if day is not None]
+
+    archived = ArchivedSchedule.objects.aggregate(first=Min('month'), last=Max('month'))
+    for month, pick in ((archived['first'], min), (archived['last'], max)):
+        if month is None:
+            continue
+        days = [day for shifts in ArchivedSchedule.objects.filter(month=month).values_list('shifts', flat=True)
+                for day, _ in unpack_month(month, shifts)]
+        if days:
+            bounds.append(pick(days))
+    if not bounds:
+        return None, None
+    return min(bounds), max(bounds)
+
+
+def archive_month(month, start_date=None, end_date=None, nurse_ids=None):
+    """
+    한 달의 근무 테이블 행을 보관 근무표로 옮기는 함수 (이미 보관된 칸은 근무 테이블 값으로 덮어씀)
+
+    Args:
+        month: 보관할 달 (그 달의 아무 날짜)
+        start_date, end_date: 그 달 안에서 옮길 기간 (None이면 달 전체)
+        nurse_ids: 대상 간호사 id 목록 (None이면 전체)
+
+    Returns:
+        (옮긴 근무 행 수, 저장한 보관 행 수)
+    """
+    month = month_start(month)
+    last = month_end(month)
+    days = last.day
+    live = Schedule.objects.filter(date__range=[max(month, start_date or month), min(last, end_date or last)])
+    if nurse_ids is not None:
+        live = live.filter(nurse_id__in=nurse_ids)
+    rows = list(live.values_list('nurse_id', 'date', 'shift', 'ward_id'))
+    if not rows:
+        return 0, 0
+
+    packed = {}
+    wards = {}
+    for nurse_id, shifts, ward_id, ward_days in ArchivedSchedule.objects.filter(month=month).values_list(
+        'nurse_id', 'shifts', 'ward_id', 'ward_days'
+    ):
+        packed[nurse_id] = list(shifts.ljust(days, EMPTY_CODE))
+        wards[nurse_id] = {offset: ward_days.get(str(offset), ward_id)
+                           for offset, code in enumerate(shifts) if code != EMPTY_CODE}
+    for nurse_id, day, shift, ward_id in rows:
+        offset = day.day - 1
+        packed.setdefault(nurse_id, [EMPTY_CODE] * days)[offset] = SHIFT_CODES[shift]
+        wards.setdefault(nurse_id, {})[offset] = ward_id
+
+    archived = []
+    for nurse_id, codes in packed.items():
+        day_wards = wards.get(nurse_id, {})
+        main_ward = Counter(day_wards.values()).most_common(1)[0][0] if day_wards else None
+        archived.append(ArchivedSchedule(
+            nurse_id=nurse_id,
+            month=month,
+            shifts=''.join(codes).rstrip(EMPTY_CODE),
+            ward_id=main_ward,
+            ward_days={str(offset): ward_id for offset, ward_id in day_wards.items() if ward_id != main_ward},
+        ))
+
+    with transaction.atomic():
+        ArchivedSchedule.objects.filter(month=month, nurse_id__in=list(packed)).delete()
+        ArchivedSchedule.objects.bulk_create(archived)
+        live.delete()
+    return len(rows), len(archived)
+
+
+def archive_before(before_date):
+    """
+    before_date 이전에 끝난 달을 모두 보관 근무표로 옮기는 함수 (한 번에 한 달씩 처리)
+
+    Returns:
+        {'months': [보관한 달, ...], 'rows': 옮긴 근무 행 수, 'packed': 저장한 보관 행 수}
+    """
+    result = {'months': [], 'rows': 0, 'packed': 0}
+    first = Schedule.objects.filter(date__lt=month_start(before_date)).aggregate(first=Min('date'))['first']
+    if first is None:
+        return result
+    month = month_start(first)
+    while month_end(month) < before_date:
+        moved, packed = archive_month(month)
+        if moved:
+            result['months'].append(month)
+            result['rows'] += moved
+            result['packed'] += packed
+        month = next_month(month)
+    return result
+
+
+def archive_range(start_date, end_date, nurse_ids=None):
+    """
+    기간의 근무 테이블 행을 달마다 보관 근무표로 옮기는 함수 (달 일부만 걸쳐도 그 기간만 옮김)
+
+    Returns:
+        {'months': [보관한 달, ...], 'rows': 옮긴 근무 행 수, 'packed': 저장한 보관 행 수}
+    """
+    result = {'months': [], 'rows': 0, 'packed': 0}
+    month = month_start(start_date)
+    while month <= end_date:
+        moved, packed = archive_month(month, start_date, end_date, nurse_ids)
+        if moved:
+            result['months'].append(month)
+            result['rows'] += moved
+            result['packed'] += packed
+        month = next_month(month)
+    return result
+
+
+def restore_months(start_month, end_month):
+    """
+    보관 근무표를 근무 테이블로 되돌리는 함수 (근무 테이블에 이미 있는 칸은 그대로 둠)
+
+    Returns:
+        되돌린 근무 행 수
+    """
+    archived = list(ArchivedSchedule.objects.filter(month__range=[month_start(start_month), month_start(end_month)]))
+    if not archived:
+        return 0
+    live = set(Schedule.objects.filter(
+        date__range=[month_start(start_month), month_end(end_month)]
+    ).values_list('nurse_id', 'date'))
+    restored = []
+    for row in archived:
+        for day, shift in unpack_month(row.month, row.shifts):
+            if (row.nurse_id, day) in live:
+                continue
+            ward_id = row.ward_days.get(str((day - row.month).days), row.ward_id)
+            restored.append(Schedule(nurse_id=row.nurse_id, date=day, shift=shift, ward_id=ward_id))
+    with transaction.atomic():
+        Schedule.objects.bulk_create(restored, batch_size=2000)
+        ArchivedSchedule.objects.filter(pk__in=[row.pk for row in archived]).delete()
+    return len(restored)
+
+
+def clear_archived(start_date, end_date, nurse_ids=None):
+    """
+    기간의 보관된 칸을 비우고 누적 근무 통계에서 빼는 함수
+
+    근무표를 다시 생성/적용하기 전에 기존 근무 행과 함께 지워서, 보관된 근무가 새 근무와
+    겹쳐 조회되거나 누적 통계에 두 번 들어가지 않게 한다.
+    """
+    archived = ArchivedSchedule.objects.filter(month__range=[month_start(start_date), end_date])
+    if nurse_ids is not None:
+        archived = archived.filter(nurse_id__in=list(nurse_ids))
+    changes = []
+    with transaction.atomic():
+        for row in archived.select_for_update():
+            codes = list(row.shifts)
+            for offset, code in enumerate(codes):
+                day = row.month + timedelta(days=offset)
+                if code != EMPTY_CODE and start_date <= day <= end_date:
+                    changes.append((row.nurse_id, day, CODE_SHIFTS[code], None))
+                    codes[offset] = EMPTY_CODE
+            shifts = ''.join(codes).rstrip(EMPTY_CODE)
+            if not shifts:
+                row.delete()
+            elif shifts != row.shifts:
+                row.shifts = shifts
+                row.save(update_fields=['shifts'])
+        apply_changes(changes)
+    return len(changes)
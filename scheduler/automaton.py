@@ -0,0 +1,299 @@
+"""
+근무 순서 규칙을 결정적 유한 오토마톤(DFA)으로 표현한 모듈
+
+간호사별로 '직전까지의 근무 흐름'을 하나의 상태 번호로 유지하고,
+(상태, 근무) 전이표를 미리 계산해 두어 규칙 검사를 배열 조회 한 번으로 처리한다.
+
+표현하는 규칙:
+    - E 다음 날 D 금지
+    - N 다음 날 D/E 금지 (N 또는 OFF만 가능)
+    - N 블록이 끝나면 OFF 2일 (N → OFF → OFF)
+    - 나이트킵 간호사는 N/OFF만 가능하며 N은 NN 또는 NNN 블록으로만 배정
+"""
+
+SHIFTS = ('D', 'E', 'N', 'OFF')
+SHIFT_INDEX = {shift: idx for idx, shift in enumerate(SHIFTS)}
+
+# 상태 정의
+FREE = 0         # 제약 없음 (이력 없음, OFF 이후)
+AFTER_D = 1      # D 근무 직후
+AFTER_E = 2      # E 근무 직후
+AFTER_N1 = 3     # N 1일째 직후
+AFTER_N2 = 4     # N 2일 연속 직후
+AFTER_N3 = 5     # N 3일 이상 연속 직후
+AFTER_N_OFF = 6  # N 블록 직후 첫 OFF (다음 날도 OFF여야 함)
+DEAD = 7         # 규칙 위반 (다음 날은 FREE에서 다시 시작)
+STATE_COUNT = 8
+
+NIGHT_STATES = (AFTER_N1, AFTER_N2, AFTER_N3)
+POST_NIGHT_STATES = NIGHT_STATES + (AFTER_N_OFF,)
+
+
+def _build_transition_table(is_night_keeper):
+    """(상태, 근무) -> 다음 상태 전이표 생성"""
+    D, E, N, OFF = (SHIFT_INDEX[s] for s in SHIFTS)
+    table = [[DEAD] * len(SHIFTS) for _ in range(STATE_COUNT)]
+
+    for state in (FREE, AFTER_D, AFTER_E):
+        table[state][D] = AFTER_D
+        table[state][E] = AFTER_E
+        table[state][N] = AFTER_N1
+        table[state][OFF] = FREE
+    # E 다음 D 금지
+    table[AFTER_E][D] = DEAD
+
+    # N 다음에는 N 또는 OFF만 가능, N 블록 뒤 OFF는 2일
+    table[AFTER_N1][N] = AFTER_N2
+    table[AFTER_N1][OFF] = AFTER_N_OFF
+    table[AFTER_N2][N] = AFTER_N3
+    table[AFTER_N2][OFF] = AFTER_N_OFF
+    table[AFTER_N3][N] = AFTER_N3
+    table[AFTER_N3][OFF] = AFTER_N_OFF
+    table[AFTER_N_OFF][OFF] = FREE
+
+    if is_night_keeper:
+        # 나이트킵: D/E 불가, 단일 N 불가(NN 이상), NNNN 이상 불가
+        for state in range(STATE_COUNT):
+            table[state][D] = DEAD
+            table[state][E] = DEAD
+        table[AFTER_N1][OFF] = DEAD
+        table[AFTER_N3][N] = DEAD
+
+    # 위반 다음 날은 제약 없는 상태에서 다시 검사 (위반 하나가 이후 기간 전체를 막지 않도록)
+    table[DEAD] = list(table[FREE])
+
+    return tuple(tuple(row) for row in table)
+
+
+# 일반 간호사 / 나이트킵 간호사 전이표 (인덱스: is_night_keeper)
+TRANSITIONS = (_build_transition_table(False), _build_transition_table(True))
+
+# 기간이 끝나는 시점에 허용되는 상태 (나이트킵은 단일 N으로 끝날 수 없음)
+ACCEPTING = (
+    tuple(state != DEAD for state in range(STATE_COUNT)),
+    tuple(state not in (DEAD, AFTER_N1) for state in range(STATE_COUNT)),
+)
+
+
+def next_state(state, shift, is_night_keeper=False):
+    """현재 상태에서 근무를 배정했을 때의 다음 상태 (미배정은 FREE)"""
+    if shift is None:
+        return FREE
+    return TRANSITIONS[bool(is_night_keeper)][state][SHIFT_INDEX[shift]]
+
+
+def is_legal(state, shift, is_night_keeper=False):
+    """현재 상태에서 해당 근무를 배정할 수 있는지 여부"""
+    return next_state(state, shift, is_night_keeper) != DEAD
+
+
+def run(shifts, is_night_keeper=False, state=FREE):
+    """근무 순서를 처음부터 적용한 최종 상태 (위반 시 DEAD)"""
+    table = TRANSITIONS[bool(is_night_keeper)]
+    for shift in shifts:
+        if shift is None:
+            state = FREE
+            continue
+        state = table[state][SHIFT_INDEX[shift]]
+        if state == DEAD:
+            return DEAD
+    return state
+
+
+def first_violation(shifts, is_night_keeper=False, state=FREE):
+    """근무 순서에서 처음으로 규칙을 위반한 위치 (위반이 없으면 None)"""
+    table = TRANSITIONS[bool(is_night_keeper)]
+    for idx, shift in enumerate(shifts):
+        if shift is None:
+            state = FREE
+            continue
+        state = table[state][SHIFT_INDEX[shift]]
+        if state == DEAD:
+            return idx
+    if not ACCEPTING[bool(is_night_keeper)][state]:
+        return len(shifts) - 1
+    return None
+
+
+def violation_positions(shifts, is_night_keeper=False, state=FREE):
+    """근무 순서에서 규칙을 위반한 모든 위치 (위반 후에는 FREE 상태에서 다시 검사)"""
+    table = TRANSITIONS[bool(is_night_keeper)]
+    positions = []
+    for idx, shift in enumerate(shifts):
+        if shift is None:
+            state = FREE
+            continue
+        state = table[state][SHIFT_INDEX[shift]]
+        if state == DEAD:
+            positions.append(idx)
+            state = FREE
+    return positions
+
+
+class ShiftStateTrack:
+    """
+    간호사 한 명의 기간 내 근무와 날짜별 오토마톤 상태를 함께 보관하는 클래스
+
+    states[i]는 i번째 날짜까지 적용한 뒤의 상태이며, 미배정 날짜는 FREE로 둔다.
+    위반한 날짜는 DEAD로 남기고 다음 날은 FREE에서 다시 시작한다 (violation_positions와 같음).
+    근무가 바뀌면 상태가 이전 값과 다시 같아지는 지점까지만 앞으로 갱신한다.
+    """
+
+    __slots__ = ('is_night_keeper', 'table', 'initial_state', 'shifts', 'states')
+
+    def __init__(self, length, is_night_keeper=False, initial_state=FREE):
+        self.is_night_keeper = bool(is_night_keeper)
+        self.table = TRANSITIONS[self.is_night_keeper]
+        self.initial_state = initial_state
+        self.shifts = [None] * length
+        self.states = [FREE] * length
+
+    def state_before(self, idx):
+        """idx번째 날짜 직전의 상태"""
+        return self.states[idx - 1] if idx > 0 else self.initial_state
+
+    def _step(self, state, shift):
+        if shift is None:
+            return FREE
+        return self.table[state][SHIFT_INDEX[shift]]
+
+    def allows(self, idx, shifts):
+        """idx부터 연속된 날짜의 근무를 shifts로 바꿔도 규칙을 지키는지 확인 (이미 있던 위반은 문제 삼지 않음)"""
+        length = len(self.shifts)
+        state = self.state_before(idx)
+        pos = idx
+        for shift in shifts:
+            if pos >= length:
+                break
+            state = self._step(state, shift)
+            if state == DEAD:
+                return False
+            pos += 1
+        # 이후 배정된 근무가 새 상태에서도 유효한지 상태가 수렴할 때까지 확인
+        while pos < length:
+            if state == self.states[pos - 1]:
+                return True
+            shift = self.shifts[pos]
+            if shift is None:
+                return True
+            state = self.table[state][SHIFT_INDEX[shift]]
+            if state == DEAD and self.states[pos] != DEAD:
+                return False
+            pos += 1
+        # 여기서 DEAD면 원래 마지막 날에 있던 위반
+        return state == DEAD or ACCEPTING[self.is_night_keeper][state]
+
+    def recompute(self):
+        """전체 날짜의 상태를 처음부터 다시 계산"""
+        state = self.initial_state
+        for pos, shift in enumerate(self.shifts):
+            state = self._step(state, shift)
+            self.states[pos] = state
+
+    def set(self, idx, shift):
+        """idx번째 날짜의 근무를 설정(None이면 해제)하고 상태를 갱신"""
+        self.shifts[idx] = shift
+        state = self.state_before(idx)
+        for pos in range(idx, len(self.shifts)):
+            new_state = self._step(state, self.shifts[pos])
+            if pos > idx and new_state == self.states[pos]:
+                break
+            self.states[pos] = new_state
+            state = new_state
+
+
+class RosterSchedule(dict):
+    """
+    (nurse_id, date) -> shift 형태의 근무표 딕셔너리
+
+    값이 바뀔 때마다 간호사별 ShiftStateTrack을 갱신하므로
+    allows()로 앞뒤 날짜를 다시 보지 않고 순서 규칙을 검사할 수 있다.
+    기간 밖의 날짜나 등록되지 않은 간호사는 일반 딕셔너리처럼만 저장한다.
+    """
+
+    def __init__(self, nurse_list, start_date, end_date, initial_states=None):
+        super().__init__()
+        self.start_date = start_date
+        self.length = (end_date - start_date).days + 1
+        initial_states = initial_states or {}
+        self.tracks = {
+            nurse.id: ShiftStateTrack(
+                self.length,
+                nurse.is_night_keeper,
+                initial_states.get(nurse.id, FREE),
+            )
+            for nurse in nurse_list
+        }
+
+    def _locate(self, key):
+        nurse_id, date = key
+        track = self.tracks.get(nurse_id)
+        if track is None:
+            return None, None
+        idx = (date - self.start_date).days
+        if idx < 0 or idx >= self.length:
+            return None, None
+        return track, idx
+
+    def __setitem__(self, key, shift):
+        super().__setitem__(key, shift)
+        track, idx = self._locate(key)
+        if track is not None:
+            track.set(idx, shift)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        track, idx = self._locate(key)
+        if track is not None:
+            track.set(idx, None)
+
+    def pop(self, key, *default):
+        result = super().pop(key, *default)
+        track, idx = self._locate(key)
+        if track is not None:
+            track.set(idx, None)
+        return result
+
+    def update(self, *args, **kwargs):
+        for key, shift in dict(*args, **kwargs).items():
+            self[key] = shift
+
+    def load(self, rows):
+        """
+        (nurse_id, date, shift) 목록을 한 번에 채움
+
+        칸마다 상태를 갱신하지 않고 근무를 모두 채운 뒤 간호사별로 한 번만 상태를 계산한다.
+        """
+        touched = set()
+        for nurse_id, date, shift in rows:
+            key = (nurse_id, date)
+            super().__setitem__(key, shift)
+            track, idx = self._locate(key)
+            if track is not None:
+                track.shifts[idx] = shift
+                touched.add(nurse_id)
+        for nurse_id in touched:
+            self.tracks[nurse_id].recompute()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def state_before(self, nurse_id, date):
+        """해당 날짜 직전의 오토마톤 상태"""
+        track, idx = self._locate((nurse_id, date))
+        if track is None:
+            return FREE
+        return track.state_before(idx)
+
+    def allows(self, nurse_id, date, shift):
+        """해당 날짜의 근무를 shift로 두었을 때 순서 규칙을 지키는지 여부"""
+        return self.allows_sequence(nurse_id, date, (shift,))
+
+    def allows_sequence(self, nurse_id, date, shifts):
+        """해당 날짜부터 연속된 근무를 shifts로 두었을 때 순서 규칙을 지키는지 여부"""
+        track, idx = self._locate((nurse_id, date))
+        if track is None:
+            return True
+        return track.allows(idx, shifts)
@@ -0,0 +1,177 @@
+"""
+날짜별 근무 현황과 간호사별 규칙 상태를 미리 계산해 두는 인덱스 모듈
+
+대체 근무자 검색, 근무 교환 후보 검색처럼 특정 날짜 주변만 보면 되는 요청에서
+한 번의 범위 조회로 아래 인덱스를 만들고, 후보 판단은 인덱스 조회로만 처리한다.
+
+    - 날짜별/근무별 간호사 집합 (by_day[date][shift])
+    - 간호사별 오토마톤 상태 (automaton.RosterSchedule)
+    - 간호사별 주간 근무일 수, 기간(월) 근무일 수
+    - 원티드 OFF (nurse_id, date) 집합
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db.models import Count
+
+from .archive import has_archived, schedule_rows
+from .automaton import RosterSchedule, SHIFTS
+from .models import Nurse, Schedule, WantedOff
+from .patterns import MAX_WORK_DAYS_PER_WEEK
+
+WORK_SHIFTS = ('D', 'E', 'N')
+CONTEXT_DAYS = 7  # 조회 날짜 앞뒤로 규칙 상태 확인을 위해 함께 불러오는 일수
+
+
+def week_start_of(day):
+    """해당 날짜가 속한 주의 월요일"""
+    return day - timedelta(days=day.weekday())
+
+
+def month_range_of(day):
+    """해당 날짜가 속한 달의 첫날과 마지막 날"""
+    first = day.replace(day=1)
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    return first, next_month - timedelta(days=1)
+
+
+def ward_nurses(nurse_id=None, ward_id=None):
+    """
+    인덱스 대상 간호사 목록 - 간호사를 주면 그 간호사의 병동, 병동을 주면 그 병동 간호사
+
+    병동이 없는 간호사는 병동 없는 간호사끼리, 둘 다 없으면 None(전체 간호사)
+    """
+    if nurse_id is not None:
+        nurse = Nurse.objects.filter(id=nurse_id).only('ward_id').first()
+        if nurse is None:
+            return None
+        ward_id = nurse.ward_id
+        if ward_id is None:
+            return list(Nurse.objects.filter(ward__isnull=True))
+    if ward_id is None:
+        return None
+    return list(Nurse.objects.filter(ward_id=ward_id))
+
+
+class AvailabilityIndex:
+    """
+    조회 구간의 근무표를 날짜/근무/간호사 단위로 색인한 클래스
+
+    Args:
+        start_date: 조회 구간 시작일
+        end_date: 조회 구간 종료일
+        nurse_list: 대상 간호사 목록 (없으면 전체 간호사)
+    """
+
+    def __init__(self, start_date, end_date=None, nurse_list=None):
+        end_date = end_date or start_date
+        all_nurses = nurse_list is None
+        if all_nurses:
+            nurse_list = list(Nurse.objects.all())
+        self.nurses = {nurse.id: nurse for nurse in nurse_list}
+        self.start_date = start_date
+        self.end_date = end_date
+
+        load_start = start_date - timedelta(days=CONTEXT_DAYS)
+        load_end = end_date + timedelta(days=CONTEXT_DAYS)
+        self.roster = RosterSchedule(nurse_list, load_start, load_end)
+        self.by_day = {}
+        self.week_work = Counter()
+
+        rows = schedule_rows(load_start, load_end, None if all_nurses else list(self.nurses))
+        self.roster.load(rows)
+        week_starts = {}
+        for nurse_id, day, shift in rows:
+            shifts = self.by_day.get(day)
+            if shifts is None:
+                shifts = self.by_day[day] = {code: set() for code in SHIFTS}
+                week_starts[day] = week_start_of(day)
+            shifts[shift].add(nurse_id)
+            if shift in WORK_SHIFTS:
+                self.week_work[(nurse_id, week_starts[day])] += 1
+
+        wanted = WantedOff.objects.filter(date__range=[load_start, load_end]).exclude(status='denied')
+        if not all_nurses:
+            wanted = wanted.filter(nurse_id__in=list(self.nurses))
+        self.wanted_offs = set(wanted.values_list('nurse_id', 'date'))
+
+        # 기간(조회 시작일이 속한 달) 근무일 수 - 근무량 균형 비교용
+        month_start, month_end = month_range_of(start_date)
+        nurse_ids = None if all_nurses else list(self.nurses)
+        if has_archived(month_start, month_end):
+            # 보관된 달이면 보관 근무표와 함께 세어 봄
+            self.period_work = Counter(
+                nurse_id for nurse_id, _, shift in schedule_rows(month_start, month_end, nurse_ids)
+                if shift in WORK_SHIFTS
+            )
+        else:
+            schedules = Schedule.objects.all() if all_nurses else Schedule.objects.filter(nurse_id__in=nurse_ids)
+            self.period_work = Counter({
+                row['nurse_id']: row['count']
+                for row in schedules.filter(
+                    date__range=[month_start, month_end], shift__in=WORK_SHIFTS
+                ).values('nurse_id').annotate(count=Count('id'))
+            })
+
+    def shift_on(self, nurse_id, day):
+        """해당 날짜의 근무 (근무표에 없으면 None)"""
+        return self.roster.get((nurse_id, day))
+
+    def nurses_on(self, day, shift):
+        """해당 날짜에 해당 근무인 간호사 id 집합"""
+        return self.by_day.get(day, {}).get(shift, set())
+
+    def staffed(self, day):
+        """해당 날짜의 근무별 인원 수"""
+        return {shift: len(self.nurses_on(day, shift)) for shift in WORK_SHIFTS}
+
+    def off_nurses(self, day):
+        """해당 날짜에 근무가 없는 간호사 id 집합 (OFF 또는 미배정)"""
+        working = set()
+        for shift in WORK_SHIFTS:
+            working |= self.nurses_on(day, shift)
+        return set(self.nurses) - working
+
+    def week_work_of(self, nurse_id, day):
+        """해당 날짜가 속한 주의 근무일 수"""
+        return self.week_work[(nurse_id, week_start_of(day))]
+
+    def work_streak(self, nurse_id, day):
+        """해당 날짜에 근무한다고 할 때의 연속 근무일 수"""
+        streak = 1
+        for step in (-1, 1):
+            other = day + timedelta(days=step)
+            while self.shift_on(nurse_id, other) in WORK_SHIFTS:
+                streak += 1
+                other += timedelta(days=step)
+        return streak
+
+    def assign(self, nurse_id, day, shift):
+        """인덱스의 근무를 바꾸고 근무별 집합, 주간 근무일 수, 오토마톤 상태를 함께 갱신"""
+        previous = self.shift_on(nurse_id, day)
+        shifts = self.by_day.get(day)
+        if shifts is None:
+            shifts = self.by_day[day] = {code: set() for code in SHIFTS}
+        if previous is not None:
+            shifts[previous].discard(nurse_id)
+        shifts[shift].add(nurse_id)
+        week_key = (nurse_id, week_start_of(day))
+        if previous in WORK_SHIFTS:
+            self.week_work[week_key] -= 1
+        if shift in WORK_SHIFTS:
+            self.week_work[week_key] += 1
+        self.roster[(nurse_id, day)] = shift
+
+    def allows(self, nurse_id, day, shift):
+        """해당 날짜의 근무를 shift로 바꿔도 규칙(순서 규칙, 주간 근무 상한, 원티드 OFF)을 지키는지 여부"""
+        nurse = self.nurses.get(nurse_id)
+        if nurse is None:
+            return False
+        if nurse.is_night_keeper and shift not in ('N', 'OFF'):
+            return False
+        if shift in WORK_SHIFTS and self.shift_on(nurse_id, day) not in WORK_SHIFTS:
+            if (nurse_id, day) in self.wanted_offs:
+                return False
+            if self.week_work_of(nurse_id, day) >= MAX_WORK_DAYS_PER_WEEK:
+                return False
+        return self.roster.allows(nurse_id, day, shift)
@@ -0,0 +1,74 @@
+"""
+근무표 생성 제한 시간 관리 모듈
+
+생성 단계(phase)별 소요 시간을 기록하고, 제한 시간이 지나면
+탐색 단계가 현재까지의 근무표를 유지한 채 멈출 수 있도록 알려준다.
+"""
+import time
+
+
+class TimeBudget:
+    """
+    근무표 생성 제한 시간과 단계별 소요 시간을 기록하는 클래스
+
+    seconds가 None이면 제한 없이 단계별 소요 시간만 기록한다.
+    """
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.deadline = None if seconds is None else self.started + seconds
+        self.timed_out = False
+        self.interrupted_phase = None
+        self.phases = []
+        self._phase = None
+        self._phase_started = self.started
+
+    def elapsed(self):
+        """생성 시작 후 경과 시간(초)"""
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        """남은 시간(초) - 제한이 없으면 None"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self):
+        """제한 시간이 지났는지 여부 (처음 지난 시점의 단계를 기록)"""
+        if self.deadline is None or time.monotonic() < self.deadline:
+            return False
+        if not self.timed_out:
+            self.timed_out = True
+            self.interrupted_phase = self._phase
+        return True
+
+    def phase(self, name):
+        """이전 단계를 마치고 새 단계 시작"""
+        self._close_phase()
+        self._phase = name
+        self._phase_started = time.monotonic()
+
+    def finish(self):
+        """마지막 단계를 마침"""
+        self._close_phase()
+        self._phase = None
+
+    def _close_phase(self):
+        if self._phase is None:
+            return
+        self.phases.append({
+            'name': self._phase,
+            'seconds': round(time.monotonic() - self._phase_started, 4),
+            'interrupted': self.timed_out and self.interrupted_phase == self._phase,
+        })
+
+    def report(self):
+        """단계별 소요 시간과 제한 시간 초과 여부"""
+        return {
+            'time_budget': self.seconds,
+            'elapsed': round(self.elapsed(), 4),
+            'timed_out': self.timed_out,
+            'interrupted_phase': self.interrupted_phase,
+            'phases': list(self.phases),
+        }
@@ -0,0 +1,205 @@
+"""
+근무표 생성 전 인력 용량을 빠르게 점검하는 모듈
+
+간호사 수, 나이트킵 구성, 주간 근무 상한, N 이후 OFF 규칙으로부터
+날짜별/주별/근무 유형별 배정 가능 인원의 상한을 계산하고,
+필요 인원이 상한을 넘는 경우를 생성 전에 알려준다.
+"""
+from datetime import timedelta
+
+from .patterns import MAX_WORK_DAYS_PER_WEEK
+
+# 나이트킵 간호사의 최대 N 밀도: NNN 블록 뒤 OFF 2일 (5일 주기에 3일)
+NIGHT_BLOCK_MAX = 3
+NIGHT_CYCLE = NIGHT_BLOCK_MAX + 2
+
+
+def max_night_keeper_shifts(days):
+    """연속된 days일 동안 나이트킵 간호사 한 명이 설 수 있는 최대 N 근무 수"""
+    cycles, rest = divmod(days, NIGHT_CYCLE)
+    return cycles * NIGHT_BLOCK_MAX + min(rest, NIGHT_BLOCK_MAX)
+
+
+def analyze_capacity(nurse_list, start_date, end_date, shift_requirements, wanted_offs=None, nurse_shifts=None):
+    """
+    필요 인원 대비 배정 가능 인원 상한을 분석하는 함수
+
+    Args:
+        nurse_list: 간호사 목록
+        start_date: 시작 날짜
+        end_date: 종료 날짜
+        shift_requirements: 각 근무별 필요 인원 수 {'D': int, 'E': int, 'N': int}
+        wanted_offs: {nurse_id: {date, ...}} 원티드 OFF (해당 날짜는 근무 불가로 계산)
+        nurse_shifts: {nurse_id: 할당 근무수} (주간 상한을 넘는 할당 확인용)
+
+    Returns:
+        {
+            'feasible': 필요 인원을 상한 안에서 채울 수 있는지 여부,
+            'errors': 생성이 불가능한 사유 목록,
+            'warnings': 생성은 가능하지만 주의가 필요한 사항 목록,
+            'short_days': [{'date', 'shift', 'required', 'available'}, ...],
+            'weeks': [{'week_start', 'week_end', 'days', 'required', 'capacity', 'short'}, ...],
+            'short_windows': [{'start', 'end', 'required', 'capacity'}, ...] 여러 주에 걸쳐 상한이 부족한 구간,
+        }
+    """
+    wanted_offs = wanted_offs or {}
+    required = {shift: shift_requirements.get(shift, 0) for shift in ('D', 'E', 'N')}
+    night_keepers = [nurse for nurse in nurse_list if nurse.is_night_keeper]
+    regular_nurses = [nurse for nurse in nurse_list if not nurse.is_night_keeper]
+
+    result = {
+        'feasible': True,
+        'errors': [],
+        'warnings': [],
+        'short_days': [],
+        'weeks': [],
+        'short_windows': [],
+    }
+
+    date_range = []
+    current_date = start_date
+    while current_date <= end_date:
+        date_range.append(current_date)
+        current_date += timedelta(days=1)
+    total_days = len(date_range)
+
+    # 1. 날짜별 상한 - 원티드 OFF를 제외한 가용 인원
+    for day in date_range:
+        available_keepers = sum(1 for nurse in night_keepers if day not in wanted_offs.get(nurse.id, ()))
+        available_regulars = sum(1 for nurse in regular_nurses if day not in wanted_offs.get(nurse.id, ()))
+
+        day_available = {
+            'D': available_regulars,
+            'E': available_regulars,
+            'N': available_keepers + available_regulars,
+        }
+        # D/E는 일반 간호사만, N은 D/E를 채우고 남은 일반 간호사와 나이트킵이 담당
+        night_available = available_keepers + max(0, available_regulars - required['D'] - required['E'])
+
+        for shift in ('D', 'E'):
+            if required[shift] > day_available[shift]:
+                result['short_days'].append({
+                    'date': day, 'shift': shift,
+                    'required': required[shift], 'available': day_available[shift],
+                })
+        if required['D'] + required['E'] <= available_regulars and required['N'] > night_available:
+            result['short_days'].append({
+                'date': day, 'shift': 'N',
+                'required': required['N'], 'available': night_available,
+            })
+
+    # 2. 주별 상한 - 주간 근무 상한(월~일 5일)과 나이트킵 N 밀도
+    keeper_week_caps = []  # 주별 나이트킵 간호사별 근무 상한 (연속 주 구간 상한 계산용)
+    week_idx = 0
+    while week_idx < total_days:
+        week_days = date_range[week_idx:week_idx + 7 - date_range[week_idx].weekday()]
+        week_idx += len(week_days)
+
+        def work_cap(nurse):
+            free_days = sum(1 for day in week_days if day not in wanted_offs.get(nurse.id, ()))
+            return min(MAX_WORK_DAYS_PER_WEEK, free_days)
+
+        regular_cap = sum(work_cap(nurse) for nurse in regular_nurses)
+        keeper_week_caps.append([work_cap(nurse) for nurse in night_keepers])
+        keeper_cap = sum(min(work_cap(nurse), max_night_keeper_shifts(len(week_days))) for nurse in night_keepers)
+
+        week_required = {shift: required[shift] * len(week_days) for shift in ('D', 'E', 'N')}
+        week_required['total'] = sum(week_required.values())
+        capacity = {
+            'D': regular_cap,
+            'E': regular_cap,
+            'N': regular_cap + keeper_cap,
+            'total': regular_cap + min(keeper_cap, week_required['N']),
+        }
+
+        short_shifts = []
+        if week_required['D'] + week_required['E'] > regular_cap:
+            short_shifts.append('D/E')
+        if week_required['N'] > capacity['N']:
+            short_shifts.append('N')
+        if week_required['total'] > capacity['total']:
+            short_shifts.append('전체')
+
+        result['weeks'].append({
+            'week_start': week_days[0],
+            'week_end': week_days[-1],
+            'days': len(week_days),
+            'required': week_required,
+            'capacity': capacity,
+            'short': short_shifts,
+        })
+        if short_shifts:
+            result['errors'].append(
+                f"{week_days[0].strftime('%Y-%m-%d')}~{week_days[-1].strftime('%Y-%m-%d')} 주: "
+                f"{', '.join(short_shifts)} 근무 필요 인원({week_required['total']})이 "
+                f"주간 근무 상한으로 배정 가능한 인원({capacity['total']})을 넘습니다."
+            )
+
+    # 3. 연속된 주 구간별 상한 - 나이트킵 N 밀도(NNN 뒤 OFF 2일)는 주마다 따로가 아니라 구간 전체 길이로 적용
+    #    (주 단위로는 주마다 N 5개까지 가능해 보여도 여러 주에 걸치면 5일에 3개를 넘을 수 없음)
+    weeks = result['weeks']
+    for first in range(len(weeks)):
+        regular_cap = 0
+        keeper_caps = [0] * len(night_keepers)
+        days = 0
+        window_required = 0
+        night_required = 0
+        for last in range(first, len(weeks)):
+            week = weeks[last]
+            days += week['days']
+            regular_cap += week['capacity']['D']
+            keeper_caps = [cap + week_cap for cap, week_cap in zip(keeper_caps, keeper_week_caps[last])]
+            window_required += week['required']['total']
+            night_required += week['required']['N']
+            if first == last:
+                continue  # 한 주 구간은 2에서 확인
+            keeper_cap = sum(min(cap, max_night_keeper_shifts(days)) for cap in keeper_caps)
+            capacity = regular_cap + min(keeper_cap, night_required)
+            if window_required > capacity:
+                result['short_windows'].append({
+                    'start': weeks[first]['week_start'],
+                    'end': week['week_end'],
+                    'required': window_required,
+                    'capacity': capacity,
+                })
+                break  # 같은 시작 주에서 더 긴 구간은 이 구간을 포함하므로 생략
+    if result['short_windows']:
+        preview = ', '.join(
+            f"{window['start'].strftime('%Y-%m-%d')}~{window['end'].strftime('%Y-%m-%d')}"
+            f"(필요 {window['required']}, 상한 {window['capacity']})"
+            for window in result['short_windows'][:5]
+        )
+        more = f" 외 {len(result['short_windows']) - 5}개 구간" if len(result['short_windows']) > 5 else ''
+        result['errors'].append(
+            f"N 이후 OFF 규칙(나이트킵 5일에 N 3개)과 주간 근무 상한으로 배정 가능한 인원이 필요 인원보다 적은 구간: {preview}{more}"
+        )
+
+    # 4. 기간 전체 나이트킵 N 상한 (NNN 뒤 OFF 2일)
+    if night_keepers:
+        keeper_night_cap = len(night_keepers) * max_night_keeper_shifts(total_days)
+        night_required = required['N'] * total_days
+        if keeper_night_cap < night_required:
+            result['warnings'].append(
+                f"나이트킵 간호사 {len(night_keepers)}명은 N 이후 OFF 규칙으로 최대 {keeper_night_cap}개의 N 근무만 담당할 수 있어, "
+                f"남은 {night_required - keeper_night_cap}개는 일반 간호사가 담당해야 합니다."
+            )
+
+    # 5. 간호사별 할당 근무수가 주간 상한을 넘는지 확인
+    if nurse_shifts:
+        period_cap = sum(min(MAX_WORK_DAYS_PER_WEEK, week['days']) for week in result['weeks'])
+        for nurse in nurse_list:
+            assigned = nurse_shifts.get(nurse.id, 0)
+            cap = max_night_keeper_shifts(total_days) if nurse.is_night_keeper else period_cap
+            if assigned > cap:
+                result['warnings'].append(
+                    f"{nurse.name} 간호사의 할당 근무수({assigned})가 규칙상 가능한 최대 근무수({cap})를 넘습니다."
+                )
+
+    if result['short_days']:
+        short_dates = sorted({item['date'] for item in result['short_days']})
+        preview = ', '.join(day.strftime('%Y-%m-%d') for day in short_dates[:10])
+        more = f" 외 {len(short_dates) - 10}일" if len(short_dates) > 10 else ''
+        result['errors'].append(f"가용 인원이 필요 인원보다 적은 날짜: {preview}{more}")
+
+    result['feasible'] = not result['errors']
+    return result
@@ -0,0 +1,196 @@
+"""
+병동 간 지원 근무(플로트 풀) 배정 모듈
+
+병동별 생성 후에도 남은 날짜/근무별 부족 인원을 다른 병동의 여유 인력으로 채운다.
+하루 단위로 아래 수송 문제를 최소 비용 유량(repair.MinCostFlow)으로 푼다.
+
+    source -> 초과 인원(병동, 근무) -> 간호사 -> 부족 인원(다른 병동, 같은 근무) -> sink
+    source -> OFF인 간호사 -> 부족 인원(다른 병동, 근무) -> sink
+
+초과 인원으로 근무 중인 간호사는 같은 날 같은 근무를 다른 병동에서 하므로 근무표가 바뀌지 않는다.
+OFF인 간호사에게 근무를 추가할 때는 AvailabilityIndex.allows()로 순서 규칙, 주간 근무 상한,
+원티드 OFF를 확인한다.
+"""
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+
+from .availability import AvailabilityIndex
+from .ledger import apply_changes
+from .models import Nurse, Schedule
+from .persistence import ScheduleWriter
+from .repair import MinCostFlow
+from .wards import ward_requirements
+
+WORK_SHIFTS = ('D', 'E', 'N')
+
+# 비용 설정 (낮을수록 우선 배정)
+FLOAT_COST = 10          # 초과 인원으로 근무 중인 간호사를 다른 병동으로 보냄
+EXTRA_SHIFT_COST = 50    # OFF인 간호사에게 다른 병동 근무를 추가
+FLOAT_REPEAT_COST = 5    # 이번 기간에 이미 지원 근무를 한 횟수 1회당
+WORKLOAD_COST = 2        # OFF인 간호사의 이번 주 근무일 1일당
+
+
+def balance_float_pool(ward_ids, start_date, end_date, commit=True):
+    """
+    병동 간 지원 근무로 남은 부족 인원을 채우는 함수
+
+    Args:
+        ward_ids: 대상 병동 id 목록
+        start_date: 시작 날짜
+        end_date: 종료 날짜
+        commit: True이면 결과를 Schedule(근무 병동, 추가 근무)과 누적 근무 통계에 저장
+
+    Returns:
+        {
+            'moved': [(nurse_id, date, shift, 보낸 병동, 받은 병동), ...] 초과 인원 이동,
+            'extra': [(nurse_id, date, shift, 받은 병동), ...] OFF인 간호사에게 추가한 근무,
+            'unfilled': [(ward_id, date, shift, 부족 인원), ...] 채우지 못한 부족 인원,
+            'elapsed': 소요 시간(초),
+        }
+    """
+    started = time.perf_counter()
+    ward_ids = list(ward_ids)
+    requirements = ward_requirements(ward_ids)
+    nurses = list(Nurse.objects.filter(ward_id__in=ward_ids))
+    home_ward = {nurse.id: nurse.ward_id for nurse in nurses}
+    index = AvailabilityIndex(start_date, end_date, nurses)
+
+    # (간호사, 날짜)별 근무 행과 근무 병동, 병동/날짜/근무별 인원
+    cells = {}
+    staffed = Counter()
+    for pk, nurse_id, day, shift, ward_id in Schedule.objects.filter(
+        nurse_id__in=list(home_ward), date__range=[start_date, end_date]
+    ).values_list('id', 'nurse_id', 'date', 'shift', 'ward_id'):
+        ward_id = ward_id or home_ward[nurse_id]
+        cells[(nurse_id, day)] = (pk, ward_id)
+        if shift in WORK_SHIFTS:
+            staffed[(ward_id, day, shift)] += 1
+
+    result = {'moved': [], 'extra': [], 'unfilled': []}
+    float_count = Counter()
+    day = start_date
+    while day <= end_date:
+        shortage = {}
+        surplus = {}
+        for ward_id in ward_ids:
+            for shift in WORK_SHIFTS:
+                gap = requirements[ward_id][shift] - staffed[(ward_id, day, shift)]
+                if gap > 0:
+                    shortage[(ward_id, shift)] = gap
+                elif gap < 0:
+                    surplus[(ward_id, shift)] = -gap
+        if not shortage:
+            day += timedelta(days=1)
+            continue
+        short_shifts = {shift for _, shift in shortage}
+
+        # 노드 번호: source, sink, 부족 (병동, 근무), 초과 (병동, 근무), 간호사
+        source, sink = 0, 1
+        short_node = {key: 2 + i for i, key in enumerate(shortage)}
+        surplus_node = {key: 2 + len(short_node) + i for i, key in enumerate(surplus)}
+        nurse_node = {}
+        edges = []
+        network = MinCostFlow(2 + len(short_node) + len(surplus_node) + len(nurses))
+
+        def node_of(nurse_id):
+            if nurse_id not in nurse_node:
+                nurse_node[nurse_id] = 2 + len(short_node) + len(surplus_node) + len(nurse_node)
+            return nurse_node[nurse_id]
+
+        for key, count in shortage.items():
+            network.add_edge(short_node[key], sink, count, 0)
+        for key, count in surplus.items():
+            network.add_edge(source, surplus_node[key], count, 0)
+
+        for nurse in nurses:
+            current = index.shift_on(nurse.id, day)
+            if current in WORK_SHIFTS:
+                # 초과 인원 근무 중 - 같은 근무가 부족한 다른 병동으로만 이동
+                ward_id = cells.get((nurse.id, day), (None, home_ward[nurse.id]))[1]
+                if (ward_id, current) not in surplus:
+                    continue
+                targets = [key for key in shortage if key[1] == current and key[0] != ward_id]
+                if not targets:
+                    continue
+                network.add_edge(surplus_node[(ward_id, current)], node_of(nurse.id), 1,
+                                 FLOAT_COST + FLOAT_REPEAT_COST * float_count[nurse.id])
+                for key in targets:
+                    edges.append((network.add_edge(nurse_node[nurse.id], short_node[key], 1, 0), nurse.id, key, ward_id))
+            else:
+                # OFF - 규칙을 지키며 근무를 추가할 수 있는 다른 병동의 부족 근무 (규칙 확인은 근무별 한 번)
+                allowed = {shift for shift in short_shifts if index.allows(nurse.id, day, shift)}
+                targets = [key for key in shortage if key[1] in allowed and key[0] != home_ward[nurse.id]]
+                if not targets:
+                    continue
+                cost = (EXTRA_SHIFT_COST + FLOAT_REPEAT_COST * float_count[nurse.id]
+                        + WORKLOAD_COST * index.week_work_of(nurse.id, day))
+                network.add_edge(source, node_of(nurse.id), 1, cost)
+                for key in targets:
+                    edges.append((network.add_edge(nurse_node[nurse.id], short_node[key], 1, 0), nurse.id, key, None))
+
+        network.flow(source, sink)
+
+        filled = Counter()
+        for handle, nurse_id, (ward_id, shift), from_ward in edges:
+            if network.edge_flow(handle) <= 0:
+                continue
+            filled[(ward_id, shift)] += 1
+            float_count[nurse_id] += 1
+            staffed[(ward_id, day, shift)] += 1
+            if from_ward is not None:
+                staffed[(from_ward, day, shift)] -= 1
+                result['moved'].append((nurse_id, day, shift, from_ward, ward_id))
+            else:
+                index.assign(nurse_id, day, shift)
+                result['extra'].append((nurse_id, day, shift, ward_id))
+
+        for key, count in shortage.items():
+            if count > filled[key]:
+                result['unfilled'].append((key[0], day, key[1], count - filled[key]))
+        day += timedelta(days=1)
+
+    if commit:
+        save_float_assignments(result, cells)
+    result['elapsed'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def save_float_assignments(result, cells):
+    """
+    지원 근무 결과를 저장하는 함수 - 받는 병동(과 근무)별로 한 번씩 UPDATE
+
+    Args:
+        result: balance_float_pool() 결과
+        cells: {(nurse_id, date): (Schedule pk, 근무 병동)}
+    """
+    moved_by_ward = {}
+    for nurse_id, day, _, _, to_ward in result['moved']:
+        moved_by_ward.setdefault(to_ward, []).append(cells[(nurse_id, day)][0])
+
+    extra_by_target = {}
+    new_by_ward = {}
+    for nurse_id, day, shift, to_ward in result['extra']:
+        cell = cells.get((nurse_id, day))
+        if cell is None:
+            new_by_ward.setdefault(to_ward, []).append((nurse_id, day, shift))
+        else:
+            extra_by_target.setdefault((to_ward, shift), []).append(cell[0])
+
+    with transaction.atomic():
+        for ward_id, pks in moved_by_ward.items():
+            Schedule.objects.filter(pk__in=pks).update(ward_id=ward_id)
+        for (ward_id, shift), pks in extra_by_target.items():
+            Schedule.objects.filter(pk__in=pks).update(ward_id=ward_id, shift=shift)
+        # 근무 행이 없던 칸은 일괄 저장 (누적 통계는 ScheduleWriter가 갱신)
+        for ward_id, rows in new_by_ward.items():
+            writer = ScheduleWriter(ward_id=ward_id)
+            for nurse_id, day, shift in rows:
+                writer.add(nurse_id, day, shift)
+            writer.flush()
+        apply_changes(
+            (nurse_id, day, 'OFF', shift)
+            for nurse_id, day, shift, _ in result['extra'] if (nurse_id, day) in cells
+        )
@@ -0,0 +1,172 @@
+"""
+연속 구간(롤링 호라이즌) 근무표 생성 모듈
+
+긴 기간을 월 단위 같은 연속 구간으로 나눠 차례로 생성한다. 각 구간은 직전 구간에서
+저장된 근무표의 끝부분(마지막 근무, 진행 중인 N 블록, 같은 주 근무일 수)을 한 번의 조회로
+불러와 이어서 생성하므로, 구간 경계에서도 근무 순서 규칙과 주간 근무 상한이 지켜진다.
+한 번에 한 구간의 자료만 메모리에 올리므로 1년 단위 계획도 구간 길이만큼의 메모리로 처리한다.
+"""
+from datetime import timedelta
+
+from .automaton import DEAD, FREE, next_state
+from .archive import schedule_rows
+
+TAIL_DAYS = 7  # 시작일 이전에 불러오는 일수 (오토마톤 상태와 같은 주 근무일 수 계산에 충분)
+WORK_SHIFTS = ('D', 'E', 'N')
+
+
+def load_carry_over(nurse_list, start_date):
+    """
+    시작일 직전 근무표의 끝부분을 한 번에 조회해 이어서 생성할 상태를 만드는 함수
+
+    Args:
+        nurse_list: 간호사 목록
+        start_date: 생성할 구간의 시작일
+
+    Returns:
+        {
+            'shifts': {(nurse_id, date): shift} 시작일 이전 TAIL_DAYS일의 근무,
+            'last_shifts': {nurse_id: [근무, ...]} 날짜순 직전 근무 (근무표가 없는 날은 OFF),
+            'states': {nurse_id: 시작일 직전 오토마톤 상태},
+            'prior_week_work': {nurse_id: 시작일이 속한 주에서 시작일 이전 근무일 수},
+        }
+    """
+    tail_start = start_date - timedelta(days=TAIL_DAYS)
+    shifts = dict(
+        ((nurse_id, day), shift)
+        for nurse_id, day, shift in schedule_rows(
+            tail_start, start_date - timedelta(days=1), [nurse.id for nurse in nurse_list]
+        )
+    )
+    return carry_from_shifts(nurse_list, start_date, shifts)
+
+
+def carry_from_shifts(nurse_list, start_date, shifts):
+    """
+    시작일 직전 TAIL_DAYS일의 근무로 이어서 생성할 상태를 만드는 함수
+
+    Args:
+        nurse_list: 간호사 목록
+        start_date: 생성할 구간의 시작일
+        shifts: {(nurse_id, date): shift} - 시작일 직전 근무 (다른 날짜가 섞여 있어도 무시)
+
+    Returns:
+        load_carry_over()와 같은 형식
+    """
+    tail_start = start_date - timedelta(days=TAIL_DAYS)
+    tail_days = [tail_start + timedelta(days=offset) for offset in range(TAIL_DAYS)]
+    week_start = start_date - timedelta(days=start_date.weekday())
+
+    carry = {'shifts': {}, 'last_shifts': {}, 'states': {}, 'prior_week_work': {}}
+    for nurse in nurse_list:
+        last_shifts = []
+        for day in tail_days:
+            shift = shifts.get((nurse.id, day))
+            if shift is not None:
+                carry['shifts'][(nurse.id, day)] = shift
+            last_shifts.append(shift or 'OFF')
+        # 조회 구간이 N 블록 중간에서 시작하거나 이전 근무표가 규칙을 어긴 곳은
+        # 제약 없는 상태로 되돌리고 이어서 진행
+        state = FREE
+        for shift in last_shifts:
+            state = next_state(state, shift, nurse.is_night_keeper)
+            if state == DEAD:
+                state = FREE
+        carry['last_shifts'][nurse.id] = last_shifts
+        carry['states'][nurse.id] = state
+        carry['prior_week_work'][nurse.id] = sum(
+            1 for day, shift in zip(tail_days, last_shifts)
+            if day >= week_start and shift in WORK_SHIFTS
+        )
+    return carry
+
+
+def month_windows(start_date, end_date):
+    """기간을 달력 월 단위 구간 [(시작일, 종료일), ...]으로 나누는 함수"""
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        next_month = (window_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        window_end = min(end_date, next_month - timedelta(days=1))
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
+def fixed_windows(start_date, end_date, window_days):
+    """기간을 window_days일 단위 구간으로 나누는 함수"""
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(end_date, window_start + timedelta(days=window_days - 1))
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
+def split_targets(nurse_shifts, windows):
+    """
+    전체 기간의 간호사별 목표 근무 수를 구간 길이에 비례해 나누는 함수
+
+    누적 반올림으로 나누므로 구간별 목표의 합은 전체 목표와 같다.
+
+    Returns:
+        [{nurse_id: 구간 목표 근무 수}, ...] (windows와 같은 순서)
+    """
+    total_days = sum((end - start).days + 1 for start, end in windows)
+    targets = []
+    elapsed = 0
+    for start, end in windows:
+        days = (end - start).days + 1
+        targets.append({
+            nurse_id: round(target * (elapsed + days) / total_days) - round(target * elapsed / total_days)
+            for nurse_id, target in nurse_shifts.items()
+        })
+        elapsed += days
+    return targets
+
+
+def generate_rolling(request, start_date, end_date, nurse_list, nurse_shifts, shift_requirements,
+                     engine='pattern', time_budget=None, window_days=None, ward_id=None, seed=None):
+    """
+    기간을 연속 구간으로 나눠 차례로 근무표를 생성하는 함수
+
+    각 구간은 create_schedule_with_pattern()으로 생성/저장되며, 다음 구간은 저장된 직전 구간의
+    끝부분을 load_carry_over()로 불러와 이어서 생성한다.
+
+    Args:
+        request: HTTP 요청 객체 (메시지 표시용)
+        start_date: 시작 날짜
+        end_date: 종료 날짜
+        nurse_list: 간호사 목록
+        nurse_shifts: 전체 기간의 간호사별 목표 근무 수 {nurse_id: int}
+        shift_requirements: 각 근무별 필요 인원 수 {'D': int, 'E': int, 'N': int}
+        engine: 생성 방식 ('pattern' 또는 'greedy')
+        time_budget: 전체 제한 시간(초) - 구간 길이에 비례해 나눠 씀. None이면 제한 없음
+        window_days: 구간 길이(일). None이면 달력 월 단위
+        ward_id: 병동 id (create_schedule_with_pattern()에 그대로 전달)
+        seed: 난수 시드 (구간마다 같은 시드로 create_schedule_with_pattern()에 전달)
+
+    Returns:
+        [{'start_date', 'end_date', 'report'}, ...] 구간별 생성 보고서
+    """
+    # views가 이 모듈을 불러오므로 호출 시점에 가져옴
+    from .views import create_schedule_with_pattern
+
+    if window_days:
+        windows = fixed_windows(start_date, end_date, window_days)
+    else:
+        windows = month_windows(start_date, end_date)
+    total_days = (end_date - start_date).days + 1
+
+    reports = []
+    for (window_start, window_end), targets in zip(windows, split_targets(nurse_shifts, windows)):
+        window_budget = None
+        if time_budget is not None:
+            window_budget = time_budget * ((window_end - window_start).days + 1) / total_days
+        report = create_schedule_with_pattern(
+            request, window_start, window_end, nurse_list, targets, dict(shift_requirements),
+            engine=engine, time_budget=window_budget, ward_id=ward_id, seed=seed,
+        )
+        reports.append({'start_date': window_start, 'end_date': window_end, 'report': report})
+    return reports
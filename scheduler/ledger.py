@@ -0,0 +1,172 @@
+"""
+간호사별 누적 근무 통계(FairnessLedger) 관리 모듈
+
+근무표를 저장/수정/삭제할 때 바뀐 칸만큼 누적값을 증분 갱신하고,
+근무표 생성 시에는 한 번의 조회로 누적값을 읽어 간호사별 근무 가격 보정치를 만든다.
+지난 Schedule 행을 다시 집계하지 않는다.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Count, F, Max, Min
+
+from .automaton import SHIFT_INDEX
+from .models import FairnessLedger
+
+FIELD_BY_SHIFT = {'D': 'd_count', 'E': 'e_count', 'N': 'n_count', 'OFF': 'off_count'}
+LEDGER_FIELDS = ('d_count', 'e_count', 'n_count', 'off_count', 'weekend_count', 'holiday_count')
+WORK_SHIFTS = ('D', 'E', 'N')
+
+# 가격 보정 설정 - 누적 비율이 평균보다 1.0 높을 때 근무 1일당 더해지는 가격
+SHIFT_SHARE_WEIGHT = 10.0
+WEEKEND_SHARE_WEIGHT = 10.0
+HOLIDAY_SHARE_WEIGHT = 10.0
+
+
+def _is_holiday(day):
+    # views가 이 모듈을 불러오므로 호출 시점에 가져옴
+    from .views import is_holiday
+    return is_holiday(day)
+
+
+def is_weekend(day):
+    """토요일/일요일 여부"""
+    return day.weekday() >= 5
+
+
+def cell_counts(day, shift):
+    """근무 한 칸이 누적 통계에 더하는 값"""
+    counts = {FIELD_BY_SHIFT[shift]: 1}
+    if shift in WORK_SHIFTS:
+        if is_weekend(day):
+            counts['weekend_count'] = 1
+        if _is_holiday(day):
+            counts['holiday_count'] = 1
+    return counts
+
+
+def apply_changes(changes):
+    """
+    바뀐 칸만큼 누적 통계를 증분 갱신하는 함수
+
+    Args:
+        changes: [(nurse_id, date, 이전 근무, 새 근무), ...] - 이전/새 근무가 None이면 생성/삭제
+    """
+    deltas = defaultdict(Counter)
+    for nurse_id, day, previous, new_shift in changes:
+        if previous is not None:
+            for field, value in cell_counts(day, previous).items():
+                deltas[nurse_id][field] -= value
+        if new_shift is not None:
+            for field, value in cell_counts(day, new_shift).items():
+                deltas[nurse_id][field] += value
+
+    apply_deltas(deltas)
+
+
+def apply_deltas(deltas):
+    """간호사별 증감값 {nurse_id: {필드: 증감}}을 누적 통계에 더하는 함수"""
+    deltas = {nurse_id: {field: value for field, value in delta.items() if value}
+              for nurse_id, delta in deltas.items()}
+    deltas = {nurse_id: delta for nurse_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    FairnessLedger.objects.bulk_create(
+        [FairnessLedger(nurse_id=nurse_id) for nurse_id in deltas],
+        ignore_conflicts=True,
+    )
+    for nurse_id, delta in deltas.items():
+        FairnessLedger.objects.filter(nurse_id=nurse_id).update(
+            **{field: F(field) + value for field, value in delta.items()}
+        )
+
+
+def remove_schedules(queryset):
+    """
+    삭제할 Schedule 쿼리셋만큼 누적 통계를 차감하는 함수 (삭제 직전에 호출)
+
+    행을 하나씩 불러오지 않고 간호사별 근무 수, 주말 근무 수, 공휴일 근무 수를 집계 쿼리로 구해 차감한다.
+    """
+    queryset = queryset.order_by()
+    bounds = queryset.aggregate(first=Min('date'), last=Max('date'))
+    if bounds['first'] is None:
+        return
+    deltas = defaultdict(Counter)
+    for nurse_id, shift, count in queryset.values_list('nurse_id', 'shift').annotate(count=Count('id')):
+        deltas[nurse_id][FIELD_BY_SHIFT[shift]] -= count
+
+    work = queryset.filter(shift__in=WORK_SHIFTS)
+    # Django week_day: 일요일 1, 토요일 7
+    for nurse_id, count in work.filter(date__week_day__in=[1, 7]).values_list('nurse_id').annotate(count=Count('id')):
+        deltas[nurse_id]['weekend_count'] -= count
+    days = (bounds['last'] - bounds['first']).days + 1
+    holidays = [day for day in (bounds['first'] + timedelta(days=offset) for offset in range(days)) if _is_holiday(day)]
+    if holidays:
+        for nurse_id, count in work.filter(date__in=holidays).values_list('nurse_id').annotate(count=Count('id')):
+            deltas[nurse_id]['holiday_count'] -= count
+    apply_deltas(deltas)
+
+
+def load_ledger(nurse_ids):
+    """간호사별 누적 통계를 한 번에 조회 {nurse_id: {필드: 값}} (기록이 없으면 0)"""
+    ledger = {nurse_id: dict.fromkeys(LEDGER_FIELDS, 0) for nurse_id in nurse_ids}
+    for row in FairnessLedger.objects.filter(nurse_id__in=list(ledger)).values('nurse_id', *LEDGER_FIELDS):
+        ledger[row.pop('nurse_id')] = row
+    return ledger
+
+
+def balance_offsets(nurse_list, date_range, ledger=None):
+    """
+    누적 통계로 간호사별 근무 가격 보정 배열을 만드는 함수
+
+    같은 유형(나이트킵/일반) 간호사 평균보다 특정 근무, 주말, 공휴일 근무 비율이 높은
+    간호사는 해당 칸의 가격을 올려 이번 기간에는 덜 배정되도록 한다.
+
+    Args:
+        nurse_list: 간호사 목록
+        date_range: 날짜 목록
+        ledger: load_ledger() 결과 (없으면 조회)
+
+    Returns:
+        {nurse_id: (날짜 수, 4) 크기의 가격 보정 배열}
+    """
+    if ledger is None:
+        ledger = load_ledger([nurse.id for nurse in nurse_list])
+
+    weekend_days = np.array([is_weekend(day) for day in date_range], dtype=float)
+    holiday_days = np.array([_is_holiday(day) for day in date_range], dtype=float)
+
+    def shares(row):
+        worked = row['d_count'] + row['e_count'] + row['n_count']
+        if worked == 0:
+            return None
+        return {
+            'D': row['d_count'] / worked,
+            'E': row['e_count'] / worked,
+            'N': row['n_count'] / worked,
+            'weekend': row['weekend_count'] / worked,
+            'holiday': row['holiday_count'] / worked,
+        }
+
+    offsets = {}
+    for is_night_keeper in (False, True):
+        group = [nurse for nurse in nurse_list if nurse.is_night_keeper == is_night_keeper]
+        group_shares = {nurse.id: shares(ledger[nurse.id]) for nurse in group}
+        known = [value for value in group_shares.values() if value is not None]
+        averages = {key: sum(value[key] for value in known) / len(known) for key in known[0]} if known else None
+
+        for nurse in group:
+            offset = np.zeros((len(date_range), len(SHIFT_INDEX)))
+            nurse_shares = group_shares[nurse.id]
+            if nurse_shares is not None and averages is not None:
+                if not is_night_keeper:
+                    for shift in WORK_SHIFTS:
+                        offset[:, SHIFT_INDEX[shift]] += SHIFT_SHARE_WEIGHT * (nurse_shares[shift] - averages[shift])
+                calendar_bias = (WEEKEND_SHARE_WEIGHT * (nurse_shares['weekend'] - averages['weekend']) * weekend_days
+                                 + HOLIDAY_SHARE_WEIGHT * (nurse_shares['holiday'] - averages['holiday']) * holiday_days)
+                for shift in WORK_SHIFTS:
+                    offset[:, SHIFT_INDEX[shift]] += calendar_bias
+            offsets[nurse.id] = offset
+    return offsets
@@ -0,0 +1,256 @@
+"""
+근무 수정 후 주변 구간만 다시 최적화하는 국소 보정 모듈
+
+병가, 근무 교환처럼 일부 칸을 고정(pin)으로 수정하면 전체 기간을 재생성하지 않고
+수정한 날짜 앞뒤의 주(월~일) 단위 구간만 다음 순서로 다시 맞춘다.
+
+    1. 고정한 칸 때문에 순서 규칙을 어기게 된 간호사는 구간 안의 근무를 패턴 DP로 다시 생성
+       (기존 근무를 최대한 유지하도록 가격을 조정, 근무표가 없는 날짜로 끊긴 구간은 연속된 날짜끼리 따로 생성)
+    2. 구간 안의 부족 인원은 날짜별 최소 비용 유량으로 보충 (고정 칸은 변경하지 않음)
+    3. 바뀐 칸만 Schedule에 반영하고 ShiftChangeHistory에 변경 이력을 남김
+
+병동이 있는 간호사의 수정은 그 병동의 간호사와 필요 인원 안에서만 보정한다.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max
+
+from .archive import schedule_rows
+from .automaton import RosterSchedule, SHIFT_INDEX, DEAD
+from .ledger import apply_changes
+from .models import Nurse, Schedule, ShiftChangeHistory, StaffingRequirement, WantedOff
+from .patterns import MAX_WORK_DAYS_PER_WEEK, build_roster, shift_prices
+from .repair import repair_coverage
+
+WINDOW_DAYS = 3            # 수정한 날짜 앞뒤로 다시 맞출 일수 (주 단위로 넓혀서 사용)
+CONTEXT_DAYS = 7           # 구간 앞뒤로 규칙 상태 확인을 위해 함께 불러오는 일수
+KEEP_BONUS = 30.0          # 기존 근무를 유지할 때의 가격 보너스
+PIN_PENALTY = 100000.0     # 고정 칸을 다른 근무로 바꿀 때의 가격
+DEFAULT_REQUIRED_STAFF = 4
+
+
+def get_shift_requirements(ward_id=None):
+    """근무별 필요 인원 설정 (병동을 주면 그 병동의 설정, 설정이 없으면 기본값)"""
+    if ward_id is not None:
+        # wards 모듈이 이 모듈을 불러오므로 함수 안에서 불러옴
+        from .wards import ward_requirements
+        return ward_requirements([ward_id])[ward_id]
+    requirements = {shift: DEFAULT_REQUIRED_STAFF for shift in ('D', 'E', 'N')}
+    for req in StaffingRequirement.objects.filter(ward__isnull=True):
+        requirements[req.shift] = req.required_staff
+    return requirements
+
+
+def repair_locally(pinned_edits, window_days=WINDOW_DAYS, nurse_list=None, commit=True):
+    """
+    고정 수정 사항을 반영하고 주변 구간만 다시 최적화하는 함수
+
+    수정한 간호사의 병동마다 그 병동 간호사와 병동 필요 인원만으로 보정한다
+    (병동이 없는 간호사는 병동 없는 간호사와 병동 구분 없는 필요 인원).
+
+    Args:
+        pinned_edits: {(nurse_id, date): shift} 고정할 수정 내용
+        window_days: 수정한 날짜 앞뒤로 다시 맞출 일수
+        nurse_list: 대상 간호사 목록 (수정한 간호사와 같은 병동 간호사만 사용, 없으면 해당 병동 전체)
+        commit: True이면 바뀐 칸을 DB에 저장하고 변경 이력을 남김
+
+    Returns:
+        {
+            'window': (구간 시작일, 구간 종료일),
+            'changes': [(nurse_id, date, 이전 근무, 새 근무), ...] 고정 칸을 포함한 바뀐 칸,
+            'unfilled': [(date, shift, 부족 인원), ...] 채우지 못한 부족 인원,
+            'violations': [(nurse_id, date), ...] 고정 칸 때문에 규칙을 지킬 수 없는 칸,
+        }
+    """
+    result = {'window': None, 'changes': [], 'unfilled': [], 'violations': []}
+    if not pinned_edits:
+        return result
+
+    ward_of = dict(Nurse.objects.filter(id__in={nurse_id for nurse_id, _ in pinned_edits}).values_list('id', 'ward_id'))
+    edits_by_ward = {}
+    for (nurse_id, day), shift in pinned_edits.items():
+        edits_by_ward.setdefault(ward_of.get(nurse_id), {})[(nurse_id, day)] = shift
+
+    windows = []
+    for ward_id, ward_edits in edits_by_ward.items():
+        ward_result = repair_ward(ward_edits, ward_id, window_days, nurse_list)
+        windows.append(ward_result['window'])
+        for key in ('changes', 'unfilled', 'violations'):
+            result[key].extend(ward_result[key])
+    result['window'] = (min(start for start, _ in windows), max(end for _, end in windows))
+
+    if commit and result['changes']:
+        save_changes(result['changes'])
+    return result
+
+
+def repair_ward(pinned_edits, ward_id, window_days=WINDOW_DAYS, nurse_list=None):
+    """
+    병동 하나의 고정 수정 사항을 반영하고 주변 구간을 다시 최적화하는 함수 (저장하지 않음)
+
+    Args:
+        pinned_edits: {(nurse_id, date): shift} 이 병동 간호사의 고정할 수정 내용
+        ward_id: 병동 id (None이면 병동 없는 간호사)
+        window_days: 수정한 날짜 앞뒤로 다시 맞출 일수
+        nurse_list: 대상 간호사 목록 (이 병동 간호사만 사용, 없으면 병동 전체)
+
+    Returns:
+        repair_locally()와 같은 형식
+    """
+    result = {'window': None, 'changes': [], 'unfilled': [], 'violations': []}
+    if nurse_list is None:
+        nurse_list = Nurse.objects.filter(ward_id=ward_id) if ward_id is not None else Nurse.objects.filter(ward__isnull=True)
+    nurse_list = [nurse for nurse in nurse_list if nurse.ward_id == ward_id]
+    nurses_by_id = {nurse.id: nurse for nurse in nurse_list}
+
+    # 1. 수정한 날짜를 포함하는 주 단위 구간과 앞뒤 규칙 확인 구간 계산
+    edit_dates = [day for _, day in pinned_edits]
+    window_start = min(edit_dates) - timedelta(days=window_days)
+    window_start -= timedelta(days=window_start.weekday())
+    window_end = max(edit_dates) + timedelta(days=window_days)
+    window_end += timedelta(days=6 - window_end.weekday())
+    load_start = window_start - timedelta(days=CONTEXT_DAYS)
+    load_end = window_end + timedelta(days=CONTEXT_DAYS)
+
+    # 구간 전체 근무를 한 번의 범위 조회로 불러옴
+    roster = RosterSchedule(nurse_list, load_start, load_end)
+    existing_days = set()
+    for nurse_id, day, shift in schedule_rows(load_start, load_end, list(nurses_by_id)):
+        roster[(nurse_id, day)] = shift
+        existing_days.add(day)
+
+    # 근무표가 있는 날짜만 다시 맞춤
+    window_dates = []
+    day = window_start
+    while day <= window_end:
+        if day in existing_days or day in edit_dates:
+            window_dates.append(day)
+        day += timedelta(days=1)
+    result['window'] = (window_dates[0], window_dates[-1])
+
+    wanted_offs = set(WantedOff.objects.filter(
+        date__range=[window_dates[0], window_dates[-1]], nurse_id__in=list(nurses_by_id)
+    ).exclude(status='denied').values_list('nurse_id', 'date'))
+
+    before = {(nurse_id, day): roster.get((nurse_id, day))
+              for nurse_id in nurses_by_id for day in window_dates}
+
+    # 2. 고정 칸 반영
+    for key, shift in pinned_edits.items():
+        roster[key] = shift
+    locked = set(pinned_edits)
+
+    requirements = get_shift_requirements(ward_id)
+    coverage = {day: dict(requirements) for day in window_dates}
+
+    # 근무표가 없는 날짜를 사이에 두면 패턴 DP가 날짜를 이어 붙이지 않도록 연속된 날짜끼리 나눔
+    runs = [[window_dates[0]]]
+    for day in window_dates[1:]:
+        if day - runs[-1][-1] == timedelta(days=1):
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+
+    # 3. 고정 칸 때문에 규칙(순서 규칙, 주간 근무 상한)을 어기게 된 간호사는 고정 칸이 있는 연속 구간의 근무를 패턴 DP로 다시 생성
+    for nurse_id in sorted({nurse_id for nurse_id, _ in pinned_edits}):
+        nurse = nurses_by_id.get(nurse_id)
+        if nurse is None:
+            continue
+        week_work = {}
+        for day in window_dates:
+            if roster.get((nurse_id, day)) in requirements:
+                week_start = day - timedelta(days=day.weekday())
+                week_work[week_start] = week_work.get(week_start, 0) + 1
+        over_cap = any(count > MAX_WORK_DAYS_PER_WEEK for count in week_work.values())
+        if DEAD not in roster.tracks[nurse_id].states and not over_cap:
+            continue
+
+        for run in runs:
+            if not any((nurse_id, day) in locked for day in run):
+                continue
+            remaining = {day: dict(coverage[day]) for day in run}
+            for (other_id, day), shift in roster.items():
+                if other_id != nurse_id and day in remaining and shift in requirements:
+                    remaining[day][shift] -= 1
+
+            prices = shift_prices(run, remaining)
+            current = [roster.get((nurse_id, day)) for day in run]
+            for idx, (day, shift) in enumerate(zip(run, current)):
+                if (nurse_id, day) in locked:
+                    prices[idx, :] += PIN_PENALTY
+                    prices[idx, SHIFT_INDEX[shift]] -= PIN_PENALTY
+                elif shift is not None:
+                    prices[idx, SHIFT_INDEX[shift]] -= KEEP_BONUS
+
+            work_target = sum(1 for shift in current if shift not in (None, 'OFF'))
+            new_shifts = build_roster(
+                nurse.is_night_keeper,
+                run,
+                prices,
+                wanted_off_days={day for other_id, day in wanted_offs if other_id == nurse_id},
+                work_target=work_target,
+                initial_state=roster.state_before(nurse_id, run[0]),
+            )
+
+            pins_kept = all(
+                new_shifts[idx] == pinned_edits[(nurse_id, day)]
+                for idx, day in enumerate(run) if (nurse_id, day) in locked
+            )
+            if pins_kept and roster.allows_sequence(nurse_id, run[0], new_shifts):
+                for day, shift in zip(run, new_shifts):
+                    roster[(nurse_id, day)] = shift
+            else:
+                result['violations'].extend(
+                    (nurse_id, day) for day in run
+                    if (nurse_id, day) in locked
+                )
+
+    # 4. 구간 안의 부족 인원을 최소 비용 유량으로 보충 (고정 칸은 그대로 유지)
+    repair_result = repair_coverage(roster, nurse_list, window_dates, coverage, wanted_offs, locked=locked)
+    result['unfilled'] = repair_result['unfilled']
+
+    # 5. 바뀐 칸만 모아 저장
+    for (nurse_id, day), previous in before.items():
+        new_shift = roster.get((nurse_id, day))
+        if new_shift is not None and new_shift != previous:
+            result['changes'].append((nurse_id, day, previous, new_shift))
+    return result
+
+
+def save_changes(changes):
+    """
+    바뀐 칸을 Schedule에 반영하고 ShiftChangeHistory에 변경 이력을 남기는 함수 (누적 근무 통계도 함께 갱신)
+
+    Args:
+        changes: [(nurse_id, date, 이전 근무, 새 근무), ...] - 이전 근무가 None이면 새로 생성 (근무 병동은 소속 병동)
+    """
+    nurse_ids = {nurse_id for nurse_id, _, _, _ in changes}
+    dates = [day for _, day, _, _ in changes]
+    home_ward = dict(Nurse.objects.filter(id__in=nurse_ids).values_list('id', 'ward_id'))
+
+    with transaction.atomic():
+        # (간호사, 날짜)별 마지막 변경 순서 번호를 한 번에 조회
+        last_numbers = {
+            (row['nurse_id'], row['date']): row['last']
+            for row in ShiftChangeHistory.objects.filter(
+                nurse_id__in=nurse_ids, date__range=[min(dates), max(dates)]
+            ).values('nurse_id', 'date').annotate(last=Max('change_number'))
+        }
+
+        histories = []
+        for nurse_id, day, previous, new_shift in changes:
+            updated = Schedule.objects.filter(nurse_id=nurse_id, date=day).update(shift=new_shift)
+            if not updated:
+                Schedule.objects.create(nurse_id=nurse_id, date=day, shift=new_shift, ward_id=home_ward.get(nurse_id))
+            if previous is None:
+                continue
+            histories.append(ShiftChangeHistory(
+                nurse_id=nurse_id,
+                date=day,
+                previous_shift=previous,
+                new_shift=new_shift,
+                change_number=last_numbers.get((nurse_id, day), 0) + 1,
+            ))
+        ShiftChangeHistory.objects.bulk_create(histories)
+        apply_changes(changes)
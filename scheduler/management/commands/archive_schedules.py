@@ -0,0 +1,58 @@
+"""
+마감된 근무표 보관 명령
+
+지정한 날짜 이전에 끝난 달의 근무를 간호사-월 하나당 한 행(ArchivedSchedule)으로 옮긴다.
+보관된 달은 근무표 조회, 분석, 생성 시 직전 근무 조회에서 그대로 함께 읽힌다.
+
+사용 예:
+    python manage.py archive_schedules                      # 이번 달 이전에 끝난 달 모두 보관
+    python manage.py archive_schedules --before 2025-01-01
+    python manage.py archive_schedules --restore 2024-11 2024-12
+"""
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scheduler.archive import archive_before, restore_months
+
+
+def parse_month(value):
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except ValueError:
+        raise CommandError(f'월 형식이 올바르지 않습니다: {value} (YYYY-MM)')
+
+
+class Command(BaseCommand):
+    help = '마감된 달의 근무표를 간호사-월 단위 압축 행으로 보관합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', help='이 날짜 이전에 끝난 달을 보관 (YYYY-MM-DD, 기본: 이번 달 1일)')
+        parser.add_argument('--restore', nargs=2, metavar=('FROM', 'TO'),
+                            help='보관한 달(YYYY-MM)을 근무 테이블로 되돌림')
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            start_month, end_month = (parse_month(value) for value in options['restore'])
+            if start_month > end_month:
+                raise CommandError('시작 월이 종료 월보다 늦습니다.')
+            restored = restore_months(start_month, end_month)
+            self.stdout.write(self.style.SUCCESS(f'근무 {restored}칸을 근무 테이블로 되돌렸습니다.'))
+            return
+
+        if options['before']:
+            try:
+                before = datetime.strptime(options['before'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f'날짜 형식이 올바르지 않습니다: {options["before"]} (YYYY-MM-DD)')
+        else:
+            before = date.today().replace(day=1)
+
+        result = archive_before(before)
+        if not result['months']:
+            self.stdout.write(self.style.WARNING('보관할 근무표가 없습니다.'))
+            return
+        months = ', '.join(month.strftime('%Y-%m') for month in result['months'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(result["months"])}개월({months}) 근무 {result["rows"]}행을 보관 행 {result["packed"]}개로 옮겼습니다.'
+        ))
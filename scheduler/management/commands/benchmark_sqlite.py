@@ -0,0 +1,175 @@
+"""
+SQLite 동시 접근 성능 측정 명령
+
+DB 파일을 임시 파일로 복사한 뒤, 근무표를 배치로 저장하는 쓰기 작업(ScheduleWriter와 같은 방식)을 돌리는 동안
+여러 읽기 연결이 근무표 화면과 같은 기간 조회를 반복한다.
+기본 설정(DEFAULT_PRAGMAS)과 WAL 설정(settings.SQLITE_PRAGMAS, 없으면 WAL_PRAGMAS)으로 각각 실행해
+읽기 지연 시간(p50/p95/최대)과 "database is locked" 오류 수를 JSON 한 줄씩 출력한다. 원본 DB는 바꾸지 않는다.
+
+사용 예:
+    python manage.py benchmark_sqlite
+    python manage.py benchmark_sqlite --rows 200000 --readers 8 --hold-ms 100
+    python manage.py benchmark_sqlite --mode after --database /path/to/db.sqlite3
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from scheduler.persistence import FLUSH_BATCH_SIZE
+from scheduler.sqlite import DEFAULT_PRAGMAS, WAL_PRAGMAS, apply_pragmas
+
+BENCHMARK_START = date(2099, 1, 1)  # 기존 근무표와 겹치지 않는 기간에 씀
+SHIFTS = ('D', 'E', 'N', 'OFF')
+
+
+def is_locked(error):
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+def percentile(values, ratio):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+class Command(BaseCommand):
+    help = 'SQLite 연결 설정 전후의 읽기 지연 시간과 잠금 오류를 쓰기 작업 중에 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', help='측정할 SQLite 파일 (기본: 설정의 default DB)')
+        parser.add_argument('--mode', choices=['before', 'after', 'both'], default='both',
+                            help='before: 기본 설정, after: settings.SQLITE_PRAGMAS 또는 WAL_PRAGMAS, both: 둘 다 (기본)')
+        parser.add_argument('--rows', type=int, default=100_000, help='쓰기 작업이 저장할 근무 칸 수')
+        parser.add_argument('--batch-size', type=int, default=FLUSH_BATCH_SIZE, help='한 트랜잭션에 저장할 칸 수')
+        parser.add_argument('--hold-ms', type=int, default=50,
+                            help='배치마다 커밋 전에 잠금을 쥐고 있는 시간 (누적 통계 갱신 등 생성 작업 모사)')
+        parser.add_argument('--readers', type=int, default=4, help='동시에 조회하는 연결 수')
+        parser.add_argument('--think-ms', type=int, default=10, help='읽기 연결의 조회 간격')
+
+    def handle(self, *args, **options):
+        source = options['database'] or settings.DATABASES['default']['NAME']
+        if not source or str(source) == ':memory:' or not os.path.exists(source):
+            raise CommandError(f'SQLite DB 파일을 찾을 수 없습니다: {source}')
+
+        modes = ['before', 'after'] if options['mode'] == 'both' else [options['mode']]
+        for mode in modes:
+            pragmas = DEFAULT_PRAGMAS if mode == 'before' else getattr(settings, 'SQLITE_PRAGMAS', WAL_PRAGMAS)
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'benchmark.sqlite3')
+                self.copy_database(source, path)
+                result = self.run(path, pragmas, options)
+            self.stdout.write(json.dumps({'mode': mode, 'pragmas': pragmas, **result}))
+
+    def copy_database(self, source, path):
+        """원본 DB를 임시 파일로 복사 (다른 연결이 쓰는 중이어도 일관된 사본)"""
+        src = sqlite3.connect(source)
+        dst = sqlite3.connect(path)
+        try:
+            src.backup(dst)
+        finally:
+            src.close()
+            dst.close()
+
+    def connect(self, path, pragmas):
+        # 잠금 대기는 busy_timeout PRAGMA로만 정함 (sqlite3 모듈 자체 대기 없음), 트랜잭션은 직접 관리
+        connection = sqlite3.connect(path, timeout=0, isolation_level=None, check_same_thread=False)
+        apply_pragmas(connection.cursor(), pragmas)
+        return connection
+
+    def run(self, path, pragmas, options):
+        setup = self.connect(path, pragmas)
+        nurse_ids = [row[0] for row in setup.execute('SELECT id FROM scheduler_nurse ORDER BY id')]
+        if not nurse_ids:
+            setup.close()
+            raise CommandError('간호사가 없어 근무표를 쓸 수 없습니다.')
+        days = -(-options['rows'] // len(nurse_ids))
+        end = BENCHMARK_START + timedelta(days=days - 1)
+        setup.execute('DELETE FROM scheduler_schedule WHERE date BETWEEN ? AND ?',
+                      (BENCHMARK_START.isoformat(), end.isoformat()))
+        setup.close()
+
+        cells = [(nurse_id, (BENCHMARK_START + timedelta(days=offset)).isoformat(), SHIFTS[(nurse_id + offset) % 4])
+                 for offset in range(days) for nurse_id in nurse_ids][:options['rows']]
+        done = threading.Event()
+        latencies = []
+        reader_errors = []
+        writer = {'errors': 0, 'elapsed': 0.0}
+        lock = threading.Lock()
+
+        def read_loop(index):
+            connection = self.connect(path, pragmas)
+            window = 28
+            offset = index * 7
+            try:
+                while not done.is_set():
+                    start = BENCHMARK_START + timedelta(days=offset % max(1, days - window))
+                    began = time.perf_counter()
+                    try:
+                        connection.execute(
+                            'SELECT nurse_id, date, shift FROM scheduler_schedule WHERE date BETWEEN ? AND ?',
+                            (start.isoformat(), (start + timedelta(days=window - 1)).isoformat()),
+                        ).fetchall()
+                    except sqlite3.OperationalError as error:
+                        if not is_locked(error):
+                            raise
+                        with lock:
+                            reader_errors.append(1)
+                    else:
+                        with lock:
+                            latencies.append((time.perf_counter() - began) * 1000)
+                    offset += 1
+                    time.sleep(options['think_ms'] / 1000)
+            finally:
+                connection.close()
+
+        def write_all():
+            connection = self.connect(path, pragmas)
+            began = time.perf_counter()
+            try:
+                for position in range(0, len(cells), options['batch_size']):
+                    batch = cells[position:position + options['batch_size']]
+                    while True:
+                        try:
+                            connection.execute('BEGIN')
+                            connection.executemany(
+                                'INSERT INTO scheduler_schedule (nurse_id, date, shift) VALUES (?, ?, ?)', batch
+                            )
+                            time.sleep(options['hold_ms'] / 1000)
+                            connection.execute('COMMIT')
+                            break
+                        except sqlite3.OperationalError as error:
+                            if not is_locked(error):
+                                raise
+                            writer['errors'] += 1
+                            if connection.in_transaction:
+                                connection.execute('ROLLBACK')
+            finally:
+                writer['elapsed'] = time.perf_counter() - began
+                connection.close()
+                done.set()
+
+        readers = [threading.Thread(target=read_loop, args=(index,)) for index in range(options['readers'])]
+        for thread in readers:
+            thread.start()
+        write_all()
+        for thread in readers:
+            thread.join()
+
+        return {
+            'rows': len(cells),
+            'writer_seconds': round(writer['elapsed'], 2),
+            'writer_lock_errors': writer['errors'],
+            'reads': len(latencies),
+            'read_p50_ms': round(percentile(latencies, 0.5) or 0, 2),
+            'read_p95_ms': round(percentile(latencies, 0.95) or 0, 2),
+            'read_max_ms': round(max(latencies, default=0), 2),
+            'reader_lock_errors': len(reader_errors),
+        }
@@ -0,0 +1,227 @@
+"""
+근무표 생성 명령 (웹 화면 없이 실행)
+
+웹의 근무표 생성과 같은 create_schedule_with_pattern() 파이프라인을 실행하고,
+기간마다 단계별 소요 시간 보고서(상세 내역이 담긴 생성 보고서 번호 report_id 포함)와
+요약 메시지를 JSON 한 줄로 출력한다.
+간호사별 목표 근무 수는 필요 근무 수를 고르게 나눈 값(wards.even_targets)을 쓴다.
+--ward를 여러 번 지정하면 병동별 생성(wards.generate_wards)으로 병동들을 나눠서 생성하고,
+남은 부족 인원은 병동 간 지원 근무(float_pool.balance_float_pool)로 채운다 (--no-float로 끔).
+연 단위처럼 긴 기간은 --stream으로 구간별로 생성하며 바로 저장해(streaming.generate_streaming)
+메모리 사용량이 기간 길이와 관계없이 일정하게 한다.
+
+사용 예:
+    python manage.py generate_schedule --range 2025-06-01 2025-06-30
+    python manage.py generate_schedule --range 2025-06-01 2025-06-30 --ward W1 --seed 7 --time-budget 60
+    python manage.py generate_schedule --ranges-file nightly_ranges.txt --engine greedy
+    python manage.py generate_schedule --range 2025-06-01 2025-06-30 --ward W1 --ward W2 --ward W3 --workers 2
+    python manage.py generate_schedule --range 2025-01-01 2025-12-31 --ward W1 --stream
+
+기간 파일 형식 (한 줄에 한 기간, #으로 시작하는 줄은 무시):
+    2025-06-01 2025-06-30
+    2025-07-01 2025-07-31
+"""
+import json
+from datetime import datetime
+
+from django.contrib.messages import constants
+from django.contrib.messages.storage.base import BaseStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest
+
+from scheduler.feasibility import analyze_capacity
+from scheduler.float_pool import balance_float_pool
+from scheduler.horizon import generate_rolling
+from scheduler.models import Nurse, StaffingRequirement, Ward
+from scheduler.streaming import generate_streaming
+from scheduler.views import create_schedule_with_pattern
+from scheduler.wards import even_targets, generate_wards, ward_requirements
+
+
+class MemoryStorage(BaseStorage):
+    """세션/쿠키 없이 생성 중 메시지를 메모리에만 모으는 메시지 저장소"""
+
+    def _get(self, *args, **kwargs):
+        return [], True
+
+    def _store(self, messages, response, *args, **kwargs):
+        return []
+
+
+def headless_request():
+    """메시지를 메모리에 모으는 HTTP 요청 객체 (create_schedule_with_pattern 호출용)"""
+    request = HttpRequest()
+    request._messages = MemoryStorage(request)
+    return request
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value.strip(), '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'날짜 형식이 올바르지 않습니다: {value} (YYYY-MM-DD)')
+
+
+class Command(BaseCommand):
+    help = '근무표를 생성하고 기간별 생성 보고서를 JSON으로 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--range', nargs=2, action='append', default=[], metavar=('START', 'END'),
+                            help='생성 기간 (여러 번 지정 가능)')
+        parser.add_argument('--ranges-file', help='한 줄에 "시작일 종료일" 형식으로 기간을 적은 파일')
+        parser.add_argument('--ward', action='append', default=[],
+                            help='병동 코드 (지정하면 해당 병동 간호사와 필요 인원만 사용, 여러 번 지정하면 병동별로 생성)')
+        parser.add_argument('--workers', type=int, help='여러 병동 생성 시 작업자 프로세스 수 (기본: CPU 수)')
+        parser.add_argument('--no-float', action='store_true',
+                            help='여러 병동 생성 후 병동 간 지원 근무로 부족 인원을 채우지 않음')
+        parser.add_argument('--seed', type=int, help='난수 시드 (기간마다 같은 시드로 시작, 같은 입력이면 결과 캐시 사용)')
+        parser.add_argument('--engine', choices=['pattern', 'greedy'], default='pattern', help='생성 방식 (기본: pattern)')
+        parser.add_argument('--time-budget', type=float, help='기간별 생성 제한 시간(초)')
+        parser.add_argument('--rolling', action='store_true', help='월 단위 구간으로 나눠 연속 생성')
+        parser.add_argument('--stream', action='store_true',
+                            help='4주 구간별로 생성하며 바로 저장 (긴 기간을 일정한 메모리로 생성, 패턴 DP만 사용)')
+        parser.add_argument('--ignore-capacity', action='store_true',
+                            help='인력 용량이 부족해도 생성 (기본: 해당 기간을 건너뜀)')
+
+    def handle(self, *args, **options):
+        ranges = [(parse_date(start), parse_date(end)) for start, end in options['range']]
+        if options['ranges_file']:
+            try:
+                with open(options['ranges_file'], encoding='utf-8') as f:
+                    lines = [line.split() for line in f if line.strip() and not line.lstrip().startswith('#')]
+            except OSError as e:
+                raise CommandError(f'기간 파일을 열 수 없습니다: {e}')
+            for fields in lines:
+                if len(fields) != 2:
+                    raise CommandError(f'기간 파일 형식이 올바르지 않습니다: {" ".join(fields)}')
+                ranges.append((parse_date(fields[0]), parse_date(fields[1])))
+        if not ranges:
+            raise CommandError('--range 또는 --ranges-file로 생성 기간을 지정하세요.')
+        for start_date, end_date in ranges:
+            if start_date > end_date:
+                raise CommandError(f'시작일이 종료일보다 늦습니다: {start_date} ~ {end_date}')
+
+        wards = []
+        for code in options['ward']:
+            ward = Ward.objects.filter(code=code).first()
+            if ward is None:
+                raise CommandError(f'병동 {code}이(가) 없습니다.')
+            wards.append(ward)
+        if options['stream'] and (options['engine'] != 'pattern' or options['rolling']
+                                  or options['time_budget'] is not None):
+            raise CommandError('--stream에는 --engine greedy, --rolling, --time-budget을 쓸 수 없습니다.')
+        if len(wards) > 1:
+            # 병동별 생성은 패턴 DP만 사용하고 기간을 한 번에 생성함
+            if options['engine'] != 'pattern' or options['rolling'] or options['time_budget'] is not None:
+                raise CommandError('여러 병동 생성에는 --engine greedy, --rolling, --time-budget을 쓸 수 없습니다.')
+            if options['stream']:
+                raise CommandError('여러 병동 생성에는 --stream을 쓸 수 없습니다.')
+            for start_date, end_date in ranges:
+                result = self.run_wards(options, wards, start_date, end_date)
+                self.stdout.write(json.dumps(result, cls=DjangoJSONEncoder, ensure_ascii=False))
+            return
+
+        ward = wards[0] if wards else None
+        if ward is not None:
+            nurse_list = list(Nurse.objects.filter(ward=ward))
+            shift_requirements = ward_requirements([ward.id])[ward.id]
+        else:
+            nurse_list = list(Nurse.objects.all())
+            # 웹 화면과 같이 병동 구분 없는 기본 설정, 없으면 1명
+            shift_requirements = {'D': 1, 'E': 1, 'N': 1}
+            shift_requirements.update(
+                StaffingRequirement.objects.filter(ward__isnull=True).values_list('shift', 'required_staff')
+            )
+        if not nurse_list:
+            raise CommandError('근무표를 생성할 간호사가 없습니다.')
+
+        for start_date, end_date in ranges:
+            result = self.run(options, ward, nurse_list, shift_requirements, start_date, end_date)
+            self.stdout.write(json.dumps(result, cls=DjangoJSONEncoder, ensure_ascii=False))
+
+    def run(self, options, ward, nurse_list, shift_requirements, start_date, end_date):
+        """기간 하나의 근무표를 생성하고 출력할 결과를 만듦"""
+        days = (end_date - start_date).days + 1
+        nurse_shifts = even_targets(nurse_list, days, shift_requirements)
+        capacity = analyze_capacity(nurse_list, start_date, end_date, shift_requirements, nurse_shifts=nurse_shifts)
+        result = {
+            'start_date': start_date,
+            'end_date': end_date,
+            'ward': ward.code if ward else None,
+            'engine': options['engine'],
+            'seed': options['seed'],
+            'capacity': {key: capacity[key] for key in ('feasible', 'errors', 'warnings')},
+            'skipped': False,
+        }
+        if not capacity['feasible'] and not options['ignore_capacity']:
+            result['skipped'] = True
+            return result
+
+        request = headless_request()
+        ward_id = ward.id if ward else None
+        if options['stream']:
+            result['report'] = generate_streaming(
+                start_date, end_date, nurse_list, shift_requirements, nurse_shifts=nurse_shifts,
+                seed=options['seed'], ward_id=ward_id,
+            )
+        elif options['rolling']:
+            result['windows'] = generate_rolling(
+                request, start_date, end_date, nurse_list, nurse_shifts, shift_requirements,
+                engine=options['engine'], time_budget=options['time_budget'], ward_id=ward_id,
+                seed=options['seed'],
+            )
+        else:
+            result['report'] = create_schedule_with_pattern(
+                request, start_date, end_date, nurse_list, nurse_shifts, dict(shift_requirements),
+                engine=options['engine'], time_budget=options['time_budget'], ward_id=ward_id,
+                seed=options['seed'],
+            )
+        result['messages'] = [
+            {'level': constants.DEFAULT_TAGS.get(message.level, str(message.level)), 'message': message.message}
+            for message in request._messages
+        ]
+        return result
+
+    def run_wards(self, options, wards, start_date, end_date):
+        """여러 병동의 기간 하나를 병동별로 생성하고 출력할 결과를 만듦"""
+        days = (end_date - start_date).days + 1
+        requirements = ward_requirements([ward.id for ward in wards])
+        nurses_by_ward = {ward.id: [] for ward in wards}
+        for nurse in Nurse.objects.filter(ward__in=wards):
+            nurses_by_ward[nurse.ward_id].append(nurse)
+        if not any(nurses_by_ward.values()):
+            raise CommandError('근무표를 생성할 간호사가 없습니다.')
+
+        capacity = {}
+        for ward in wards:
+            nurse_list = nurses_by_ward[ward.id]
+            analysis = analyze_capacity(nurse_list, start_date, end_date, requirements[ward.id],
+                                        nurse_shifts=even_targets(nurse_list, days, requirements[ward.id]))
+            capacity[ward.code] = {key: analysis[key] for key in ('feasible', 'errors', 'warnings')}
+        result = {
+            'start_date': start_date,
+            'end_date': end_date,
+            'ward': [ward.code for ward in wards],
+            'engine': options['engine'],
+            'seed': options['seed'],
+            'capacity': capacity,
+            'skipped': False,
+        }
+        if not all(analysis['feasible'] for analysis in capacity.values()) and not options['ignore_capacity']:
+            result['skipped'] = True
+            return result
+
+        report = generate_wards([ward.id for ward in wards], start_date, end_date,
+                                workers=options['workers'], seed=options['seed'])
+        floats = None if options['no_float'] else balance_float_pool([ward.id for ward in wards], start_date, end_date)
+        codes = {ward.id: ward.code for ward in wards}
+        result['report'] = {**report, 'wards': {codes[ward_id]: value for ward_id, value in report['wards'].items()}}
+        if floats is not None:
+            result['float'] = {
+                'moved': len(floats['moved']),
+                'extra': len(floats['extra']),
+                'unfilled': [(codes[ward_id], day, shift, count) for ward_id, day, shift, count in floats['unfilled']],
+                'elapsed': floats['elapsed'],
+            }
+        return result
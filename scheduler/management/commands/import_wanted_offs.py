@@ -0,0 +1,83 @@
+"""
+원티드 OFF CSV 일괄 등록 명령
+
+CSV 형식 (첫 줄은 헤더):
+    employee_id,date,reason
+    N001,2025-05-03,가족 행사
+
+사용 예:
+    python manage.py import_wanted_offs wanted_offs.csv
+    python manage.py import_wanted_offs wanted_offs.csv --replace
+"""
+import csv
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from scheduler.models import Nurse, WantedOff
+
+
+class Command(BaseCommand):
+    help = '원티드 OFF 요청을 CSV 파일에서 일괄 등록합니다. (employee_id,date[,reason])'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='CSV 파일 경로')
+        parser.add_argument('--replace', action='store_true',
+                            help='CSV에 포함된 날짜 범위의 기존 요청을 삭제하고 다시 등록')
+        parser.add_argument('--encoding', default='utf-8-sig', help='CSV 파일 인코딩 (기본: utf-8-sig)')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_file'], newline='', encoding=options['encoding']) as f:
+                rows = list(csv.DictReader(f))
+        except OSError as e:
+            raise CommandError(f'CSV 파일을 열 수 없습니다: {e}')
+
+        if not rows:
+            self.stdout.write(self.style.WARNING('등록할 요청이 없습니다.'))
+            return
+        missing = {'employee_id', 'date'} - set(rows[0])
+        if missing:
+            raise CommandError(f'CSV 헤더에 {", ".join(sorted(missing))} 열이 없습니다.')
+
+        # 사번 -> 간호사 id 를 한 번에 조회
+        employee_ids = {row['employee_id'].strip() for row in rows}
+        nurse_ids = dict(Nurse.objects.filter(employee_id__in=employee_ids).values_list('employee_id', 'id'))
+
+        requests = {}
+        errors = []
+        for line_no, row in enumerate(rows, start=2):
+            employee_id = row['employee_id'].strip()
+            if employee_id not in nurse_ids:
+                errors.append(f'{line_no}행: 사번 {employee_id} 간호사가 없습니다.')
+                continue
+            try:
+                day = datetime.strptime(row['date'].strip(), '%Y-%m-%d').date()
+            except ValueError:
+                errors.append(f'{line_no}행: 날짜 형식이 올바르지 않습니다. ({row["date"]})')
+                continue
+            requests[(nurse_ids[employee_id], day)] = (row.get('reason') or '').strip()[:100]
+
+        for error in errors:
+            self.stderr.write(error)
+        if not requests:
+            raise CommandError('등록할 수 있는 요청이 없습니다.')
+
+        dates = [day for _, day in requests]
+        with transaction.atomic():
+            deleted = 0
+            if options['replace']:
+                deleted, _ = WantedOff.objects.filter(date__range=[min(dates), max(dates)]).delete()
+            before = WantedOff.objects.count()
+            WantedOff.objects.bulk_create(
+                [WantedOff(nurse_id=nurse_id, date=day, reason=reason)
+                 for (nurse_id, day), reason in requests.items()],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+            created = WantedOff.objects.count() - before
+
+        self.stdout.write(self.style.SUCCESS(
+            f'원티드 OFF {created}건 등록 (중복 {len(requests) - created}건 건너뜀, 기존 {deleted}건 삭제, 오류 {len(errors)}건)'
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0008_alter_nurse_options_nurse_is_night_keeper_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WantedOff',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('reason', models.CharField(blank=True, max_length=100, verbose_name='사유')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('nurse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wanted_offs', to='scheduler.nurse', verbose_name='간호사')),
+            ],
+            options={
+                'verbose_name': '원티드 OFF',
+                'verbose_name_plural': '원티드 OFF 목록',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['date'], name='wantedoff_date_idx')],
+                'unique_together': {('nurse', 'date')},
+            },
+        ),
+    ]
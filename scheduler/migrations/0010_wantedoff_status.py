@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0009_wantedoff'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wantedoff',
+            name='decided_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='조정 시각'),
+        ),
+        migrations.AddField(
+            model_name='wantedoff',
+            name='status',
+            field=models.CharField(choices=[('pending', '대기'), ('granted', '승인'), ('denied', '반려')], default='pending', max_length=10, verbose_name='처리 상태'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def build_ledger(apps, schema_editor):
+    # 기존 근무표로 누적 근무 통계 초기값 생성 (공휴일 정보는 없으므로 0)
+    Schedule = apps.get_model('scheduler', 'Schedule')
+    FairnessLedger = apps.get_model('scheduler', 'FairnessLedger')
+    work = Q(shift__in=['D', 'E', 'N'])
+    rows = Schedule.objects.values('nurse_id').annotate(
+        d_count=Count('id', filter=Q(shift='D')),
+        e_count=Count('id', filter=Q(shift='E')),
+        n_count=Count('id', filter=Q(shift='N')),
+        off_count=Count('id', filter=Q(shift='OFF')),
+        weekend_count=Count('id', filter=work & Q(date__week_day__in=[1, 7])),
+    )
+    FairnessLedger.objects.bulk_create([FairnessLedger(**row) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0010_wantedoff_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FairnessLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('d_count', models.IntegerField(default=0, verbose_name='D 근무 수')),
+                ('e_count', models.IntegerField(default=0, verbose_name='E 근무 수')),
+                ('n_count', models.IntegerField(default=0, verbose_name='N 근무 수')),
+                ('off_count', models.IntegerField(default=0, verbose_name='OFF 수')),
+                ('weekend_count', models.IntegerField(default=0, verbose_name='주말 근무 수')),
+                ('holiday_count', models.IntegerField(default=0, verbose_name='공휴일 근무 수')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('nurse', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ledger', to='scheduler.nurse', verbose_name='간호사')),
+            ],
+            options={
+                'verbose_name': '누적 근무 통계',
+                'verbose_name_plural': '누적 근무 통계',
+            },
+        ),
+        migrations.RunPython(build_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0011_fairnessledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ward',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='병동명')),
+                ('code', models.CharField(max_length=20, unique=True, verbose_name='병동 코드')),
+            ],
+            options={
+                'verbose_name': '병동',
+                'verbose_name_plural': '병동 목록',
+                'ordering': ['code'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='staffingrequirement',
+            name='shift',
+            field=models.CharField(choices=[('D', '데이'), ('E', '이브닝'), ('N', '나이트')], max_length=3),
+        ),
+        migrations.AddField(
+            model_name='nurse',
+            name='ward',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='nurses', to='scheduler.ward', verbose_name='소속 병동'),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='ward',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='schedules', to='scheduler.ward', verbose_name='근무 병동'),
+        ),
+        migrations.AddField(
+            model_name='staffingrequirement',
+            name='ward',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='staffing_requirements', to='scheduler.ward', verbose_name='병동'),
+        ),
+        migrations.AddConstraint(
+            model_name='staffingrequirement',
+            constraint=models.UniqueConstraint(fields=('ward', 'shift'), name='staffing_ward_shift_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='staffingrequirement',
+            constraint=models.UniqueConstraint(condition=models.Q(('ward__isnull', True)), fields=('shift',), name='staffing_default_shift_uniq'),
+        ),
+    ]
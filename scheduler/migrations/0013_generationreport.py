@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0012_ward'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시각')),
+                ('start_date', models.DateField(verbose_name='시작일')),
+                ('end_date', models.DateField(verbose_name='종료일')),
+                ('engine', models.CharField(choices=[('pattern', '패턴 DP'), ('greedy', '탐욕 배정')], default='pattern', max_length=10, verbose_name='생성 방식')),
+                ('saved_count', models.IntegerField(default=0, verbose_name='저장한 칸 수')),
+                ('elapsed', models.FloatField(default=0, verbose_name='소요 시간(초)')),
+                ('timed_out', models.BooleanField(default=False, verbose_name='제한 시간 초과')),
+                ('phases', models.JSONField(blank=True, default=list, verbose_name='단계별 소요 시간')),
+                ('ward', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='generation_reports', to='scheduler.ward', verbose_name='병동')),
+            ],
+            options={
+                'verbose_name': '생성 보고서',
+                'verbose_name_plural': '생성 보고서 목록',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='GenerationReportEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('shortage', '인원 부족'), ('repair', '보완'), ('violation', '규칙 위반'), ('info', '정보')], max_length=10, verbose_name='종류')),
+                ('date', models.DateField(blank=True, null=True, verbose_name='날짜')),
+                ('shift', models.CharField(blank=True, max_length=3, verbose_name='근무')),
+                ('message', models.TextField(verbose_name='내용')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='scheduler.generationreport', verbose_name='보고서')),
+            ],
+            options={
+                'verbose_name': '생성 보고서 항목',
+                'verbose_name_plural': '생성 보고서 항목',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['report', 'kind'], name='reportentry_report_kind_idx')],
+            },
+        ),
+    ]
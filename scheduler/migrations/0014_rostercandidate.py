@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0013_generationreport'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RosterCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField(verbose_name='시작일')),
+                ('end_date', models.DateField(verbose_name='종료일')),
+                ('engine', models.CharField(blank=True, max_length=10, verbose_name='생성 방식')),
+                ('seed', models.BigIntegerField(blank=True, null=True, verbose_name='난수 시드')),
+                ('packed', models.JSONField(verbose_name='근무 문자열')),
+                ('digest', models.CharField(max_length=64, verbose_name='근무표 지문')),
+                ('score', models.FloatField(verbose_name='점수')),
+                ('metrics', models.JSONField(blank=True, default=dict, verbose_name='점수 항목')),
+                ('is_active', models.BooleanField(default=False, verbose_name='적용 중')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시각')),
+                ('ward', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='roster_candidates', to='scheduler.ward', verbose_name='병동')),
+            ],
+            options={
+                'verbose_name': '근무표 후보',
+                'verbose_name_plural': '근무표 후보 목록',
+                'ordering': ['score', 'created_at'],
+                'indexes': [models.Index(fields=['start_date', 'end_date', 'ward'], name='candidate_period_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0014_rostercandidate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='월')),
+                ('shifts', models.CharField(max_length=31, verbose_name='근무 문자열')),
+                ('ward_days', models.JSONField(blank=True, default=dict, verbose_name='다른 병동 근무일')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='보관 시각')),
+                ('nurse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_schedules', to='scheduler.nurse', verbose_name='간호사')),
+                ('ward', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_schedules', to='scheduler.ward', verbose_name='근무 병동')),
+            ],
+            options={
+                'verbose_name': '보관 근무표',
+                'verbose_name_plural': '보관 근무표',
+                'indexes': [models.Index(fields=['month'], name='archived_month_idx')],
+                'unique_together': {('nurse', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0015_archivedschedule'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['date', 'shift', 'nurse'], name='schedule_date_shift_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['nurse', 'shift', 'date'], name='schedule_nurse_shift_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shiftchangehistory',
+            index=models.Index(fields=['nurse', 'date', 'change_number'], name='shiftchange_nurse_date_idx'),
+        ),
+    ]
@@ -2,10 +2,24 @@ from django.db import models
 
 # Create your models here.
 
+class Ward(models.Model):
+    """병동(근무 단위) 모델"""
+    name = models.CharField(max_length=100, verbose_name="병동명")
+    code = models.CharField(max_length=20, unique=True, verbose_name="병동 코드")
+    
+    class Meta:
+        verbose_name = "병동"
+        verbose_name_plural = "병동 목록"
+        ordering = ['code']
+    
+    def __str__(self):
+        return f"{self.name} ({self.code})"
+
 class Nurse(models.Model):
     """간호사 모델"""
     name = models.CharField(max_length=100, verbose_name="이름")
     employee_id = models.CharField(max_length=20, unique=True, verbose_name="사번")
+    ward = models.ForeignKey(Ward, on_delete=models.SET_NULL, null=True, blank=True, related_name='nurses', verbose_name="소속 병동")
     is_night_keeper = models.BooleanField(default=False, verbose_name="나이트 킵")
     skill_level = models.IntegerField(default=1, choices=[
         (1, '초급 1'),
@@ -34,9 +48,17 @@ class Schedule(models.Model):
     nurse = models.ForeignKey(Nurse, on_delete=models.CASCADE)
     date = models.DateField()
     shift = models.CharField(max_length=3, choices=SHIFT_CHOICES)
+    # 실제 근무한 병동 (다른 병동 지원 근무 포함, 병동 구분 없이 생성한 근무표는 비어 있음)
+    ward = models.ForeignKey(Ward, on_delete=models.SET_NULL, null=True, blank=True, related_name='schedules', verbose_name="근무 병동")
     
     class Meta:
         unique_together = ['nurse', 'date']
+        indexes = [
+            # 기간 조회(date 범위)와 날짜별 근무 인원 집계(date, shift) - nurse까지 포함해 행을 읽지 않음
+            models.Index(fields=['date', 'shift', 'nurse'], name='schedule_date_shift_idx'),
+            # 간호사별 근무 종류 수 집계(nurse, shift)
+            models.Index(fields=['nurse', 'shift', 'date'], name='schedule_nurse_shift_idx'),
+        ]
     
     def __str__(self):
         return f"{self.nurse.name} - {self.date} - {self.get_shift_display()}"
@@ -59,10 +81,55 @@ class ShiftChangeHistory(models.Model):
     
     class Meta:
         ordering = ['-change_time']
+        # 근무표 화면의 간호사/날짜/변경 순서 정렬과 마지막 변경 번호 조회
+        indexes = [models.Index(fields=['nurse', 'date', 'change_number'], name='shiftchange_nurse_date_idx')]
     
     def __str__(self):
         return f"{self.nurse.name} - {self.date} - {self.previous_shift} → {self.new_shift}"
 
+class WantedOff(models.Model):
+    """간호사별 원티드 OFF(휴무 요청) 모델"""
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('granted', '승인'),
+        ('denied', '반려'),
+    ]
+    
+    nurse = models.ForeignKey(Nurse, on_delete=models.CASCADE, related_name='wanted_offs', verbose_name="간호사")
+    date = models.DateField(verbose_name="날짜")
+    reason = models.CharField(max_length=100, blank=True, verbose_name="사유")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name="처리 상태")
+    decided_at = models.DateTimeField(null=True, blank=True, verbose_name="조정 시각")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "원티드 OFF"
+        verbose_name_plural = "원티드 OFF 목록"
+        unique_together = ['nurse', 'date']
+        indexes = [models.Index(fields=['date'], name='wantedoff_date_idx')]
+        ordering = ['date']
+    
+    def __str__(self):
+        return f"{self.nurse.name} - {self.date} 원티드 OFF"
+
+class FairnessLedger(models.Model):
+    """간호사별 누적 근무 통계 (근무표 저장/수정 시 증분 갱신)"""
+    nurse = models.OneToOneField(Nurse, on_delete=models.CASCADE, related_name='ledger', verbose_name="간호사")
+    d_count = models.IntegerField(default=0, verbose_name="D 근무 수")
+    e_count = models.IntegerField(default=0, verbose_name="E 근무 수")
+    n_count = models.IntegerField(default=0, verbose_name="N 근무 수")
+    off_count = models.IntegerField(default=0, verbose_name="OFF 수")
+    weekend_count = models.IntegerField(default=0, verbose_name="주말 근무 수")
+    holiday_count = models.IntegerField(default=0, verbose_name="공휴일 근무 수")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "누적 근무 통계"
+        verbose_name_plural = "누적 근무 통계"
+    
+    def __str__(self):
+        return f"{self.nurse.name} - D:{self.d_count} E:{self.e_count} N:{self.n_count} OFF:{self.off_count}"
+
 class StaffingRequirement(models.Model):
     """각 근무 코드별 필요 인원 수 모델"""
     SHIFT_CHOICES = [
@@ -71,8 +138,110 @@ class StaffingRequirement(models.Model):
         ('N', '나이트'),
     ]
     
-    shift = models.CharField(max_length=3, choices=SHIFT_CHOICES, unique=True)
+    # 병동이 비어 있으면 병동 구분 없는 기본 설정
+    ward = models.ForeignKey(Ward, on_delete=models.CASCADE, null=True, blank=True, related_name='staffing_requirements', verbose_name="병동")
+    shift = models.CharField(max_length=3, choices=SHIFT_CHOICES)
     required_staff = models.PositiveIntegerField(default=1)
     
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['ward', 'shift'], name='staffing_ward_shift_uniq'),
+            models.UniqueConstraint(fields=['shift'], condition=models.Q(ward__isnull=True), name='staffing_default_shift_uniq'),
+        ]
+    
+    def __str__(self):
+        prefix = f"{self.ward.name} " if self.ward_id else ""
+        return f"{prefix}{self.get_shift_display()} - {self.required_staff}명"
+
+class GenerationReport(models.Model):
+    """근무표 생성 1회의 결과 보고서 (상세 항목은 GenerationReportEntry)"""
+    ENGINE_CHOICES = [
+        ('pattern', '패턴 DP'),
+        ('greedy', '탐욕 배정'),
+    ]
+    
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성 시각")
+    start_date = models.DateField(verbose_name="시작일")
+    end_date = models.DateField(verbose_name="종료일")
+    ward = models.ForeignKey(Ward, on_delete=models.SET_NULL, null=True, blank=True, related_name='generation_reports', verbose_name="병동")
+    engine = models.CharField(max_length=10, choices=ENGINE_CHOICES, default='pattern', verbose_name="생성 방식")
+    saved_count = models.IntegerField(default=0, verbose_name="저장한 칸 수")
+    elapsed = models.FloatField(default=0, verbose_name="소요 시간(초)")
+    timed_out = models.BooleanField(default=False, verbose_name="제한 시간 초과")
+    phases = models.JSONField(default=list, blank=True, verbose_name="단계별 소요 시간")
+    
+    class Meta:
+        verbose_name = "생성 보고서"
+        verbose_name_plural = "생성 보고서 목록"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.start_date} ~ {self.end_date} 생성 보고서 ({self.created_at:%Y-%m-%d %H:%M})"
+
+class GenerationReportEntry(models.Model):
+    """생성 보고서의 항목 하나 (부족 인원, 보완, 규칙 위반 수정 등)"""
+    KIND_CHOICES = [
+        ('shortage', '인원 부족'),
+        ('repair', '보완'),
+        ('violation', '규칙 위반'),
+        ('info', '정보'),
+    ]
+    
+    report = models.ForeignKey(GenerationReport, on_delete=models.CASCADE, related_name='entries', verbose_name="보고서")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name="종류")
+    date = models.DateField(null=True, blank=True, verbose_name="날짜")
+    shift = models.CharField(max_length=3, blank=True, verbose_name="근무")
+    message = models.TextField(verbose_name="내용")
+    
+    class Meta:
+        verbose_name = "생성 보고서 항목"
+        verbose_name_plural = "생성 보고서 항목"
+        ordering = ['id']
+        indexes = [models.Index(fields=['report', 'kind'], name='reportentry_report_kind_idx')]
+    
+    def __str__(self):
+        return f"[{self.get_kind_display()}] {self.message[:50]}"
+
+class RosterCandidate(models.Model):
+    """기간별로 보관하는 근무표 후보 (점수가 좋은 상위 몇 개만 유지)"""
+    start_date = models.DateField(verbose_name="시작일")
+    end_date = models.DateField(verbose_name="종료일")
+    ward = models.ForeignKey(Ward, on_delete=models.CASCADE, null=True, blank=True, related_name='roster_candidates', verbose_name="병동")
+    engine = models.CharField(max_length=10, blank=True, verbose_name="생성 방식")
+    seed = models.BigIntegerField(null=True, blank=True, verbose_name="난수 시드")
+    # {nurse_id: 'DDEONN...'} - 시작일부터 하루 한 글자 (D/E/N, OFF는 O)
+    packed = models.JSONField(verbose_name="근무 문자열")
+    digest = models.CharField(max_length=64, verbose_name="근무표 지문")
+    score = models.FloatField(verbose_name="점수")
+    metrics = models.JSONField(default=dict, blank=True, verbose_name="점수 항목")
+    is_active = models.BooleanField(default=False, verbose_name="적용 중")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성 시각")
+    
+    class Meta:
+        verbose_name = "근무표 후보"
+        verbose_name_plural = "근무표 후보 목록"
+        ordering = ['score', 'created_at']
+        indexes = [models.Index(fields=['start_date', 'end_date', 'ward'], name='candidate_period_idx')]
+    
+    def __str__(self):
+        return f"{self.start_date} ~ {self.end_date} 후보 #{self.id} (점수 {self.score:.1f})"
+
+class ArchivedSchedule(models.Model):
+    """마감된 달의 근무를 간호사-월 하나의 행으로 압축해 보관하는 모델 (scheduler.archive 참고)"""
+    nurse = models.ForeignKey(Nurse, on_delete=models.CASCADE, related_name='archived_schedules', verbose_name="간호사")
+    month = models.DateField(verbose_name="월")  # 해당 월 1일
+    # 1일부터 하루 한 글자 (D/E/N, OFF는 O, 근무표가 없던 날은 .)
+    shifts = models.CharField(max_length=31, verbose_name="근무 문자열")
+    # 그 달에 가장 많이 근무한 병동과, 그와 다른 병동에서 근무한 날 {일자 오프셋: ward_id}
+    ward = models.ForeignKey(Ward, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_schedules', verbose_name="근무 병동")
+    ward_days = models.JSONField(default=dict, blank=True, verbose_name="다른 병동 근무일")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="보관 시각")
+    
+    class Meta:
+        verbose_name = "보관 근무표"
+        verbose_name_plural = "보관 근무표"
+        unique_together = ['nurse', 'month']
+        indexes = [models.Index(fields=['month'], name='archived_month_idx')]
+    
     def __str__(self):
-        return f"{self.get_shift_display()} - {self.required_staff}명"
+        return f"{self.nurse.name} - {self.month:%Y-%m} 보관 근무표"
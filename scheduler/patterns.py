@@ -0,0 +1,225 @@
+"""
+규칙을 만족하는 주간 근무 패턴 라이브러리와 간호사별 DP 근무표 생성 모듈
+
+주(월~일) 단위로 가능한 근무 순서를 간호사 유형(나이트킵/일반)과
+주 시작 시점의 오토마톤 상태별로 한 번만 열거해 캐시해 두고,
+간호사 한 명의 근무표는 주 경계의 오토마톤 상태를 DP 상태로 삼아
+날짜별 근무 가격의 합이 가장 작은 패턴 조합으로 만든다.
+만들어지는 근무표는 항상 순서 규칙과 주간 근무 상한을 만족한다.
+"""
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from .automaton import SHIFTS, SHIFT_INDEX, TRANSITIONS, ACCEPTING, FREE, DEAD
+
+MAX_WORK_DAYS_PER_WEEK = 5  # 일주일(월~일)에 6일 이상 근무 불가
+
+OFF_INDEX = SHIFT_INDEX['OFF']
+WORK_SHIFTS = ('D', 'E', 'N')
+
+# 가격 설정 (낮을수록 배정이 유리)
+COVER_REWARD = 10.0        # 아직 필요 인원이 남은 근무
+SHORTAGE_WEIGHT = 2.0      # 남은 필요 인원 1명당 추가 보상
+SKILL_REWARD = 5.0         # 필요한 숙련도 범주가 남은 근무
+SURPLUS_COST = 8.0         # 필요 인원이 이미 찬 근무
+WANTED_OFF_PENALTY = 1000.0
+JITTER = 0.01              # 동점 패턴 사이의 무작위 선택용
+
+
+@lru_cache(maxsize=None)
+def pattern_library(is_night_keeper, length, start_state=FREE, work_cap=MAX_WORK_DAYS_PER_WEEK):
+    """
+    시작 상태에서 출발해 규칙을 지키는 length일짜리 근무 패턴 목록
+
+    Args:
+        is_night_keeper: 나이트킵 간호사 여부
+        length: 패턴 길이 (1~7일)
+        start_state: 패턴 시작 직전의 오토마톤 상태
+        work_cap: 패턴 안에서 허용되는 최대 근무일 수
+
+    Returns:
+        (patterns, groups)
+        patterns: (패턴 수, length) 크기의 근무 인덱스 배열 (SHIFTS 순서)
+        groups: {종료 상태: 해당 종료 상태를 갖는 패턴 인덱스 배열}
+    """
+    table = TRANSITIONS[bool(is_night_keeper)]
+    patterns = []
+    end_states = []
+
+    def extend(prefix, state, work_days):
+        if len(prefix) == length:
+            patterns.append(tuple(prefix))
+            end_states.append(state)
+            return
+        for shift_idx in range(len(SHIFTS)):
+            next_state = table[state][shift_idx]
+            if next_state == DEAD:
+                continue
+            worked = work_days + (shift_idx != OFF_INDEX)
+            if worked > work_cap:
+                continue
+            prefix.append(shift_idx)
+            extend(prefix, next_state, worked)
+            prefix.pop()
+
+    if start_state != DEAD:
+        extend([], start_state, 0)
+
+    pattern_array = np.array(patterns, dtype=np.int8).reshape(len(patterns), length)
+    end_array = np.array(end_states, dtype=np.int8)
+    groups = {int(state): np.flatnonzero(end_array == state) for state in set(end_states)}
+    return pattern_array, groups
+
+
+def week_blocks(date_range):
+    """날짜 범위를 월요일 기준 주 단위 구간 [(시작 인덱스, 길이), ...]으로 분할"""
+    blocks = []
+    idx = 0
+    while idx < len(date_range):
+        length = min(7 - date_range[idx].weekday(), len(date_range) - idx)
+        blocks.append((idx, length))
+        idx += length
+    return blocks
+
+
+def skill_category(skill_level):
+    """숙련도 범주 (1-2: 초급, 3-4: 중급, 5-6: 고급)"""
+    if skill_level >= 5:
+        return 'high'
+    if skill_level >= 3:
+        return 'mid'
+    return 'low'
+
+
+def shift_prices(date_range, remaining, skill_needs=None, skill_level=None):
+    """
+    필요 인원 현황으로 날짜별 근무 가격표를 만드는 함수
+
+    Args:
+        date_range: 날짜 목록
+        remaining: {date: {'D': 남은 필요 인원, 'E': ..., 'N': ...}}
+        skill_needs: {date: {shift: {'high': int, 'mid': int, 'low': int}}} (선택)
+        skill_level: 근무표를 만들 간호사의 숙련도 (skill_needs와 함께 사용)
+
+    Returns:
+        (날짜 수, 4) 크기의 가격 배열 - OFF 가격은 0
+    """
+    prices = np.zeros((len(date_range), len(SHIFTS)))
+    category = skill_category(skill_level) if skill_needs is not None and skill_level is not None else None
+
+    for i, day in enumerate(date_range):
+        for shift in WORK_SHIFTS:
+            left = remaining[day][shift]
+            if left > 0:
+                price = -COVER_REWARD - SHORTAGE_WEIGHT * left
+                if category and skill_needs[day][shift][category] > 0:
+                    price -= SKILL_REWARD
+            else:
+                price = SURPLUS_COST
+            prices[i, SHIFT_INDEX[shift]] = price + random.random() * JITTER
+    return prices
+
+
+def _solve(is_night_keeper, date_range, prices, initial_state, prior_week_work):
+    """주 경계 상태 DP로 가격 합이 최소인 근무 인덱스 배열을 구함 (불가능하면 None)"""
+    blocks = week_blocks(date_range)
+    best = {initial_state: 0.0}
+    backpointers = []
+
+    for block_no, (offset, length) in enumerate(blocks):
+        work_cap = MAX_WORK_DAYS_PER_WEEK - (prior_week_work if block_no == 0 else 0)
+        block_prices = prices[offset:offset + length]
+        rows = np.arange(length)
+        next_best = {}
+        choice = {}
+
+        for state, cost in best.items():
+            patterns, groups = pattern_library(is_night_keeper, length, state, max(work_cap, 0))
+            if not len(patterns):
+                continue
+            pattern_costs = block_prices[rows, patterns].sum(axis=1)
+            for end_state, indexes in groups.items():
+                pick = indexes[np.argmin(pattern_costs[indexes])]
+                total = cost + pattern_costs[pick]
+                if total < next_best.get(end_state, np.inf):
+                    next_best[end_state] = total
+                    choice[end_state] = (state, pick)
+
+        backpointers.append(choice)
+        best = next_best
+        if not best:
+            return None
+
+    accepting = ACCEPTING[bool(is_night_keeper)]
+    finals = [(cost, state) for state, cost in best.items() if accepting[state]]
+    if not finals:
+        return None
+    _, state = min(finals)
+
+    result = np.empty(len(date_range), dtype=np.int8)
+    for block_no in range(len(blocks) - 1, -1, -1):
+        offset, length = blocks[block_no]
+        prev_state, pick = backpointers[block_no][state]
+        work_cap = MAX_WORK_DAYS_PER_WEEK - (prior_week_work if block_no == 0 else 0)
+        patterns, _ = pattern_library(is_night_keeper, length, prev_state, max(work_cap, 0))
+        result[offset:offset + length] = patterns[pick]
+        state = prev_state
+    return result
+
+
+def build_roster(is_night_keeper, date_range, prices, wanted_off_days=(), work_target=None,
+                 initial_state=FREE, prior_week_work=0):
+    """
+    간호사 한 명의 근무표를 패턴 DP로 생성하는 함수
+
+    Args:
+        is_night_keeper: 나이트킵 간호사 여부
+        date_range: 날짜 목록
+        prices: shift_prices()로 만든 (날짜 수, 4) 가격 배열
+        wanted_off_days: 원티드 OFF 날짜 모음 (가능한 한 OFF로 유지)
+        work_target: 목표 근무일 수 (없으면 가격만으로 결정)
+        initial_state: 기간 시작 직전의 오토마톤 상태
+        prior_week_work: 기간 첫 주에서 시작일 이전에 이미 근무한 일수
+
+    Returns:
+        날짜 순서대로의 근무 목록 ['D', 'OFF', ...]
+    """
+    prices = np.array(prices, dtype=float)
+    wanted = [i for i, day in enumerate(date_range) if day in wanted_off_days]
+    if wanted:
+        prices[np.ix_(wanted, [SHIFT_INDEX[s] for s in WORK_SHIFTS])] += WANTED_OFF_PENALTY
+
+    def solve(offset):
+        adjusted = prices.copy()
+        adjusted[:, :OFF_INDEX] += offset
+        return _solve(is_night_keeper, date_range, adjusted, initial_state, prior_week_work)
+
+    best = solve(0.0)
+    if best is None:
+        return ['OFF'] * len(date_range)
+
+    if work_target is not None:
+        # 근무 1일당 가격 보정치(라그랑주 승수)를 이분 탐색해 목표 근무일 수에 맞춤
+        def work_days(roster):
+            return int(np.count_nonzero(roster != OFF_INDEX))
+
+        low, high = -3 * COVER_REWARD, 3 * COVER_REWARD
+        best_gap = abs(work_days(best) - work_target)
+        for _ in range(12):
+            if best_gap == 0:
+                break
+            offset = (low + high) / 2
+            roster = solve(offset)
+            if roster is None:
+                break
+            worked = work_days(roster)
+            if abs(worked - work_target) < best_gap:
+                best, best_gap = roster, abs(worked - work_target)
+            if worked > work_target:
+                low = offset
+            else:
+                high = offset
+
+    return [SHIFTS[idx] for idx in best]
@@ -0,0 +1,108 @@
+"""
+근무표 일괄 저장 모듈
+
+확정된 근무 칸을 모아 두었다가 일정 개수마다 한 번에 저장하고 메모리에서 비운다.
+칸마다 조회/저장하지 않으므로 긴 기간도 저장 쿼리 수가 칸 수 / 배치 크기로 줄어든다.
+
+저장 방식은 DB 종류에 따라 고른다.
+    PostgreSQL - COPY로 임시 테이블에 흘려 넣은 뒤 INSERT ... ON CONFLICT 한 번으로 Schedule에 합침
+    그 외(SQLite) - bulk_create를 배치 크기로 나눠 실행
+"""
+import io
+
+from django.db import connection, transaction
+
+from .ledger import apply_changes
+from .models import Schedule
+
+FLUSH_BATCH_SIZE = 2000  # 한 번에 저장하는 근무 칸 수
+COPY_TABLE = 'schedule_copy_load'  # COPY용 임시 테이블 (트랜잭션이 끝나면 삭제)
+
+
+def copy_schedules(rows, ward_id=None):
+    """
+    근무 칸을 PostgreSQL COPY로 저장하는 함수 (트랜잭션 안에서 호출)
+
+    임시 테이블에 COPY로 넣은 뒤 같은 (간호사, 날짜)의 기존 근무를 읽고,
+    INSERT ... ON CONFLICT (nurse_id, date) DO UPDATE 한 번으로 Schedule에 합친다.
+
+    Args:
+        rows: [(nurse_id, date, shift), ...]
+        ward_id: 근무 병동 id
+
+    Returns:
+        {(nurse_id, date): 덮어쓴 기존 근무} - 누적 통계 갱신용
+    """
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    table = connection.ops.quote_name(Schedule._meta.db_table)
+    load = connection.ops.quote_name(COPY_TABLE)
+    columns = 'nurse_id, date, shift, ward_id'
+    copy_sql = f'COPY {load} ({columns}) FROM STDIN'
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE TEMP TABLE {load} (nurse_id bigint, date date, shift varchar(3), ward_id bigint)')
+        if is_psycopg3:
+            with cursor.copy(copy_sql) as copy:
+                for nurse_id, day, shift in rows:
+                    copy.write_row((nurse_id, day, shift, ward_id))
+        else:
+            # psycopg2: 탭 구분 텍스트 (NULL은 \N)
+            ward = '\\N' if ward_id is None else str(ward_id)
+            lines = (f'{nurse_id}\t{day.isoformat()}\t{shift}\t{ward}\n' for nurse_id, day, shift in rows)
+            cursor.copy_expert(copy_sql, io.StringIO(''.join(lines)))
+
+        cursor.execute(
+            f'SELECT s.nurse_id, s.date, s.shift FROM {table} s '
+            f'JOIN {load} l ON l.nurse_id = s.nurse_id AND l.date = s.date'
+        )
+        previous = {(nurse_id, day): shift for nurse_id, day, shift in cursor.fetchall()}
+        cursor.execute(
+            f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {load} '
+            f'ON CONFLICT (nurse_id, date) DO UPDATE SET shift = EXCLUDED.shift, ward_id = EXCLUDED.ward_id'
+        )
+        cursor.execute(f'DROP TABLE {load}')
+    return previous
+
+
+class ScheduleWriter:
+    """
+    확정된 근무 칸을 배치 단위로 Schedule에 저장하는 클래스
+
+    같은 (간호사, 날짜)의 기존 근무는 미리 삭제되어 있어야 한다 (PostgreSQL은 덮어씀).
+    저장한 칸만큼 누적 근무 통계(FairnessLedger)도 함께 갱신한다.
+
+    Args:
+        batch_size: 모아 두었다가 한 번에 저장할 칸 수
+        ward_id: 저장하는 근무의 근무 병동 (없으면 병동 구분 없음)
+    """
+
+    def __init__(self, batch_size=FLUSH_BATCH_SIZE, ward_id=None):
+        self.batch_size = batch_size
+        self.ward_id = ward_id
+        self.pending = []
+        self.written = 0
+
+    def add(self, nurse_id, day, shift):
+        """근무 칸 하나를 추가하고, 배치가 차면 저장"""
+        self.pending.append((nurse_id, day, shift))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """모아 둔 근무 칸을 저장하고 비움"""
+        if not self.pending:
+            return
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                previous = copy_schedules(self.pending, self.ward_id)
+            else:
+                previous = {}
+                Schedule.objects.bulk_create(
+                    [Schedule(nurse_id=nurse_id, date=day, shift=shift, ward_id=self.ward_id)
+                     for nurse_id, day, shift in self.pending],
+                    batch_size=self.batch_size,
+                )
+            apply_changes((nurse_id, day, previous.get((nurse_id, day)), shift) for nurse_id, day, shift in self.pending)
+        self.written += len(self.pending)
+        self.pending = []
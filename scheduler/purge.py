@@ -0,0 +1,75 @@
+"""
+근무표 기간 삭제 모듈
+
+기간(과 병동 또는 간호사)에 해당하는 근무 행을 불러오지 않고 집합 단위 DELETE로 지운다.
+누적 근무 통계(FairnessLedger)는 간호사별 집계 쿼리로 한 번에 차감하고,
+보관된 달(ArchivedSchedule)과 겹치는 칸도 함께 비운다. 모든 작업은 한 트랜잭션에서 처리한다.
+
+archive=True이면 지우는 대신 보관 근무표로 옮겨 근무 테이블만 비운다 (누적 통계와 조회 결과는 그대로).
+"""
+from django.db import transaction
+
+from .archive import EMPTY_CODE, archive_range, clear_archived, schedule_bounds
+from .ledger import remove_schedules
+from .models import ArchivedSchedule, FairnessLedger, Nurse, Schedule, ShiftChangeHistory
+
+
+def delete_schedules(start_date=None, end_date=None, ward_id=None, nurse_ids=None, archive=False, history=False):
+    """
+    기간의 근무표를 지우는 함수
+
+    Args:
+        start_date: 시작 날짜 (None이면 첫 근무일부터)
+        end_date: 종료 날짜 (None이면 마지막 근무일까지)
+        ward_id: 이 병동 소속 간호사의 근무만 지움 (None이면 병동 구분 없음)
+        nurse_ids: 대상 간호사 id 목록 (None이면 전체, ward_id와 함께 주면 둘 다 만족하는 간호사)
+        archive: 지우기 전에 보관 근무표로 옮김 (근무 변경 이력은 지우지 않음)
+        history: 기간의 근무 변경 이력(ShiftChangeHistory)도 지움
+
+    Returns:
+        {'deleted': 지운 근무 행 수, 'archived': 보관으로 옮긴 근무 행 수,
+         'cleared': 비운 보관 칸 수, 'history': 지운 변경 이력 수}
+    """
+    result = {'deleted': 0, 'archived': 0, 'cleared': 0, 'history': 0}
+    whole = start_date is None and end_date is None and ward_id is None and nurse_ids is None
+    if start_date is None or end_date is None:
+        first, last = schedule_bounds()
+        if first is None:
+            return result
+        start_date = start_date or first
+        end_date = end_date or last
+
+    scope = None
+    if ward_id is not None:
+        scope = Nurse.objects.filter(ward_id=ward_id)
+        if nurse_ids is not None:
+            scope = scope.filter(id__in=list(nurse_ids))
+        scope = list(scope.values_list('id', flat=True))
+    elif nurse_ids is not None:
+        scope = list(nurse_ids)
+
+    schedules = Schedule.objects.filter(date__range=[start_date, end_date])
+    changes = ShiftChangeHistory.objects.filter(date__range=[start_date, end_date])
+    if scope is not None:
+        schedules = schedules.filter(nurse_id__in=scope)
+        changes = changes.filter(nurse_id__in=scope)
+
+    with transaction.atomic():
+        if archive:
+            result['archived'] = archive_range(start_date, end_date, scope)['rows']
+            return result
+
+        if whole:
+            # 전체 삭제는 누적 통계도 처음부터 다시 쌓이도록 비움
+            result['deleted'] = schedules.delete()[0]
+            archived = ArchivedSchedule.objects.all()
+            result['cleared'] = sum(len(shifts.replace(EMPTY_CODE, '')) for shifts in archived.values_list('shifts', flat=True))
+            archived.delete()
+            FairnessLedger.objects.all().delete()
+        else:
+            remove_schedules(schedules)
+            result['deleted'] = schedules.delete()[0]
+            result['cleared'] = clear_archived(start_date, end_date, scope)
+        if history:
+            result['history'] = changes.delete()[0]
+    return result
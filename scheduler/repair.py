@@ -0,0 +1,275 @@
+"""
+최소 비용 유량 기반 근무 인원 보충 모듈
+
+하루 단위로 부족한 근무 자리와 배정 가능한 간호사를 이분 그래프로 만들고,
+최소 비용 최대 유량을 구해 채울 수 있는 부족 인원을 한 번에 채운다.
+
+    source -> 부족 근무(D/E/N) -> 간호사 -> sink              (OFF인 간호사)
+    source -> 부족 근무(D/E/N) -> 간호사 -> 초과 근무 -> sink  (인원이 남는 근무에서 이동)
+
+간선 비용은 근무 유형 균형, 순환 패턴, 근무량 점수로 정한다.
+"""
+from collections import deque
+from datetime import timedelta
+
+from .automaton import AFTER_D, AFTER_E, AFTER_N1, NIGHT_STATES
+from .patterns import MAX_WORK_DAYS_PER_WEEK
+
+WORK_SHIFTS = ('D', 'E', 'N')
+
+# 비용 설정 (낮을수록 우선 배정)
+WORKLOAD_COST = 5          # 간호사의 현재 근무일 1일당
+BALANCE_WEIGHT = 100       # 해당 근무 비율이 1/3보다 낮을수록 감소
+PATTERN_BONUS = 80         # D→E, E→N 순환 패턴
+MOVE_COST = 40             # 이미 근무 중인 간호사를 다른 근무로 이동
+NIGHT_BLOCK_COST = 30      # N을 NN 블록으로 배정 (다음 날 N 추가)
+
+
+class MinCostFlow:
+    """연속 최단 경로(SSP) 방식의 최소 비용 최대 유량 (작은 그래프용)"""
+
+    def __init__(self, node_count):
+        self.graph = [[] for _ in range(node_count)]
+
+    def add_edge(self, u, v, capacity, cost):
+        """간선 추가 - 유량 조회용 핸들 (u, 간선 인덱스)을 반환"""
+        self.graph[u].append([v, capacity, cost, len(self.graph[v])])
+        self.graph[v].append([u, 0, -cost, len(self.graph[u]) - 1])
+        return u, len(self.graph[u]) - 1
+
+    def edge_flow(self, handle):
+        """add_edge가 반환한 간선에 흐르는 유량"""
+        u, idx = handle
+        v, _, _, rev = self.graph[u][idx]
+        return self.graph[v][rev][1]
+
+    def flow(self, source, sink, max_flow=None):
+        """source에서 sink로 최대 유량을 최소 비용으로 흘리고 (유량, 비용)을 반환"""
+        total_flow = 0
+        total_cost = 0
+        node_count = len(self.graph)
+
+        while max_flow is None or total_flow < max_flow:
+            # SPFA로 잔여 그래프의 최단 경로 탐색 (음수 비용 간선 허용)
+            dist = [None] * node_count
+            in_queue = [False] * node_count
+            prev = [None] * node_count
+            dist[source] = 0
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                in_queue[u] = False
+                for idx, (v, capacity, cost, _) in enumerate(self.graph[u]):
+                    if capacity > 0 and (dist[v] is None or dist[u] + cost < dist[v]):
+                        dist[v] = dist[u] + cost
+                        prev[v] = (u, idx)
+                        if not in_queue[v]:
+                            in_queue[v] = True
+                            queue.append(v)
+
+            if dist[sink] is None:
+                break
+
+            # 경로상 최소 잔여 용량만큼 흘림
+            push = None if max_flow is None else max_flow - total_flow
+            v = sink
+            while v != source:
+                u, idx = prev[v]
+                capacity = self.graph[u][idx][1]
+                push = capacity if push is None else min(push, capacity)
+                v = u
+
+            v = sink
+            while v != source:
+                u, idx = prev[v]
+                edge = self.graph[u][idx]
+                edge[1] -= push
+                self.graph[v][edge[3]][1] += push
+                v = u
+
+            total_flow += push
+            total_cost += push * dist[sink]
+
+        return total_flow, total_cost
+
+
+def _week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def assignment_cost(shift, counts, prev_state, is_night_keeper):
+    """부족 근무에 간호사를 배정할 때의 비용 (균형 점수와 패턴 점수가 높을수록 낮음)"""
+    total = counts['D'] + counts['E'] + counts['N']
+    cost = WORKLOAD_COST * total
+
+    if not is_night_keeper:
+        ratio = counts[shift] / (total + 1)
+        if ratio < 1 / 3:
+            cost -= int(BALANCE_WEIGHT * (1 / 3 - ratio))
+
+    if (prev_state == AFTER_D and shift == 'E') or (prev_state == AFTER_E and shift == 'N'):
+        cost -= PATTERN_BONUS
+    return cost
+
+
+def repair_coverage(final_schedule, nurse_list, date_range, requirements, off_requests=(), budget=None, locked=(),
+                    prior_week_work=None):
+    """
+    최소 비용 유량으로 날짜별 부족 인원을 보충하는 함수
+
+    Args:
+        final_schedule: automaton.RosterSchedule 근무표 (직접 수정됨)
+        nurse_list: 간호사 목록
+        date_range: 보충할 날짜 목록
+        requirements: {date: {'D': 필요 인원, 'E': ..., 'N': ...}}
+        off_requests: (nurse_id, date) 형태의 휴무 요청 - 해당 칸은 근무로 바꾸지 않음
+        budget: budget.TimeBudget - 제한 시간이 지나면 남은 날짜는 보충하지 않고 부족 인원만 기록
+        locked: (nurse_id, date) 형태의 고정 칸 - 근무 이동과 신규 배정 모두에서 제외
+        prior_week_work: {nurse_id: 첫 주에서 date_range 시작일 이전에 이미 근무한 일수}
+
+    Returns:
+        {
+            'assigned': [(nurse_id, date, shift), ...] 새로 근무가 된 칸,
+            'moved': [(nurse_id, date, 이전 근무, 새 근무), ...] 다른 근무로 이동한 칸,
+            'unfilled': [(date, shift, 부족 인원), ...] 채우지 못한 부족 인원,
+        }
+    """
+    result = {'assigned': [], 'moved': [], 'unfilled': []}
+    off_requests = set(off_requests) | set(locked)
+    locked = set(locked)
+    nurses = list(nurse_list)
+    in_range = set(date_range)
+
+    # 간호사별 근무 유형 수와 주간 근무일 수 (배정할 때마다 갱신)
+    shift_counts = {nurse.id: {'D': 0, 'E': 0, 'N': 0} for nurse in nurses}
+    week_work = {}
+    if prior_week_work and date_range:
+        first_week = _week_start(date_range[0])
+        for nurse_id, count in prior_week_work.items():
+            week_work[(nurse_id, first_week)] = count
+    for (nurse_id, day), shift in final_schedule.items():
+        if shift in WORK_SHIFTS and nurse_id in shift_counts and day in in_range:
+            shift_counts[nurse_id][shift] += 1
+            key = (nurse_id, _week_start(day))
+            week_work[key] = week_work.get(key, 0) + 1
+
+    def place(nurse_id, day, shift):
+        previous = final_schedule.get((nurse_id, day))
+        final_schedule[(nurse_id, day)] = shift
+        if previous in WORK_SHIFTS:
+            shift_counts[nurse_id][previous] -= 1
+        else:
+            key = (nurse_id, _week_start(day))
+            week_work[key] = week_work.get(key, 0) + 1
+        shift_counts[nurse_id][shift] += 1
+
+    for day in date_range:
+        staffed = {shift: 0 for shift in WORK_SHIFTS}
+        for nurse in nurses:
+            shift = final_schedule.get((nurse.id, day))
+            if shift in WORK_SHIFTS:
+                staffed[shift] += 1
+
+        shortage = {shift: requirements[day][shift] - staffed[shift] for shift in WORK_SHIFTS}
+        if all(count <= 0 for count in shortage.values()):
+            continue
+        if budget is not None and budget.expired():
+            result['unfilled'].extend((day, shift, count) for shift, count in shortage.items() if count > 0)
+            continue
+        surplus = {shift: max(0, -count) for shift, count in shortage.items()}
+
+        # 노드 번호: source, sink, 부족 근무 3개, 초과 근무 3개, 간호사
+        source, sink = 0, 1
+        short_node = {shift: 2 + i for i, shift in enumerate(WORK_SHIFTS)}
+        surplus_node = {shift: 5 + i for i, shift in enumerate(WORK_SHIFTS)}
+        nurse_node = {nurse.id: 8 + i for i, nurse in enumerate(nurses)}
+        network = MinCostFlow(8 + len(nurses))
+
+        for shift in WORK_SHIFTS:
+            if shortage[shift] > 0:
+                network.add_edge(source, short_node[shift], shortage[shift], 0)
+            if surplus[shift] > 0:
+                network.add_edge(surplus_node[shift], sink, surplus[shift], 0)
+
+        next_day = day + timedelta(days=1)
+        day_after = day + timedelta(days=2)
+        options = {}  # (nurse_id, shift) -> (간선 핸들, NN 블록 여부)
+        for nurse in nurses:
+            current = final_schedule.get((nurse.id, day))
+            prev_state = final_schedule.state_before(nurse.id, day)
+            if current in WORK_SHIFTS:
+                if surplus[current] <= 0 or (nurse.id, day) in locked:
+                    continue
+                # N을 다른 근무로 옮기면 앞이나 뒤의 N이 단일 N으로 남는 경우 제외
+                if current == 'N' and (prev_state == AFTER_N1 or (
+                        final_schedule.get((nurse.id, next_day)) == 'N' and day_after in in_range
+                        and final_schedule.get((nurse.id, day_after)) != 'N')):
+                    continue
+                network.add_edge(nurse_node[nurse.id], surplus_node[current], 1, 0)
+            else:
+                if (nurse.id, day) in off_requests:
+                    continue
+                if week_work.get((nurse.id, _week_start(day)), 0) >= MAX_WORK_DAYS_PER_WEEK:
+                    continue
+                network.add_edge(nurse_node[nurse.id], sink, 1, 0)
+
+            for shift in WORK_SHIFTS:
+                if shortage[shift] <= 0 or shift == current:
+                    continue
+                night_block = False
+                if not final_schedule.allows(nurse.id, day, shift):
+                    # 나이트 킵 간호사는 다음 날도 N으로 묶어 NN 블록이 되면 배정 가능
+                    needs_block = shift == 'N' and nurse.is_night_keeper
+                    if not needs_block:
+                        continue
+                else:
+                    # 일반 간호사도 앞뒤에 N이 없는 단일 N은 만들지 않고 NN 블록으로만 배정
+                    # (기간 마지막 날은 다음 기간에서 이어질 수 있으므로 제외)
+                    needs_block = (shift == 'N' and prev_state not in NIGHT_STATES and next_day in in_range
+                                   and final_schedule.get((nurse.id, next_day)) != 'N')
+                if needs_block:
+                    if not (current not in WORK_SHIFTS
+                            and next_day in in_range
+                            and final_schedule.get((nurse.id, next_day)) == 'OFF'
+                            and (nurse.id, next_day) not in off_requests
+                            and final_schedule.allows_sequence(nurse.id, day, ('N', 'N'))):
+                        continue
+                    same_week = _week_start(next_day) == _week_start(day)
+                    week_limit = MAX_WORK_DAYS_PER_WEEK - (1 if same_week else 0)
+                    if week_work.get((nurse.id, _week_start(day)), 0) >= week_limit:
+                        continue
+                    if not same_week and week_work.get((nurse.id, _week_start(next_day)), 0) >= MAX_WORK_DAYS_PER_WEEK:
+                        continue
+                    night_block = True
+
+                cost = assignment_cost(shift, shift_counts[nurse.id], prev_state, nurse.is_night_keeper)
+                if current in WORK_SHIFTS:
+                    cost += MOVE_COST
+                if night_block:
+                    cost += NIGHT_BLOCK_COST
+                handle = network.add_edge(short_node[shift], nurse_node[nurse.id], 1, cost)
+                options[(nurse.id, shift)] = (handle, night_block)
+
+        network.flow(source, sink)
+
+        filled = {shift: 0 for shift in WORK_SHIFTS}
+        for (nurse_id, shift), (handle, night_block) in options.items():
+            if network.edge_flow(handle) <= 0:
+                continue
+            previous = final_schedule.get((nurse_id, day))
+            place(nurse_id, day, shift)
+            filled[shift] += 1
+            if previous in WORK_SHIFTS:
+                result['moved'].append((nurse_id, day, previous, shift))
+            else:
+                result['assigned'].append((nurse_id, day, shift))
+            if night_block:
+                place(nurse_id, next_day, 'N')
+                result['assigned'].append((nurse_id, next_day, 'N'))
+
+        for shift in WORK_SHIFTS:
+            remaining = shortage[shift] - filled[shift]
+            if remaining > 0:
+                result['unfilled'].append((day, shift, remaining))
+
+    return result
@@ -0,0 +1,70 @@
+"""
+근무표 생성 보고서 모듈
+
+생성 중 나오는 부족 인원, 보완, 규칙 위반 수정 내역을 메모리에 모았다가
+생성이 끝나면 GenerationReport/GenerationReportEntry로 한 번에 저장한다.
+화면 메시지(messages)에는 한 줄 요약만 남기고, 상세 내역은 보고서 화면에서 페이지로 나눠 본다.
+"""
+from collections import Counter
+
+from django.db import transaction
+
+from .models import GenerationReport, GenerationReportEntry
+
+ENTRY_BATCH_SIZE = 1000
+
+
+class GenerationLog:
+    """생성 보고서 항목을 모으는 클래스"""
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, kind, message, date=None, shift=''):
+        """항목 하나를 추가 (kind: GenerationReportEntry.KIND_CHOICES 중 하나)"""
+        self.entries.append((kind, date, shift, message))
+
+    def counts(self):
+        """종류별 항목 수"""
+        return Counter(kind for kind, _, _, _ in self.entries)
+
+    def summary(self, saved_count, elapsed):
+        """messages로 보낼 한 줄 요약"""
+        counts = self.counts()
+        return (
+            f'근무표 생성 완료: {saved_count}칸 저장, 부족 {counts["shortage"]}건, '
+            f'보완 {counts["repair"]}건, 규칙 위반 수정 {counts["violation"]}건 ({elapsed:.1f}초)'
+        )
+
+    def save(self, start_date, end_date, engine, budget_report, saved_count=0, ward_id=None):
+        """
+        보고서와 모은 항목을 저장하는 함수
+
+        Args:
+            start_date: 시작 날짜
+            end_date: 종료 날짜
+            engine: 생성 방식
+            budget_report: TimeBudget.report() 결과
+            saved_count: 저장한 근무 칸 수
+            ward_id: 병동 id (없으면 병동 구분 없음)
+
+        Returns:
+            저장한 GenerationReport
+        """
+        with transaction.atomic():
+            report = GenerationReport.objects.create(
+                start_date=start_date,
+                end_date=end_date,
+                ward_id=ward_id,
+                engine=engine,
+                saved_count=saved_count,
+                elapsed=budget_report['elapsed'],
+                timed_out=budget_report['timed_out'],
+                phases=budget_report['phases'],
+            )
+            GenerationReportEntry.objects.bulk_create(
+                [GenerationReportEntry(report=report, kind=kind, date=date, shift=shift, message=message)
+                 for kind, date, shift, message in self.entries],
+                batch_size=ENTRY_BATCH_SIZE,
+            )
+        return report
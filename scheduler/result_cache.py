@@ -0,0 +1,110 @@
+"""
+근무표 생성 결과 캐시 모듈
+
+같은 입력(간호사와 속성, 목표 근무 수, 필요 인원, 기간, 원티드 OFF, 직전 근무 상태,
+누적 근무 통계, 시드, 생성 방식)으로 다시 생성하면 계산을 반복하지 않고 저장해 둔 근무표를 쓴다.
+입력을 정렬한 뒤 해시한 지문(fingerprint)을 키로 쓰므로 입력이 하나라도 바뀌면 새로 계산한다.
+
+시드가 없는 생성은 매번 다른 근무표를 만드는 것이 목적(재생성)이므로 캐시하지 않는다.
+캐시는 프로세스 메모리에 있으며, 항목 수와 전체 근무 칸 수 상한을 넘으면 가장 오래 쓰지 않은 것부터 버린다.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from threading import Lock
+
+RESULT_CACHE_MAX_ENTRIES = 32        # 최대 보관 결과 수
+RESULT_CACHE_MAX_CELLS = 200_000     # 보관 결과 전체의 근무 칸 + 보고서 항목 수 상한
+
+
+def generation_fingerprint(nurse_list, nurse_shifts, shift_requirements, start_date, end_date,
+                           off_requests, carry_over, ledger, seed, engine, ward_id=None):
+    """
+    근무표 생성 입력의 지문을 만드는 함수
+
+    순서에 관계없이 같은 입력이면 같은 값이 되도록 모든 모음을 정렬한 뒤 SHA-256으로 해시한다.
+
+    Returns:
+        16진수 문자열
+    """
+    nurses = sorted((nurse.id, nurse.name, nurse.is_night_keeper, nurse.skill_level) for nurse in nurse_list)
+    nurse_ids = [nurse[0] for nurse in nurses]
+    payload = {
+        'nurses': nurses,
+        'nurse_shifts': sorted(nurse_shifts.items()),
+        'requirements': sorted(shift_requirements.items()),
+        'range': [start_date.isoformat(), end_date.isoformat()],
+        'off_requests': sorted((nurse_id, day.isoformat()) for nurse_id, day in off_requests),
+        'carry': [(nurse_id, carry_over['last_shifts'][nurse_id], carry_over['prior_week_work'][nurse_id])
+                  for nurse_id in nurse_ids],
+        'ledger': [(nurse_id, sorted(ledger.get(nurse_id, {}).items())) for nurse_id in nurse_ids],
+        'seed': seed,
+        'engine': engine,
+        'ward_id': ward_id,
+    }
+    encoded = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    """
+    근무표 생성 결과를 보관하는 LRU 캐시
+
+    값은 (근무 칸 [(nurse_id, date, shift), ...], 보고서 항목 [(kind, date, shift, message), ...]) 튜플이다.
+
+    Args:
+        max_entries: 최대 보관 결과 수
+        max_cells: 보관 결과 전체의 근무 칸 + 보고서 항목 수 상한
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_MAX_ENTRIES, max_cells=RESULT_CACHE_MAX_CELLS):
+        self.max_entries = max_entries
+        self.max_cells = max_cells
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._cells = 0
+        self._lock = Lock()
+
+    def get(self, key):
+        """저장된 결과 (없으면 None) - 찾은 항목은 가장 최근 사용으로 옮김"""
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, rows, entries):
+        """결과를 저장하고 상한을 넘으면 오래 쓰지 않은 결과부터 버림 (상한보다 큰 결과는 저장하지 않음)"""
+        value = (tuple(rows), tuple(entries))
+        size = len(value[0]) + len(value[1])
+        if size > self.max_cells:
+            return
+        with self._lock:
+            if key in self._items:
+                self._cells -= self._size(self._items.pop(key))
+            self._items[key] = value
+            self._cells += size
+            while len(self._items) > self.max_entries or self._cells > self.max_cells:
+                _, evicted = self._items.popitem(last=False)
+                self._cells -= self._size(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._cells = 0
+
+    def stats(self):
+        """보관 결과 수, 근무 칸 수, 적중/실패 횟수"""
+        return {'entries': len(self._items), 'cells': self._cells, 'hits': self.hits, 'misses': self.misses}
+
+    @staticmethod
+    def _size(value):
+        return len(value[0]) + len(value[1])
+
+
+# 프로세스 전체에서 함께 쓰는 캐시
+result_cache = ResultCache()
@@ -0,0 +1,218 @@
+"""
+기간별 근무표 후보 풀 모듈
+
+생성할 때마다 이전 근무표를 버리지 않고, 기간(시작일, 종료일, 병동)별로 점수가 좋은
+상위 SOLUTION_POOL_SIZE개 근무표를 RosterCandidate로 보관한다.
+근무표는 간호사별로 하루 한 글자(D/E/N, OFF는 O)인 문자열로 압축해 저장하므로
+다시 계산하지 않고 바로 미리 보기, 비교, 적용할 수 있다.
+
+점수는 낮을수록 좋다.
+    부족 인원 1명당 SHORTAGE_PENALTY + 순서 규칙 위반 1건당 VIOLATION_PENALTY
+    + 지켜지지 않은 원티드 OFF 1건당 WANTED_OFF_PENALTY
+    + 일반 간호사 근무일 수의 최대-최소 차이 x SPREAD_PENALTY
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db import transaction
+
+from .archive import CODE_SHIFTS, SHIFT_CODES
+from .automaton import FREE, violation_positions
+from .models import Nurse, RosterCandidate
+from .persistence import ScheduleWriter
+from .purge import delete_schedules
+
+SOLUTION_POOL_SIZE = 5  # 기간별로 보관하는 후보 수
+
+SHORTAGE_PENALTY = 100
+VIOLATION_PENALTY = 1000
+WANTED_OFF_PENALTY = 20
+SPREAD_PENALTY = 1
+
+WORK_SHIFTS = ('D', 'E', 'N')
+
+
+def pack_rows(rows, nurse_ids, start_date, days):
+    """
+    근무 칸을 간호사별 근무 문자열로 압축하는 함수
+
+    Args:
+        rows: [(nurse_id, date, shift), ...]
+        nurse_ids: 간호사 id 목록 (근무가 없는 날은 OFF)
+        start_date: 시작 날짜
+        days: 기간 일수
+
+    Returns:
+        {str(nurse_id): 'DDEON...'} (JSON 키로 쓰이므로 문자열 id)
+    """
+    codes = {nurse_id: ['O'] * days for nurse_id in nurse_ids}
+    for nurse_id, day, shift in rows:
+        offset = (day - start_date).days
+        if nurse_id in codes and 0 <= offset < days:
+            codes[nurse_id][offset] = SHIFT_CODES[shift]
+    return {str(nurse_id): ''.join(chars) for nurse_id, chars in codes.items()}
+
+
+def unpack_rows(candidate):
+    """후보의 근무 문자열을 (nurse_id, date, shift) 근무 칸으로 펼치는 함수"""
+    for nurse_id, codes in candidate.packed.items():
+        for offset, code in enumerate(codes):
+            yield int(nurse_id), candidate.start_date + timedelta(days=offset), CODE_SHIFTS[code]
+
+
+def packed_digest(packed):
+    """근무 문자열의 지문 - 같은 근무표를 두 번 보관하지 않기 위해 사용"""
+    encoded = json.dumps(sorted(packed.items()), separators=(',', ':')).encode('ascii')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def score_packed(packed, nurse_list, start_date, shift_requirements, off_requests=(), initial_states=None):
+    """
+    압축한 근무표의 점수와 점수 항목을 계산하는 함수 (낮을수록 좋음)
+
+    Args:
+        packed: pack_rows() 결과
+        nurse_list: 간호사 목록 (is_night_keeper 속성 사용)
+        start_date: 시작 날짜
+        shift_requirements: 각 근무별 필요 인원 수 {'D': int, 'E': int, 'N': int}
+        off_requests: (nurse_id, date) 형태의 원티드 OFF
+        initial_states: {nurse_id: 시작일 직전 오토마톤 상태}
+
+    Returns:
+        (점수, {'shortage', 'violations', 'wanted_off', 'spread'})
+    """
+    initial_states = initial_states or {}
+    nurses = {str(nurse.id): nurse for nurse in nurse_list}
+    days = len(next(iter(packed.values()), ''))
+
+    staffed = [dict.fromkeys('DEN', 0) for _ in range(days)]
+    violations = 0
+    regular_work = []
+    for nurse_id, codes in packed.items():
+        nurse = nurses.get(nurse_id)
+        if nurse is None:
+            continue
+        shifts = [CODE_SHIFTS[code] for code in codes]
+        for offset, code in enumerate(codes):
+            if code != 'O':
+                staffed[offset][code] += 1
+        violations += len(violation_positions(shifts, nurse.is_night_keeper, initial_states.get(nurse.id, FREE)))
+        if not nurse.is_night_keeper:
+            regular_work.append(sum(1 for code in codes if code != 'O'))
+
+    shortage = sum(
+        max(0, shift_requirements.get(shift, 0) - counts[shift])
+        for counts in staffed for shift in WORK_SHIFTS
+    )
+    wanted_off = 0
+    for nurse_id, day in off_requests:
+        codes = packed.get(str(nurse_id))
+        offset = (day - start_date).days
+        if codes and 0 <= offset < len(codes) and codes[offset] != 'O':
+            wanted_off += 1
+    spread = max(regular_work) - min(regular_work) if regular_work else 0
+
+    metrics = {'shortage': shortage, 'violations': violations, 'wanted_off': wanted_off, 'spread': spread}
+    score = (SHORTAGE_PENALTY * shortage + VIOLATION_PENALTY * violations
+             + WANTED_OFF_PENALTY * wanted_off + SPREAD_PENALTY * spread)
+    return float(score), metrics
+
+
+def period_candidates(start_date, end_date, ward_id=None):
+    """기간(과 병동)의 후보 목록 - 점수 순"""
+    return RosterCandidate.objects.filter(start_date=start_date, end_date=end_date, ward_id=ward_id)
+
+
+def add_candidate(start_date, end_date, packed, score, metrics, ward_id=None, engine='', seed=None,
+                  active=False, pool_size=SOLUTION_POOL_SIZE):
+    """
+    후보를 풀에 추가하고 기간의 후보를 상위 pool_size개(적용 중인 후보는 항상 유지)로 줄이는 함수
+
+    같은 근무표가 이미 있으면 새로 만들지 않고 기존 후보를 돌려준다.
+
+    Returns:
+        보관한 RosterCandidate (풀에 들지 못해 바로 버려졌으면 None)
+    """
+    digest = packed_digest(packed)
+    candidates = period_candidates(start_date, end_date, ward_id)
+    with transaction.atomic():
+        candidate = candidates.filter(digest=digest).first()
+        if candidate is None:
+            candidate = RosterCandidate.objects.create(
+                start_date=start_date, end_date=end_date, ward_id=ward_id, engine=engine, seed=seed,
+                packed=packed, digest=digest, score=score, metrics=metrics,
+            )
+        if active:
+            candidates.exclude(pk=candidate.pk).filter(is_active=True).update(is_active=False)
+            if not candidate.is_active:
+                candidate.is_active = True
+                candidate.save(update_fields=['is_active'])
+
+        keep = list(candidates.filter(is_active=False).values_list('pk', flat=True)[:pool_size])
+        candidates.filter(is_active=False).exclude(pk__in=keep).delete()
+    if not candidate.is_active and candidate.pk not in keep:
+        return None
+    return candidate
+
+
+def keep_generated(rows, nurse_list, start_date, end_date, shift_requirements, off_requests, initial_states,
+                   ward_id=None, engine='', seed=None):
+    """방금 생성해 저장한 근무표를 점수와 함께 적용 중인 후보로 보관하는 함수"""
+    packed = pack_rows(rows, [nurse.id for nurse in nurse_list], start_date, (end_date - start_date).days + 1)
+    score, metrics = score_packed(packed, nurse_list, start_date, shift_requirements, off_requests, initial_states)
+    return add_candidate(start_date, end_date, packed, score, metrics, ward_id, engine, seed, active=True)
+
+
+def activate_candidate(candidate):
+    """
+    후보를 근무표(Schedule)로 적용하는 함수 - 후보 간호사의 기간 근무를 한 번에 바꿔 저장
+
+    Returns:
+        저장한 근무 칸 수
+    """
+    nurse_ids = list(Nurse.objects.filter(id__in=[int(nurse_id) for nurse_id in candidate.packed]).values_list('id', flat=True))
+    valid = set(nurse_ids)
+    with transaction.atomic():
+        delete_schedules(candidate.start_date, candidate.end_date, nurse_ids=nurse_ids)
+
+        writer = ScheduleWriter(ward_id=candidate.ward_id)
+        for nurse_id, day, shift in unpack_rows(candidate):
+            if nurse_id in valid:
+                writer.add(nurse_id, day, shift)
+        writer.flush()
+
+        period_candidates(candidate.start_date, candidate.end_date, candidate.ward_id).filter(
+            is_active=True).exclude(pk=candidate.pk).update(is_active=False)
+        candidate.is_active = True
+        candidate.save(update_fields=['is_active'])
+    return writer.written
+
+
+def compare_candidates(first, second):
+    """
+    두 후보의 점수 항목과 서로 다른 근무 칸을 비교하는 함수
+
+    Returns:
+        {'score': (첫 후보 점수, 둘째 후보 점수), 'metrics': (..., ...),
+         'differences': [{'nurse_id', 'date', 'first', 'second'}, ...]}
+    """
+    differences = []
+    for nurse_id in sorted(set(first.packed) | set(second.packed), key=int):
+        first_codes = first.packed.get(nurse_id, '')
+        second_codes = second.packed.get(nurse_id, '')
+        for offset in range(max(len(first_codes), len(second_codes))):
+            first_code = first_codes[offset] if offset < len(first_codes) else None
+            second_code = second_codes[offset] if offset < len(second_codes) else None
+            if first_code != second_code:
+                differences.append({
+                    'nurse_id': int(nurse_id),
+                    'date': first.start_date + timedelta(days=offset),
+                    'first': CODE_SHIFTS.get(first_code),
+                    'second': CODE_SHIFTS.get(second_code),
+                })
+    return {
+        'score': (first.score, second.score),
+        'metrics': (first.metrics, second.metrics),
+        'differences': differences,
+    }
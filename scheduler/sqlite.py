@@ -0,0 +1,57 @@
+"""
+SQLite 연결 설정 모듈
+
+새 DB 연결이 만들어질 때(connection_created 신호) SQLite PRAGMA를 설정한다.
+
+    busy_timeout          - 다른 연결이 쓰는 중이면 바로 "database is locked"를 내지 않고 이 시간(ms)까지 기다림
+    mmap_size             - DB 파일을 메모리 매핑해 읽기 시 복사를 줄임
+
+위 두 값은 연결마다 적용되고 DB 파일에는 남지 않으므로 기본으로 켠다.
+WAL(WAL_PRAGMAS)은 DB 파일 헤더에 기록되므로 기본으로 켜지 않는다. 운영 DB에서는 settings에서 켠다.
+
+    journal_mode=WAL      - 쓰는 동안에도 읽기가 막히지 않음 (근무표 생성 중 병동 단말 조회)
+    synchronous=NORMAL    - WAL에서는 커밋마다 fsync하지 않아도 DB가 깨지지 않음 (전원 차단 시 마지막 커밋만 잃을 수 있음)
+
+    # settings.py
+    SQLITE_PRAGMAS = {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 20000, 'mmap_size': 268435456}
+"""
+from django.conf import settings
+
+# 기본 설정 - 연결 단위 PRAGMA만 (DB 파일을 바꾸지 않음)
+SQLITE_PRAGMAS = {
+    'busy_timeout': 20000,
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# 동시 읽기/쓰기가 많은 운영 DB용 설정 (settings.SQLITE_PRAGMAS로 켬)
+WAL_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    **SQLITE_PRAGMAS,
+}
+
+# 설정하지 않았을 때의 SQLite/Django 기본값 (성능 비교 기준)
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'busy_timeout': 5000,
+    'mmap_size': 0,
+}
+
+
+def apply_pragmas(cursor, pragmas):
+    """PRAGMA를 차례로 설정하는 함수 (DB-API 커서면 Django/sqlite3 모두 사용 가능)"""
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created 신호 처리 함수 - SQLite 연결에만 PRAGMA 설정"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', SQLITE_PRAGMAS)
+    if connection.is_in_memory_db():
+        # 메모리 DB(테스트)는 WAL을 쓸 수 없고 파일 매핑도 의미 없음
+        pragmas = {name: value for name, value in pragmas.items() if name not in ('journal_mode', 'mmap_size')}
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas)
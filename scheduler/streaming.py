@@ -0,0 +1,158 @@
+"""
+장기(연 단위) 근무표 스트리밍 생성 모듈
+
+기간을 짧은 구간(기본 4주)으로 나눠 패턴 DP로 생성하고, 구간이 끝나면 그 날짜들을 확정해
+배치 단위로 저장한 뒤 메모리에서 버린다. 다음 구간은 메모리에 남겨 둔 직전 7일의 근무로
+이어서 생성하므로 DB를 다시 읽지 않는다.
+
+메모리에 남는 것은 한 구간의 근무표와 간호사 수에 비례하는 상태뿐이므로,
+최대 메모리 사용량은 전체 기간 길이와 관계없이 일정하다.
+"""
+import random
+import time
+from datetime import timedelta
+
+from .arbitration import arbitrate_wanted_offs
+from .automaton import RosterSchedule
+from .horizon import TAIL_DAYS, carry_from_shifts, fixed_windows, load_carry_over, split_targets
+from .ledger import balance_offsets, load_ledger
+from .models import WantedOff
+from .patterns import build_roster, shift_prices, skill_category
+from .persistence import FLUSH_BATCH_SIZE, ScheduleWriter
+from .purge import delete_schedules
+from .repair import repair_coverage
+
+STREAM_WINDOW_DAYS = 28
+WORK_SHIFTS = ('D', 'E', 'N')
+
+
+def window_skill_needs(window_days, shift_requirements):
+    """구간의 날짜별/근무별 숙련도 범주 필요 인원 (필요 인원 3명 이상이면 범주별 1명)"""
+    needs = {}
+    for day in window_days:
+        needs[day] = {}
+        for shift in WORK_SHIFTS:
+            each = 1 if shift_requirements.get(shift, 0) >= 3 else 0
+            needs[day][shift] = {'high': each, 'mid': each, 'low': each}
+    return needs
+
+
+def solve_window(nurse_list, window_range, shift_requirements, carry, off_requests, ledger,
+                 targets=None, rng=None):
+    """
+    한 구간의 근무표를 패턴 DP와 부족 인원 보충으로 만드는 함수 (DB를 사용하지 않음)
+
+    Args:
+        nurse_list: 간호사 목록 (id, is_night_keeper, skill_level 속성)
+        window_range: 구간의 날짜 목록
+        shift_requirements: 각 근무별 필요 인원 수 {'D': int, 'E': int, 'N': int}
+        carry: horizon.load_carry_over() 형식의 직전 상태
+        off_requests: (nurse_id, date) 형태의 원티드 OFF
+        ledger: ledger.load_ledger() 형식의 누적 근무 통계
+        targets: 구간의 간호사별 목표 근무 수 {nurse_id: int} (없으면 가격만으로 결정)
+        rng: 간호사 처리 순서를 정하는 random.Random
+
+    Returns:
+        (automaton.RosterSchedule 근무표, [(date, shift, 부족 인원), ...] 채우지 못한 인원)
+    """
+    rng = rng or random.Random()
+    night_keepers = [nurse for nurse in nurse_list if nurse.is_night_keeper]
+    regular_nurses = [nurse for nurse in nurse_list if not nurse.is_night_keeper]
+    wanted_by_nurse = {}
+    for nurse_id, day in off_requests:
+        wanted_by_nurse.setdefault(nurse_id, set()).add(day)
+
+    requirements = {day: {shift: shift_requirements.get(shift, 0) for shift in WORK_SHIFTS} for day in window_range}
+    remaining = {day: dict(requirements[day]) for day in window_range}
+    skill_needs = window_skill_needs(window_range, shift_requirements)
+    offsets = balance_offsets(nurse_list, window_range, ledger)
+
+    roster = RosterSchedule(nurse_list, window_range[0], window_range[-1], initial_states=carry['states'])
+    for nurse in night_keepers + rng.sample(regular_nurses, len(regular_nurses)):
+        prices = shift_prices(window_range, remaining, skill_needs, nurse.skill_level) + offsets[nurse.id]
+        shifts = build_roster(
+            nurse.is_night_keeper,
+            window_range,
+            prices,
+            wanted_off_days=wanted_by_nurse.get(nurse.id, set()),
+            work_target=targets.get(nurse.id) if targets else None,
+            initial_state=carry['states'][nurse.id],
+            prior_week_work=carry['prior_week_work'][nurse.id],
+        )
+        category = skill_category(nurse.skill_level)
+        for day, shift in zip(window_range, shifts):
+            roster[(nurse.id, day)] = shift
+            if shift != 'OFF':
+                remaining[day][shift] -= 1
+                if skill_needs[day][shift][category] > 0:
+                    skill_needs[day][shift][category] -= 1
+
+    repair = repair_coverage(roster, nurse_list, window_range, requirements, off_requests,
+                             prior_week_work=carry['prior_week_work'])
+    return roster, repair['unfilled']
+
+
+def generate_streaming(start_date, end_date, nurse_list, shift_requirements, nurse_shifts=None,
+                       window_days=STREAM_WINDOW_DAYS, batch_size=FLUSH_BATCH_SIZE, seed=None, ward_id=None):
+    """
+    긴 기간의 근무표를 구간별로 생성하며 확정된 날짜를 바로 저장하는 함수
+
+    Args:
+        start_date: 시작 날짜
+        end_date: 종료 날짜
+        nurse_list: 간호사 목록
+        shift_requirements: 각 근무별 필요 인원 수 {'D': int, 'E': int, 'N': int}
+        nurse_shifts: 전체 기간의 간호사별 목표 근무 수 {nurse_id: int} (없으면 가격만으로 결정)
+        window_days: 한 번에 생성하는 구간 길이(일)
+        batch_size: 한 번에 저장하는 근무 칸 수
+        seed: 간호사 처리 순서를 정하는 난수 시드
+        ward_id: 저장하는 근무의 근무 병동 (없으면 병동 구분 없음)
+
+    Returns:
+        {'windows': 구간 수, 'saved': 저장한 칸 수, 'unfilled': 채우지 못한 인원 수,
+         'wanted_off_denied': 반려된 원티드 OFF 수, 'elapsed': 소요 시간(초)}
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    nurse_list = list(nurse_list)
+    nurse_ids = [nurse.id for nurse in nurse_list]
+
+    windows = fixed_windows(start_date, end_date, window_days)
+    targets = split_targets(nurse_shifts, windows) if nurse_shifts else [None] * len(windows)
+    writer = ScheduleWriter(batch_size, ward_id=ward_id)
+    carry = load_carry_over(nurse_list, start_date)
+    report = {'windows': len(windows), 'saved': 0, 'unfilled': 0, 'wanted_off_denied': 0}
+
+    for (window_start, window_end), window_targets in zip(windows, targets):
+        window_range = [window_start + timedelta(days=offset) for offset in range((window_end - window_start).days + 1)]
+
+        # 구간의 기존 근무표 삭제
+        delete_schedules(window_start, window_end, nurse_ids=nurse_ids)
+
+        # 원티드 OFF 조정 후 구간의 요청만 불러옴
+        arbitration = arbitrate_wanted_offs(nurse_list, window_start, window_end, shift_requirements)
+        report['wanted_off_denied'] += len(arbitration['denied'])
+        off_requests = set(WantedOff.objects.filter(
+            date__range=[window_start, window_end], nurse_id__in=nurse_ids
+        ).exclude(status='denied').values_list('nurse_id', 'date'))
+
+        roster, unfilled = solve_window(
+            nurse_list, window_range, shift_requirements, carry, off_requests,
+            load_ledger(nurse_ids), window_targets, rng,
+        )
+        report['unfilled'] += sum(count for _, _, count in unfilled)
+
+        # 구간 확정 - 저장 후 다음 구간에 필요한 직전 7일만 남기고 버림
+        for (nurse_id, day), shift in roster.items():
+            writer.add(nurse_id, day, shift)
+        writer.flush()
+
+        next_start = window_end + timedelta(days=1)
+        tail_start = next_start - timedelta(days=TAIL_DAYS)
+        tail = {key: shift for key, shift in roster.items() if key[1] >= tail_start}
+        carry = carry_from_shifts(nurse_list, next_start, {**carry['shifts'], **tail})
+        del roster, tail, off_requests
+
+    report['saved'] = writer.written
+    report['elapsed'] = round(time.perf_counter() - started, 3)
+    return report
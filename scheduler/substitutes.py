@@ -0,0 +1,86 @@
+"""
+병가 등으로 빠진 근무를 대신할 간호사를 찾는 모듈
+
+해당 날짜에 근무가 없는 간호사 중 규칙을 지키며 근무를 맡을 수 있는 간호사를
+규칙 여유, 숙련도 적합성, 근무량 순으로 정렬해 돌려준다.
+"""
+from .automaton import AFTER_D, AFTER_E
+from .availability import AvailabilityIndex, ward_nurses
+from .patterns import skill_category
+
+LONG_STREAK_DAYS = 4  # 이보다 길게 연속 근무하게 되면 순위를 낮춤
+
+
+def rank_substitutes(index, day, shift, absent_nurse_id=None, limit=10):
+    """
+    인덱스로 대체 근무자 후보를 찾아 순위대로 정렬하는 함수
+
+    Args:
+        index: availability.AvailabilityIndex (day를 포함해야 함)
+        day: 근무 날짜
+        shift: 대신할 근무 ('D', 'E', 'N')
+        absent_nurse_id: 빠지는 간호사 id (숙련도 비교 기준, 후보에서 제외)
+        limit: 돌려줄 최대 후보 수 (None이면 전체)
+
+    Returns:
+        [{'nurse_id', 'name', 'skill_level', 'is_night_keeper', 'current_shift',
+          'work_streak', 'week_work', 'period_work', 'skill_gap'}, ...]
+    """
+    absent = index.nurses.get(absent_nurse_id)
+    candidates = []
+
+    for nurse_id in index.off_nurses(day):
+        if nurse_id == absent_nurse_id or not index.allows(nurse_id, day, shift):
+            continue
+        nurse = index.nurses[nurse_id]
+
+        streak = index.work_streak(nurse_id, day)
+        prev_state = index.roster.state_before(nurse_id, day)
+        forward_rotation = (prev_state == AFTER_D and shift == 'E') or (prev_state == AFTER_E and shift == 'N')
+        if absent is None:
+            skill_gap = 0
+        elif skill_category(nurse.skill_level) == skill_category(absent.skill_level):
+            skill_gap = abs(nurse.skill_level - absent.skill_level) / 10
+        else:
+            skill_gap = abs(nurse.skill_level - absent.skill_level)
+
+        candidates.append(((
+            max(0, streak - LONG_STREAK_DAYS),  # 규칙 여유 - 긴 연속 근무는 뒤로
+            not forward_rotation,               # D→E, E→N 순환 패턴 우선
+            skill_gap,                          # 숙련도 적합성
+            index.week_work_of(nurse_id, day),  # 근무량 균형
+            index.period_work[nurse_id],
+            nurse_id,
+        ), {
+            'nurse_id': nurse_id,
+            'name': nurse.name,
+            'skill_level': nurse.skill_level,
+            'is_night_keeper': nurse.is_night_keeper,
+            'current_shift': index.shift_on(nurse_id, day),
+            'work_streak': streak,
+            'week_work': index.week_work_of(nurse_id, day),
+            'period_work': index.period_work[nurse_id],
+            'skill_gap': skill_gap,
+        }))
+
+    candidates.sort(key=lambda item: item[0])
+    ranked = [info for _, info in candidates]
+    return ranked if limit is None else ranked[:limit]
+
+
+def find_substitutes(day, shift, absent_nurse_id=None, limit=10, ward_id=None):
+    """
+    해당 날짜/근무의 대체 근무자 후보를 찾는 함수 (빠지는 간호사와 같은 병동 간호사 중에서)
+
+    Args:
+        day: 근무 날짜
+        shift: 대신할 근무 ('D', 'E', 'N')
+        absent_nurse_id: 빠지는 간호사 id
+        limit: 돌려줄 최대 후보 수
+        ward_id: 빠지는 간호사가 없을 때 후보를 찾을 병동 id (둘 다 없으면 전체 간호사)
+
+    Returns:
+        rank_substitutes()와 같은 후보 목록
+    """
+    index = AvailabilityIndex(day, nurse_list=ward_nurses(absent_nurse_id, ward_id))
+    return rank_substitutes(index, day, shift, absent_nurse_id, limit)
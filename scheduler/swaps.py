@@ -0,0 +1,88 @@
+"""
+간호사 간 근무 교환 상대를 찾는 모듈
+
+같은 날짜의 근무를 맞바꾸면 근무별 인원은 그대로이므로, 날짜/근무별 간호사 인덱스와
+숙련도 범주 인덱스의 교집합에서만 후보를 고르고 두 사람의 근무표가 규칙을 지키는지 확인한다.
+모든 간호사 쌍을 시도하지 않는다.
+"""
+from .availability import AvailabilityIndex, ward_nurses
+from .patterns import skill_category
+
+SWAP_SHIFTS = ('D', 'E', 'N', 'OFF')
+
+
+def rank_swap_partners(index, nurse_id, day, same_skill_category=True, limit=10):
+    """
+    인덱스로 근무 교환 상대를 찾아 정렬하는 함수
+
+    Args:
+        index: availability.AvailabilityIndex (day를 포함해야 함)
+        nurse_id: 교환을 요청한 간호사 id
+        day: 교환할 날짜
+        same_skill_category: True이면 같은 숙련도 범주끼리만 교환 (근무별 숙련도 구성 유지)
+        limit: 돌려줄 최대 후보 수 (None이면 전체)
+
+    Returns:
+        [{'nurse_id', 'name', 'skill_level', 'is_night_keeper', 'gives', 'receives',
+          'week_work', 'period_work'}, ...]
+        gives는 요청한 간호사가 넘겨주는 근무, receives는 받는 근무
+    """
+    nurse = index.nurses.get(nurse_id)
+    my_shift = index.shift_on(nurse_id, day)
+    if nurse is None or my_shift is None:
+        return []
+
+    # 숙련도 범주 인덱스 - 교환해도 근무별 숙련도 구성이 유지되는 간호사
+    if same_skill_category:
+        category = skill_category(nurse.skill_level)
+        pool = {other_id for other_id, other in index.nurses.items()
+                if skill_category(other.skill_level) == category}
+    else:
+        pool = set(index.nurses)
+    pool.discard(nurse_id)
+
+    partners = []
+    for their_shift in SWAP_SHIFTS:
+        if their_shift == my_shift:
+            continue
+        # 요청한 간호사가 상대 근무를 받을 수 없으면 해당 근무 전체를 건너뜀
+        if not index.allows(nurse_id, day, their_shift):
+            continue
+        if their_shift == 'OFF':
+            holders = index.off_nurses(day)
+        else:
+            holders = index.nurses_on(day, their_shift)
+
+        for other_id in holders & pool:
+            if not index.allows(other_id, day, my_shift):
+                continue
+            other = index.nurses[other_id]
+            partners.append(((
+                their_shift == 'OFF',  # 근무끼리의 교환 우선 (근무량 변화 없음)
+                abs(index.period_work[other_id] - index.period_work[nurse_id]),
+                other_id,
+            ), {
+                'nurse_id': other_id,
+                'name': other.name,
+                'skill_level': other.skill_level,
+                'is_night_keeper': other.is_night_keeper,
+                'gives': my_shift,
+                'receives': their_shift,
+                'week_work': index.week_work_of(other_id, day),
+                'period_work': index.period_work[other_id],
+            }))
+
+    partners.sort(key=lambda item: item[0])
+    ranked = [info for _, info in partners]
+    return ranked if limit is None else ranked[:limit]
+
+
+def find_swap_partners(nurse_id, day, same_skill_category=True, limit=10):
+    """
+    해당 간호사/날짜의 근무 교환 상대를 찾는 함수 (같은 병동 간호사 중에서)
+
+    Returns:
+        rank_swap_partners()와 같은 후보 목록
+    """
+    index = AvailabilityIndex(day, nurse_list=ward_nurses(nurse_id))
+    return rank_swap_partners(index, nurse_id, day, same_skill_category, limit)
@@ -1,3 +1,593 @@
-from django.test import TestCase
+import json
+from collections import Counter, namedtuple
+from datetime import date, timedelta
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib import messages
+from django.db import connection
+from django.db.models import Count, Max
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from .archive import restore_months, schedule_rows
+from .automaton import (
+    ACCEPTING, AFTER_D, AFTER_E, AFTER_N1, AFTER_N2, AFTER_N3, AFTER_N_OFF, DEAD, FREE,
+    RosterSchedule, ShiftStateTrack, is_legal, next_state, run, violation_positions,
+)
+from .feasibility import analyze_capacity
+from .management.commands.generate_schedule import headless_request
+from .ledger import LEDGER_FIELDS, cell_counts
+from .local_repair import repair_locally, save_changes
+from .models import (
+    ArchivedSchedule, FairnessLedger, Nurse, Schedule, ShiftChangeHistory, StaffingRequirement, Ward,
+)
+from .persistence import ScheduleWriter
+from .purge import delete_schedules
+from .repair import MinCostFlow, repair_coverage
+from .views import create_schedule_with_pattern
+
+
+class TransitionTableTests(SimpleTestCase):
+    """근무 순서 규칙 전이표"""
+
+    def test_regular_transitions(self):
+        self.assertEqual(next_state(FREE, 'D'), AFTER_D)
+        self.assertEqual(next_state(AFTER_D, 'E'), AFTER_E)
+        self.assertEqual(next_state(AFTER_E, 'D'), DEAD)  # E 다음 D 금지
+        self.assertEqual(next_state(AFTER_E, 'N'), AFTER_N1)
+        self.assertEqual(next_state(AFTER_N1, 'N'), AFTER_N2)
+        self.assertEqual(next_state(AFTER_N2, 'N'), AFTER_N3)
+        self.assertEqual(next_state(AFTER_N3, 'N'), AFTER_N3)
+        self.assertEqual(next_state(FREE, None), FREE)
+
+    def test_night_block_needs_two_offs(self):
+        for shift in ('D', 'E'):
+            self.assertFalse(is_legal(AFTER_N1, shift))
+            self.assertFalse(is_legal(AFTER_N_OFF, shift))
+        self.assertEqual(next_state(AFTER_N1, 'OFF'), AFTER_N_OFF)
+        self.assertFalse(is_legal(AFTER_N_OFF, 'N'))
+        self.assertEqual(run(['N', 'N', 'OFF', 'OFF', 'D']), AFTER_D)
+        self.assertEqual(run(['N', 'OFF', 'D']), DEAD)
+
+    def test_night_keeper_transitions(self):
+        for state in (FREE, AFTER_N1, AFTER_N2):
+            self.assertFalse(is_legal(state, 'D', True))
+            self.assertFalse(is_legal(state, 'E', True))
+        self.assertFalse(is_legal(AFTER_N1, 'OFF', True))  # 단일 N 금지
+        self.assertFalse(is_legal(AFTER_N3, 'N', True))    # NNNN 금지
+        self.assertEqual(run(['N', 'N', 'N', 'OFF', 'OFF', 'N', 'N'], True), AFTER_N2)
+        self.assertFalse(ACCEPTING[True][AFTER_N1])
+        self.assertTrue(ACCEPTING[False][AFTER_N1])
+
+    def test_dead_resets_to_free(self):
+        for shift in ('D', 'E', 'N', 'OFF'):
+            self.assertEqual(next_state(DEAD, shift), next_state(FREE, shift))
+            self.assertEqual(next_state(DEAD, shift, True), next_state(FREE, shift, True))
+        self.assertEqual(violation_positions(['E', 'D', 'E', 'D']), [1, 3])
+
+
+class ShiftStateTrackTests(SimpleTestCase):
+    """간호사별 상태 추적과 allows()"""
+
+    def track(self, shifts, is_night_keeper=False, initial_state=FREE):
+        track = ShiftStateTrack(len(shifts), is_night_keeper, initial_state)
+        for idx, shift in enumerate(shifts):
+            track.set(idx, shift)
+        return track
+
+    def test_allows_checks_previous_day(self):
+        track = self.track(['E', None, None])
+        self.assertFalse(track.allows(1, ['D']))
+        self.assertTrue(track.allows(1, ['E']))
+
+    def test_allows_checks_following_days(self):
+        track = self.track([None, 'D', None])
+        self.assertFalse(track.allows(0, ['E']))
+        self.assertTrue(track.allows(0, ['D']))
+        self.assertFalse(track.allows(0, ['N']))  # N 다음 D
+
+    def test_allows_uses_initial_state(self):
+        track = self.track([None, None], initial_state=AFTER_N2)
+        self.assertFalse(track.allows(0, ['D']))
+        self.assertTrue(track.allows(0, ['OFF', 'OFF']))
+
+    def test_violation_does_not_block_later_days(self):
+        track = self.track(['E', 'D', 'D', None])
+        self.assertEqual(track.states[1], DEAD)
+        self.assertEqual(track.states[2], AFTER_D)
+        self.assertTrue(track.allows(3, ['E']))
+
+    def test_existing_violation_later_is_not_blamed(self):
+        track = self.track([None, 'E', 'D'])
+        self.assertTrue(track.allows(0, ['D']))
+        self.assertFalse(track.allows(0, ['N']))  # N 다음 E는 새 위반
+
+    def test_night_keeper_block(self):
+        track = self.track([None] * 6, is_night_keeper=True)
+        self.assertTrue(track.allows(0, ['N', 'N', 'OFF', 'OFF']))
+        self.assertFalse(track.allows(0, ['N', 'OFF']))
+        track = self.track(['N', None, None, None, None, None], is_night_keeper=True)
+        self.assertTrue(track.allows(1, ['N', 'N', 'OFF', 'OFF']))
+        track = self.track(['N', 'N', None, None, None, None], is_night_keeper=True)
+        self.assertFalse(track.allows(2, ['N', 'N', 'OFF', 'OFF']))  # NNNN
+
+    def test_set_updates_states_forward(self):
+        track = self.track(['D', 'OFF', 'D'])
+        track.set(0, 'N')
+        self.assertEqual(track.states, [AFTER_N1, AFTER_N_OFF, DEAD])
+        track.set(0, 'D')
+        self.assertEqual(track.states, [AFTER_D, FREE, AFTER_D])
+
+
+CapacityNurse = namedtuple('CapacityNurse', ['id', 'name', 'is_night_keeper'])
+
+
+class CapacityTests(SimpleTestCase):
+    """생성 전 인력 용량 점검"""
+
+    def nurses(self, regular, keepers):
+        return [CapacityNurse(idx, f'간호사{idx}', idx < keepers) for idx in range(regular + keepers)]
+
+    def test_keeper_night_density_across_weeks(self):
+        # 주마다 보면 상한(일반 20명 x 5 + 나이트킵 5 = 105)과 필요 인원(15 x 7)이 같지만
+        # 나이트킵은 2주에 N 9개까지만 가능해 2주 구간(필요 210)이 1개 부족
+        capacity = analyze_capacity(self.nurses(20, 1), date(2025, 6, 1), date(2025, 6, 30), {'D': 1, 'E': 1, 'N': 13})
+        self.assertFalse(capacity['feasible'])
+        self.assertEqual(capacity['short_windows'][0],
+                         {'start': date(2025, 6, 2), 'end': date(2025, 6, 15), 'required': 210, 'capacity': 209})
+        self.assertTrue(all(not week['short'] for week in capacity['weeks']))
+
+    def test_feasible_requirements(self):
+        capacity = analyze_capacity(self.nurses(20, 1), date(2025, 6, 1), date(2025, 6, 30), {'D': 1, 'E': 1, 'N': 12})
+        self.assertTrue(capacity['feasible'])
+        self.assertEqual(capacity['short_windows'], [])
+
+
+class MinCostFlowTests(SimpleTestCase):
+    """최소 비용 최대 유량"""
+
+    def test_prefers_cheaper_path(self):
+        # source(0) -> 1 -> sink(3) 비용 1, source -> 2 -> sink 비용 5, 두 경로 모두 용량 1
+        network = MinCostFlow(4)
+        cheap = network.add_edge(0, 1, 1, 1)
+        expensive = network.add_edge(0, 2, 1, 5)
+        network.add_edge(1, 3, 1, 0)
+        network.add_edge(2, 3, 1, 0)
+        self.assertEqual(network.flow(0, 3, max_flow=1), (1, 1))
+        self.assertEqual(network.edge_flow(cheap), 1)
+        self.assertEqual(network.edge_flow(expensive), 0)
+
+    def test_reroutes_through_residual_edge(self):
+        # 처음 고른 경로를 되돌려야 최대 유량 2가 되는 그래프
+        network = MinCostFlow(4)
+        network.add_edge(0, 1, 1, 0)
+        network.add_edge(0, 2, 1, 0)
+        network.add_edge(1, 2, 1, -1)
+        network.add_edge(1, 3, 1, 3)
+        network.add_edge(2, 3, 1, 0)
+        self.assertEqual(network.flow(0, 3), (2, 3))
+
+
+RepairNurse = namedtuple('RepairNurse', ['id', 'is_night_keeper'])
+
+
+class RepairCoverageTests(SimpleTestCase):
+    """최소 비용 유량 부족 인원 보충"""
+
+    START = date(2025, 6, 2)  # 월요일
+
+    def roster(self, nurses, rows):
+        """rows: {nurse_id: 'DEN-' 형식 근무 문자열 (O는 OFF)}"""
+        days = len(next(iter(rows.values())))
+        schedule = RosterSchedule(nurses, self.START, self.START + timedelta(days=days - 1))
+        for nurse_id, codes in rows.items():
+            for offset, code in enumerate(codes):
+                schedule[(nurse_id, self.START + timedelta(days=offset))] = 'OFF' if code == 'O' else code
+        return schedule, [self.START + timedelta(days=offset) for offset in range(days)]
+
+    def requirements(self, date_range, *per_day):
+        return {day: dict(zip('DEN', counts)) for day, counts in zip(date_range, per_day)}
+
+    def shifts(self, schedule, nurse_id, date_range):
+        return ''.join(schedule[(nurse_id, day)][0] for day in date_range)
+
+    def test_fills_shortage_from_off_nurses(self):
+        nurses = [RepairNurse(1, False), RepairNurse(2, False)]
+        schedule, date_range = self.roster(nurses, {1: 'OOO', 2: 'OOO'})
+        result = repair_coverage(schedule, nurses, date_range,
+                                 self.requirements(date_range, (1, 0, 0), (1, 0, 0), (1, 1, 0)))
+        self.assertEqual(result['unfilled'], [])
+        self.assertEqual(result['moved'], [])
+        self.assertEqual(len(result['assigned']), 4)
+        for day in date_range:
+            staffed = Counter(schedule[(nurse.id, day)] for nurse in nurses)
+            self.assertGreaterEqual(staffed['D'], 1)
+        self.assertEqual(Counter(schedule[(nurse.id, date_range[2])] for nurse in nurses), {'D': 1, 'E': 1})
+
+    def test_skips_wanted_off(self):
+        nurses = [RepairNurse(1, False), RepairNurse(2, False)]
+        schedule, date_range = self.roster(nurses, {1: 'O', 2: 'O'})
+        result = repair_coverage(schedule, nurses, date_range, self.requirements(date_range, (1, 0, 0)),
+                                 off_requests=[(1, date_range[0])])
+        self.assertEqual(result['assigned'], [(2, date_range[0], 'D')])
+
+    def test_moves_nurse_from_surplus_shift(self):
+        # D는 2명으로 1명 초과, E는 1명 부족이고 OFF인 간호사는 원티드 OFF
+        nurses = [RepairNurse(1, False), RepairNurse(2, False), RepairNurse(3, False)]
+        schedule, date_range = self.roster(nurses, {1: 'D', 2: 'D', 3: 'O'})
+        result = repair_coverage(schedule, nurses, date_range, self.requirements(date_range, (1, 1, 0)),
+                                 off_requests=[(3, date_range[0])])
+        self.assertEqual(result['assigned'], [])
+        self.assertEqual(len(result['moved']), 1)
+        self.assertEqual(result['moved'][0][2:], ('D', 'E'))
+        self.assertEqual(result['unfilled'], [])
+        self.assertEqual(schedule[(3, date_range[0])], 'OFF')
+
+    def test_locked_cell_is_not_moved(self):
+        nurses = [RepairNurse(1, False), RepairNurse(2, False)]
+        schedule, date_range = self.roster(nurses, {1: 'D', 2: 'D'})
+        result = repair_coverage(schedule, nurses, date_range, self.requirements(date_range, (1, 1, 0)),
+                                 locked=[(1, date_range[0])])
+        self.assertEqual(result['moved'], [(2, date_range[0], 'D', 'E')])
+        self.assertEqual(schedule[(1, date_range[0])], 'D')
+
+    def test_night_keeper_gets_nn_block(self):
+        # 나이트킵은 단일 N이 금지이므로 다음 날까지 N으로 묶어 배정
+        nurses = [RepairNurse(1, True)]
+        schedule, date_range = self.roster(nurses, {1: 'OOO'})
+        result = repair_coverage(schedule, nurses, date_range,
+                                 self.requirements(date_range, (0, 0, 1), (0, 0, 0), (0, 0, 0)))
+        self.assertEqual(result['assigned'], [(1, date_range[0], 'N'), (1, date_range[1], 'N')])
+        self.assertEqual(self.shifts(schedule, 1, date_range), 'NNO')
+
+    def test_regular_nurse_gets_no_isolated_night(self):
+        nurses = [RepairNurse(1, False)]
+        schedule, date_range = self.roster(nurses, {1: 'OOO'})
+        result = repair_coverage(schedule, nurses, date_range,
+                                 self.requirements(date_range, (0, 0, 1), (0, 0, 0), (0, 0, 0)))
+        self.assertEqual(result['unfilled'], [])
+        self.assertEqual(self.shifts(schedule, 1, date_range), 'NNO')
+
+    def test_move_does_not_leave_isolated_night(self):
+        # 2일째 N 초과 1명 - 간호사 1의 N을 E로 옮기면 3일째 N이 단일 N으로 남으므로 간호사 2를 옮김
+        nurses = [RepairNurse(1, False), RepairNurse(2, False)]
+        schedule, date_range = self.roster(nurses, {1: 'ONNOO', 2: 'ONOOO'})
+        requirements = self.requirements(date_range, (0, 0, 0), (0, 1, 1), (0, 0, 1), (0, 0, 0), (0, 0, 0))
+        result = repair_coverage(schedule, nurses, date_range, requirements)
+        self.assertEqual(result['moved'], [(2, date_range[1], 'N', 'E')])
+        self.assertEqual(self.shifts(schedule, 1, date_range), 'ONNOO')
+
+    def test_night_block_is_kept_when_no_one_can_move(self):
+        nurses = [RepairNurse(1, False), RepairNurse(2, False)]
+        schedule, date_range = self.roster(nurses, {1: 'ONNOO', 2: 'ONNOO'})
+        requirements = self.requirements(date_range, (0, 0, 0), (0, 1, 1), (0, 0, 2), (0, 0, 0), (0, 0, 0))
+        result = repair_coverage(schedule, nurses, date_range, requirements)
+        self.assertEqual(result['moved'], [])
+        self.assertEqual(result['unfilled'], [(date_range[1], 'E', 1)])
+
+
+class ZeroRequirementTests(TestCase):
+    """필요 인원이 0명인 근무가 있어도 근무표를 생성"""
+
+    START = date(2025, 6, 2)
+    END = date(2025, 6, 15)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nurses = [Nurse.objects.create(name=f'간호사{i}', employee_id=f'Z{i:03d}', skill_level=i % 6 + 1)
+                      for i in range(14)]
+
+    def generate(self, engine, requirements):
+        request = headless_request()
+        create_schedule_with_pattern(request, self.START, self.END, self.nurses,
+                                     {nurse.id: 8 for nurse in self.nurses}, dict(requirements),
+                                     engine=engine, seed=1)
+        errors = [message.message for message in request._messages if message.level >= messages.ERROR]
+        self.assertEqual(errors, [])
+        self.assertEqual(Schedule.objects.count(), len(self.nurses) * 14)
+        counts = Counter(Schedule.objects.values_list('shift', flat=True))
+        for shift, required in requirements.items():
+            if required:
+                self.assertGreater(counts[shift], 0)
+
+    def test_zero_requirement(self):
+        for engine in ('pattern', 'greedy'):
+            for requirements in ({'D': 4, 'E': 4, 'N': 0}, {'D': 0, 'E': 3, 'N': 3}):
+                with self.subTest(engine=engine, requirements=requirements):
+                    self.generate(engine, requirements)
+
+
+class EditShiftsRequestTests(TestCase):
+    """근무 수정 요청 형식 오류는 400으로 응답"""
+
+    def post(self, body):
+        return self.client.post(reverse('edit_shifts'), body, content_type='application/json')
+
+    def test_rejects_malformed_payload(self):
+        for body in ('[]', '"edits"', '{"edits": {"nurse_id": 1}}', '{"edits": "D"}', '{"edits": [1]}', '{'):
+            with self.subTest(body=body):
+                response = self.post(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['status'], 'error')
+
+    def test_empty_edits(self):
+        self.assertEqual(self.post('{"edits": []}').status_code, 400)
+
+
+class LocalRepairTests(TestCase):
+    """근무 수정 후 주변 구간 국소 보정"""
+
+    START = date(2025, 6, 2)  # 월요일
+
+    @classmethod
+    def setUpTestData(cls):
+        for shift, required in (('D', 1), ('E', 0), ('N', 0)):
+            StaffingRequirement.objects.create(shift=shift, required_staff=required)
+        cls.ward = Ward.objects.create(name='병동1', code='W1')
+        cls.other_ward = Ward.objects.create(name='병동2', code='W2')
+
+    def nurse(self, name, ward=None):
+        return Nurse.objects.create(name=name, employee_id=name, skill_level=3, ward=ward)
+
+    def write(self, nurse, codes, start=None):
+        """codes: 날짜별 근무 문자열 (O는 OFF, 공백은 근무표 없음)"""
+        start = start or self.START
+        Schedule.objects.bulk_create([
+            Schedule(nurse=nurse, date=start + timedelta(days=offset), shift='OFF' if code == 'O' else code,
+                     ward=nurse.ward)
+            for offset, code in enumerate(codes) if code != ' '
+        ])
+
+    def day(self, offset):
+        return self.START + timedelta(days=offset)
+
+    def shifts(self, nurse, days=7):
+        saved = dict(Schedule.objects.filter(nurse=nurse).values_list('date', 'shift'))
+        return ''.join(saved.get(self.day(offset), ' ')[0] for offset in range(days))
+
+    def assert_day_coverage(self, nurses, days=7):
+        for offset in range(days):
+            staffed = Schedule.objects.filter(nurse__in=nurses, date=self.day(offset), shift='D').count()
+            self.assertGreaterEqual(staffed, 1, self.day(offset))
+
+    def test_pinned_off_is_covered_and_logged(self):
+        sick, weekend, spare = self.nurse('A'), self.nurse('B'), self.nurse('C')
+        self.write(sick, 'DDDDDOO')
+        self.write(weekend, 'OOOOODD')
+        self.write(spare, 'OOOOOOO')
+
+        result = repair_locally({(sick.id, self.day(2)): 'OFF'})
+
+        self.assertEqual(result['unfilled'], [])
+        self.assertEqual(result['violations'], [])
+        self.assertEqual(self.shifts(sick), 'DDODDOO')
+        self.assert_day_coverage([sick, weekend, spare])
+        history = ShiftChangeHistory.objects.filter(date=self.day(2))
+        self.assertEqual(history.count(), len(result['changes']))
+        self.assertEqual({(row.previous_shift, row.new_shift) for row in history}, {('D', 'OFF'), ('OFF', 'D')})
+
+    def test_pin_breaking_order_rule_is_kept(self):
+        # 화요일을 E로 고정하면 수요일 D가 E 다음 D가 되므로 수정한 간호사의 구간을 다시 생성
+        nurse, spare = self.nurse('A'), self.nurse('B')
+        self.write(nurse, 'DDDDDOO')
+        self.write(spare, 'OOOOODD')
+
+        result = repair_locally({(nurse.id, self.day(1)): 'E'})
+
+        self.assertEqual(result['violations'], [])
+        codes = self.shifts(nurse)
+        self.assertEqual(codes[1], 'E')
+        shifts = ['OFF' if code == 'O' else code for code in codes]
+        self.assertEqual(violation_positions(shifts), [])
+        self.assert_day_coverage([nurse, spare])
+
+    def test_gap_in_roster_splits_window(self):
+        # 토~일(5, 6일째)은 근무표가 없으므로 금요일 고정 칸의 재생성이 다음 주로 이어지지 않음
+        nurse, spare = self.nurse('A'), self.nurse('B')
+        self.write(nurse, 'DDDEO  DDDDDOO')
+        self.write(spare, 'OOOOD  OOOOODD')
+        next_week = self.shifts(nurse, 14)[7:]
+
+        result = repair_locally({(nurse.id, self.day(4)): 'D'})
+
+        self.assertEqual(result['violations'], [])
+        codes = self.shifts(nurse, 14)
+        self.assertEqual(codes[4], 'D')
+        self.assertEqual(codes[5:7], '  ')
+        self.assertEqual(codes[7:], next_week)
+        self.assertEqual(violation_positions(['OFF' if code == 'O' else code for code in codes[:5]]), [])
+        self.assertFalse(Schedule.objects.filter(date__in=[self.day(5), self.day(6)]).exists())
+
+    def test_repair_stays_in_nurse_ward(self):
+        sick, spare = self.nurse('A', self.ward), self.nurse('B', self.ward)
+        outsider = self.nurse('C', self.other_ward)
+        self.write(sick, 'DDDDDOO')
+        self.write(spare, 'OOOOODD')
+        self.write(outsider, 'DDDDDDD')
+
+        result = repair_locally({(sick.id, self.day(2)): 'OFF'})
+
+        self.assertEqual({nurse_id for nurse_id, _, _, _ in result['changes']}, {sick.id, spare.id})
+        self.assertEqual(self.shifts(outsider), 'DDDDDDD')
+        self.assertEqual(self.shifts(spare)[2], 'D')
+        self.assertEqual(Schedule.objects.get(nurse=spare, date=self.day(2)).ward, self.ward)
+
+    def test_edit_shifts_with_repair(self):
+        sick, spare = self.nurse('A'), self.nurse('B')
+        self.write(sick, 'DDDDDOO')
+        self.write(spare, 'OOOOODD')
+        body = {'edits': [{'nurse_id': sick.id, 'date': '2025-06-04', 'shift': 'OFF'}], 'repair': True}
+
+        response = self.client.post(reverse('edit_shifts'), json.dumps(body), content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertTrue(payload['saved'])
+        self.assertEqual(payload['unfilled'], [])
+        self.assertEqual({(change['nurse_id'], change['new_shift']) for change in payload['changes']},
+                         {(sick.id, 'OFF'), (spare.id, 'D')})
+        self.assertEqual(ShiftChangeHistory.objects.count(), 2)
+        self.assertEqual(self.shifts(sick), 'DDODDOO')
+
+
+class PurgeArchiveTests(TestCase):
+    """근무표 기간 삭제와 보관/복원 - 행 수와 누적 근무 통계"""
+
+    START = date(2025, 5, 26)
+    END = date(2025, 6, 8)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.wards = [Ward.objects.create(name=f'병동{i}', code=f'P{i}') for i in range(2)]
+        cls.nurses = [Nurse.objects.create(name=f'간호사{i}', employee_id=f'P{i:03d}', ward=cls.wards[i % 2])
+                      for i in range(4)]
+        days = (cls.END - cls.START).days + 1
+        for ward in cls.wards:
+            writer = ScheduleWriter(ward_id=ward.id)
+            for i, nurse in enumerate(cls.nurses):
+                if nurse.ward_id != ward.id:
+                    continue
+                for offset in range(days):
+                    writer.add(nurse.id, cls.START + timedelta(days=offset), ('D', 'E', 'N', 'OFF')[(i + offset) % 4])
+            writer.flush()
+        cls.total = len(cls.nurses) * days
+
+    def ledger(self):
+        return {row['nurse_id']: tuple(row[field] for field in LEDGER_FIELDS)
+                for row in FairnessLedger.objects.values('nurse_id', *LEDGER_FIELDS)}
+
+    def recount(self):
+        """남은 근무(근무 테이블과 보관 근무표)를 처음부터 다시 집계한 누적 통계"""
+        totals = {}
+        for nurse_id, day, shift in schedule_rows(self.START, self.END):
+            counts = totals.setdefault(nurse_id, Counter())
+            counts.update(cell_counts(day, shift))
+        return {nurse.id: tuple(totals.get(nurse.id, Counter())[field] for field in LEDGER_FIELDS)
+                for nurse in self.nurses}
+
+    def test_ledger_matches_saved_rows(self):
+        self.assertEqual(Schedule.objects.count(), self.total)
+        self.assertEqual(self.ledger(), self.recount())
+
+    def test_delete_range(self):
+        result = delete_schedules(date(2025, 6, 1), self.END)
+        self.assertEqual(result['deleted'], len(self.nurses) * 8)
+        self.assertEqual(Schedule.objects.count(), len(self.nurses) * 6)
+        self.assertFalse(Schedule.objects.filter(date__gte=date(2025, 6, 1)).exists())
+        self.assertEqual(self.ledger(), self.recount())
+
+    def test_delete_ward(self):
+        before = self.ledger()
+        ward_nurses = [nurse.id for nurse in self.nurses if nurse.ward_id == self.wards[0].id]
+        result = delete_schedules(self.START, self.END, ward_id=self.wards[0].id)
+        self.assertEqual(result['deleted'], self.total // 2)
+        self.assertFalse(Schedule.objects.filter(nurse_id__in=ward_nurses).exists())
+        self.assertEqual(Schedule.objects.count(), self.total // 2)
+        ledger = self.ledger()
+        self.assertEqual(ledger, self.recount())
+        for nurse in self.nurses:
+            if nurse.id not in ward_nurses:
+                self.assertEqual(ledger[nurse.id], before[nurse.id])
+
+    def test_delete_whole(self):
+        delete_schedules(self.START, date(2025, 5, 31), archive=True)
+        result = delete_schedules()
+        self.assertEqual(result['deleted'], len(self.nurses) * 8)
+        self.assertEqual(result['cleared'], len(self.nurses) * 6)
+        self.assertFalse(Schedule.objects.exists())
+        self.assertFalse(ArchivedSchedule.objects.exists())
+        self.assertFalse(FairnessLedger.objects.exists())
+
+    def test_delete_history(self):
+        nurse = self.nurses[0]
+        day = date(2025, 6, 2)
+        previous = Schedule.objects.get(nurse=nurse, date=day).shift
+        save_changes([(nurse.id, day, previous, 'OFF' if previous != 'OFF' else 'D')])
+        self.assertEqual(self.ledger(), self.recount())
+
+        delete_schedules(day, day, nurse_ids=[nurse.id])
+        self.assertEqual(ShiftChangeHistory.objects.count(), 1)
+        self.assertEqual(self.ledger(), self.recount())
+
+        result = delete_schedules(day, day, nurse_ids=[nurse.id], history=True)
+        self.assertEqual(result, {'deleted': 0, 'archived': 0, 'cleared': 0, 'history': 1})
+        self.assertFalse(ShiftChangeHistory.objects.exists())
+
+    def test_archive_and_restore_keep_ledger(self):
+        before = self.ledger()
+        rows = sorted(schedule_rows(self.START, self.END))
+
+        result = delete_schedules(self.START, self.END, archive=True)
+        self.assertEqual(result['archived'], self.total)
+        self.assertFalse(Schedule.objects.exists())
+        self.assertEqual(ArchivedSchedule.objects.count(), len(self.nurses) * 2)  # 5월, 6월
+        self.assertEqual(sorted(schedule_rows(self.START, self.END)), rows)
+        self.assertEqual(self.ledger(), before)
+
+        self.assertEqual(restore_months(self.START, self.END), self.total)
+        self.assertFalse(ArchivedSchedule.objects.exists())
+        self.assertEqual(sorted(Schedule.objects.values_list('nurse_id', 'date', 'shift')), rows)
+        self.assertEqual(
+            set(Schedule.objects.values_list('nurse_id', 'ward_id')),
+            {(nurse.id, nurse.ward_id) for nurse in self.nurses},
+        )
+        self.assertEqual(self.ledger(), before)
+
+    def test_delete_clears_archived_cells(self):
+        delete_schedules(self.START, self.END, archive=True)
+        result = delete_schedules(date(2025, 6, 1), self.END)
+        self.assertEqual(result, {'deleted': 0, 'archived': 0, 'cleared': len(self.nurses) * 8, 'history': 0})
+        self.assertEqual(len(schedule_rows(self.START, self.END)), len(self.nurses) * 6)
+        self.assertEqual(ArchivedSchedule.objects.count(), len(self.nurses))
+        self.assertEqual(self.ledger(), self.recount())
+
+
+@skipUnless(connection.vendor == 'sqlite', '실행 계획 문구가 SQLite 기준')
+class QueryPlanTests(TestCase):
+    """자주 쓰는 근무표 조회가 인덱스를 타는지 실행 계획(EXPLAIN QUERY PLAN)으로 확인"""
+
+    START = date(2025, 1, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        nurses = [Nurse.objects.create(name=f'간호사{i}', employee_id=f'T{i:03d}') for i in range(6)]
+        Schedule.objects.bulk_create([
+            Schedule(nurse=nurse, date=cls.START + timedelta(days=offset), shift=('D', 'E', 'N', 'OFF')[(i + offset) % 4])
+            for i, nurse in enumerate(nurses) for offset in range(28)
+        ])
+        ShiftChangeHistory.objects.bulk_create([
+            ShiftChangeHistory(nurse=nurse, date=cls.START + timedelta(days=offset), previous_shift='D',
+                               new_shift='E', change_number=number)
+            for nurse in nurses for offset in range(0, 28, 7) for number in (1, 2)
+        ])
+        cls.nurse = nurses[0]
+
+    def assertUsesIndex(self, queryset, index_name, covering=False):
+        plan = queryset.explain()
+        self.assertIn(f'{"COVERING INDEX" if covering else "INDEX"} {index_name}', plan)
+        return plan
+
+    def test_date_range(self):
+        queryset = Schedule.objects.filter(date__range=[self.START, self.START + timedelta(days=6)])
+        self.assertUsesIndex(queryset.values_list('nurse_id', 'date', 'shift'), 'schedule_date_shift_idx', covering=True)
+
+    def test_date_shift_counts(self):
+        queryset = Schedule.objects.filter(
+            date__in=[self.START, self.START + timedelta(days=3)], shift__in=['D', 'E', 'N']
+        ).values('date', 'shift').annotate(count=Count('id'))
+        self.assertUsesIndex(queryset, 'schedule_date_shift_idx', covering=True)
+
+    def test_nurse_shift_counts(self):
+        queryset = Schedule.objects.filter(nurse=self.nurse, shift='D').values_list('date')
+        self.assertUsesIndex(queryset, 'schedule_nurse_shift_idx', covering=True)
+
+    def test_change_history_order(self):
+        queryset = ShiftChangeHistory.objects.order_by('nurse', 'date', 'change_number')
+        plan = self.assertUsesIndex(queryset, 'shiftchange_nurse_date_idx')
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_last_change_number(self):
+        queryset = ShiftChangeHistory.objects.filter(
+            nurse_id__in=[self.nurse.id], date__range=[self.START, self.START + timedelta(days=27)]
+        ).values('nurse_id', 'date').annotate(last=Max('change_number'))
+        self.assertUsesIndex(queryset, 'shiftchange_nurse_date_idx', covering=True)
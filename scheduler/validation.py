@@ -0,0 +1,121 @@
+"""
+근무 수정 시 영향을 받는 규칙 구간만 다시 검사하는 모듈
+
+근무 한 칸이 바뀌면 순서 규칙은 해당 간호사의 앞뒤 7일, 주간 근무 상한은 해당 주,
+필요 인원은 해당 날짜(와 병동)에만 영향을 주므로 전체 근무표 대신 이 구간만 검사한다.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db.models import Count
+from django.db.models.functions import Coalesce
+
+from .archive import has_archived, schedule_rows
+from .automaton import violation_positions
+from .local_repair import get_shift_requirements
+from .models import Nurse, Schedule
+from .patterns import MAX_WORK_DAYS_PER_WEEK
+
+RULE_WINDOW_DAYS = 7  # 순서 규칙 검사 구간 (수정한 날짜 앞뒤)
+
+
+def validate_edit_windows(edited_cells):
+    """
+    수정한 칸 주변의 규칙 구간만 검사하는 함수
+
+    Args:
+        edited_cells: (nurse_id, date) 형태의 수정한 칸 목록
+
+    Returns:
+        [{'type': 'sequence' | 'weekly_cap' | 'coverage', 'nurse_id', 'date', 'shift', 'message'}, ...]
+        (coverage 항목에는 부족한 병동 'ward_id'도 담음)
+    """
+    edited_cells = list(edited_cells)
+    if not edited_cells:
+        return []
+
+    violations = []
+    nurse_ids = {nurse_id for nurse_id, _ in edited_cells}
+    nurses = {nurse.id: nurse for nurse in Nurse.objects.filter(id__in=nurse_ids)}
+
+    # 간호사별 검사 구간 - 수정한 날짜 앞뒤 7일과 해당 주(월~일) 전체
+    windows = {}
+    for nurse_id, day in edited_cells:
+        start = min(day - timedelta(days=RULE_WINDOW_DAYS), day - timedelta(days=day.weekday()))
+        end = max(day + timedelta(days=RULE_WINDOW_DAYS), day + timedelta(days=6 - day.weekday()))
+        if nurse_id in windows:
+            start = min(start, windows[nurse_id][0])
+            end = max(end, windows[nurse_id][1])
+        windows[nurse_id] = (start, end)
+
+    # 수정한 간호사들의 검사 구간 근무를 한 번에 조회
+    load_start = min(start for start, _ in windows.values())
+    load_end = max(end for _, end in windows.values())
+    nurse_rows = {nurse_id: {} for nurse_id in nurse_ids}
+    for nurse_id, day, shift in schedule_rows(load_start, load_end, nurse_ids):
+        nurse_rows[nurse_id][day] = shift
+
+    for nurse_id, (start, end) in windows.items():
+        nurse = nurses.get(nurse_id)
+        if nurse is None:
+            continue
+        rows = nurse_rows[nurse_id]
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+        # 1. 순서 규칙 (구간 시작 상태는 가장 제약이 적은 FREE로 두어 오탐을 막음)
+        shifts = [rows.get(day) for day in days]
+        for idx in violation_positions(shifts, nurse.is_night_keeper):
+            violations.append({
+                'type': 'sequence',
+                'nurse_id': nurse_id,
+                'date': days[idx],
+                'shift': shifts[idx],
+                'message': f"{nurse.name}: {days[idx].strftime('%Y-%m-%d')}의 {shifts[idx]} 근무가 근무 순서 규칙을 위반합니다.",
+            })
+
+        # 2. 주간 근무 상한 (수정한 날짜가 속한 주만)
+        edited_weeks = {day - timedelta(days=day.weekday()) for cell_nurse, day in edited_cells if cell_nurse == nurse_id}
+        for week_start in sorted(edited_weeks):
+            worked = sum(1 for offset in range(7)
+                         if rows.get(week_start + timedelta(days=offset)) in ('D', 'E', 'N'))
+            if worked > MAX_WORK_DAYS_PER_WEEK:
+                violations.append({
+                    'type': 'weekly_cap',
+                    'nurse_id': nurse_id,
+                    'date': week_start,
+                    'shift': None,
+                    'message': f"{nurse.name}: {week_start.strftime('%Y-%m-%d')} 주의 근무일이 {worked}일로 주간 상한({MAX_WORK_DAYS_PER_WEEK}일)을 넘습니다.",
+                })
+
+    # 3. 수정한 날짜의 근무별 필요 인원 - 수정한 간호사의 병동마다 그 병동 인원과 병동 필요 인원을 비교
+    #    (근무 병동이 비어 있는 근무는 소속 병동 근무로 셈)
+    ward_ids = {nurse.ward_id for nurse in nurses.values()}
+    requirements = {ward_id: get_shift_requirements(ward_id) for ward_id in ward_ids}
+    edited_dates = sorted({day for _, day in edited_cells})
+    staffed = Counter()
+    if has_archived(edited_dates[0], edited_dates[-1]):
+        # 보관된 달이 섞여 있으면 보관 근무표와 함께 세어 봄 (보관 근무는 소속 병동으로 셈)
+        home_ward = dict(Nurse.objects.values_list('id', 'ward_id'))
+        for nurse_id, day, shift in schedule_rows(edited_dates[0], edited_dates[-1]):
+            if day in edited_dates:
+                staffed[(home_ward.get(nurse_id), day, shift)] += 1
+    else:
+        for row in Schedule.objects.filter(date__in=edited_dates, shift__in=['D', 'E', 'N']).annotate(
+            unit=Coalesce('ward_id', 'nurse__ward_id')
+        ).values('unit', 'date', 'shift').annotate(count=Count('id')):
+            staffed[(row['unit'], row['date'], row['shift'])] = row['count']
+    for ward_id in sorted(ward_ids, key=lambda ward_id: (ward_id is not None, ward_id)):
+        for day in edited_dates:
+            for shift, required in requirements[ward_id].items():
+                count = staffed[(ward_id, day, shift)]
+                if count < required:
+                    violations.append({
+                        'type': 'coverage',
+                        'nurse_id': None,
+                        'ward_id': ward_id,
+                        'date': day,
+                        'shift': shift,
+                        'message': f"{day.strftime('%Y-%m-%d')}의 {shift} 근무가 {required - count}명 부족합니다.",
+                    })
+
+    return violations
@@ -1,13 +1,31 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from .models import Nurse, Schedule, StaffingRequirement, ShiftChangeHistory
+from .models import Ward, Nurse, Schedule, StaffingRequirement, ShiftChangeHistory, WantedOff, GenerationReport, GenerationReportEntry, RosterCandidate
+from .automaton import RosterSchedule, POST_NIGHT_STATES, is_legal
+from .patterns import MAX_WORK_DAYS_PER_WEEK, build_roster, shift_prices
+from .repair import repair_coverage
+from .feasibility import analyze_capacity
+from .budget import TimeBudget
+from .arbitration import arbitrate_wanted_offs
+from .local_repair import repair_locally, save_changes
+from .validation import validate_edit_windows
+from .substitutes import find_substitutes
+from .swaps import find_swap_partners
+from .ledger import apply_changes, balance_offsets, load_ledger
+from .horizon import load_carry_over, generate_rolling
+from .reporting import GenerationLog
+from .archive import schedule_bounds, schedule_rows
+from .purge import delete_schedules
+from .result_cache import generation_fingerprint, result_cache
+from .persistence import ScheduleWriter
+from .solution_pool import keep_generated, period_candidates, activate_candidate, compare_candidates
 from datetime import datetime, timedelta
 import random
 from collections import defaultdict, Counter
-from django.db import models
-import heapq
-import copy
+from django.db import models, transaction
 from django.http import JsonResponse
+from django.core.paginator import Paginator
+import json
 import uuid
 
 # Create your views here.
@@ -25,6 +43,7 @@ def update_staffing(request, pk):
             messages.success(request, f'{requirement.get_shift_display()} 근무 인원이 {required_staff}명으로 수정되었습니다.')
         else:  # 새로운 설정 추가
             requirement, created = StaffingRequirement.objects.update_or_create(
+                ward=None,
                 shift=shift,
                 defaults={'required_staff': required_staff}
             )
@@ -45,30 +64,18 @@ def update_staffing(request, pk):
 def get_wanted_offs_for_nurses(nurses, start_date, end_date):
     """
     간호사별 원티드 OFF 날짜를 반환하는 함수
-    실제로는 DB나 다른 소스에서 읽어와야 함.
+    WantedOff 테이블을 기간 조건으로 한 번만 조회해 간호사별 집합으로 만든다. (반려된 요청 제외)
     반환 형식: {nurse_id: {date1, date2, ...}}
     """
     wanted_offs = defaultdict(set)
-    # 예시: 특정 간호사가 특정 날짜에 OFF를 원한다고 가정
     nurse_ids = [n.id for n in nurses]
+    if not nurse_ids:
+        return wanted_offs
     
-    # 예시 데이터 - 실제로는 DB에서 가져와야 함
-    if nurse_ids:
-        # 모든 간호사에게 무작위로 2-3개의 원티드 OFF 날짜 배정
-        for nurse_id in nurse_ids:
-            # 날짜 범위에서 무작위로 2-3일 선택
-            days_count = random.randint(2, 3)
-            date_range = []
-            current_date = start_date
-            while current_date <= end_date:
-                date_range.append(current_date)
-                current_date += timedelta(days=1)
-                
-            if date_range:
-                # 무작위로 날짜 선택
-                wanted_days = random.sample(date_range, min(days_count, len(date_range)))
-                for day in wanted_days:
-                    wanted_offs[nurse_id].add(day)
+    for nurse_id, day in WantedOff.objects.filter(
+        date__range=[start_date, end_date], nurse_id__in=nurse_ids
+    ).exclude(status='denied').values_list('nurse_id', 'date'):
+        wanted_offs[nurse_id].add(day)
     
     return wanted_offs
 
@@ -83,7 +90,7 @@ def is_holiday(date):
 
 def generate_schedule(request, regenerate=False):
     """근무표 생성 - 우선순위 큐, 백트래킹, 분할 정복 방식을 활용한 스케줄링"""
-    staffing_requirements = StaffingRequirement.objects.all()
+    staffing_requirements = StaffingRequirement.objects.filter(ward__isnull=True)
     nurses = Nurse.objects.all()
     nurse_list = list(nurses)
     
@@ -119,6 +126,11 @@ def generate_schedule(request, regenerate=False):
         if 'E' not in shift_requirements: shift_requirements['E'] = 1
         if 'N' not in shift_requirements: shift_requirements['N'] = 1
         
+        # 인력 용량 사전 점검 (재생성은 기존 기간을 유지하므로 경고만 표시)
+        capacity_report = analyze_capacity(nurse_list, start_date, end_date, shift_requirements)
+        for error in capacity_report['errors']:
+            messages.warning(request, error)
+        
         # 스케줄 생성 로직 호출
         create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurse_shifts, shift_requirements)
         return redirect('view_schedule')
@@ -141,16 +153,18 @@ def generate_schedule(request, regenerate=False):
                     else:
                         messages.info(request, f'{nurse.name} 간호사의 나이트 킵 설정이 해제되었습니다.')
         
-            start_date = datetime.strptime(request.POST['start_date'], '%Y-%m-%d')
-            end_date = datetime.strptime(request.POST['end_date'], '%Y-%m-%d')
+            start_date = datetime.strptime(request.POST['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.POST['end_date'], '%Y-%m-%d').date()
             
             # 기본 유효성 검사
             if end_date < start_date:
                 messages.error(request, '종료 날짜는 시작 날짜보다 나중이어야 합니다.')
                 return render(request, 'scheduler/generate_schedule.html', {'staffing_requirements': staffing_requirements})
             
-            if (end_date - start_date).days > 90:
-                messages.error(request, '근무표는 최대 3개월(90일)까지만 생성할 수 있습니다.')
+            # 월 단위 연속 생성은 한 번에 한 달씩 처리하므로 기간 제한 없음
+            rolling = 'rolling' in request.POST
+            if (end_date - start_date).days > 90 and not rolling:
+                messages.error(request, '근무표는 최대 3개월(90일)까지만 생성할 수 있습니다. 더 긴 기간은 월 단위 연속 생성을 선택하세요.')
                 return render(request, 'scheduler/generate_schedule.html', {'staffing_requirements': staffing_requirements})
             
             # 날짜 범위 계산
@@ -270,6 +284,13 @@ def generate_schedule(request, regenerate=False):
                         nurse_shifts[nurse.id] = assigned
                         remaining_shifts -= assigned
             
+            # 인력 용량 사전 점검 - 생성 전에 부족한 주/날짜를 알려줌
+            capacity_report = analyze_capacity(nurse_list, start_date, end_date, shift_requirements, nurse_shifts=nurse_shifts)
+            for error in capacity_report['errors']:
+                messages.warning(request, error)
+            for warning in capacity_report['warnings']:
+                messages.warning(request, warning)
+            
             context = {
                 'staffing_requirements': staffing_requirements,
                 'nurses': nurse_list,
@@ -279,6 +300,8 @@ def generate_schedule(request, regenerate=False):
                 'total_required_slots': total_required_slots,
                 'slots_by_shift': slots_by_shift,
                 'nurse_shifts': nurse_shifts,
+                'capacity_report': capacity_report,
+                'rolling': rolling,
                 'setup_mode': True
             }
             
@@ -286,8 +309,8 @@ def generate_schedule(request, regenerate=False):
         
         # 간호사별 근무수 설정 후 실제 근무표 생성 모드
         elif 'create_schedule' in request.POST:
-            start_date = datetime.strptime(request.POST['start_date'], '%Y-%m-%d')
-            end_date = datetime.strptime(request.POST['end_date'], '%Y-%m-%d')
+            start_date = datetime.strptime(request.POST['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.POST['end_date'], '%Y-%m-%d').date()
             
             # 날짜 범위 계산
             date_range = []
@@ -328,8 +351,26 @@ def generate_schedule(request, regenerate=False):
                 messages.error(request, f'할당된 근무 수({total_assigned_shifts})가 필요한 총 근무 수({total_required_slots})와 일치하지 않습니다.')
                 return redirect('generate_schedule')
             
+            # 인력 용량 사전 점검 - 필요 인원을 채울 수 없으면 생성하지 않음
+            capacity_report = analyze_capacity(nurse_list, start_date, end_date, shift_requirements, nurse_shifts=nurse_shifts)
+            if not capacity_report['feasible'] and 'ignore_capacity' not in request.POST:
+                for error in capacity_report['errors']:
+                    messages.error(request, error)
+                messages.error(request, '인력 용량이 부족하여 근무표를 생성하지 않았습니다. 부족을 감수하려면 "용량 부족 무시"를 선택하세요.')
+                return redirect('generate_schedule')
+            
             # 스케줄 생성 로직 호출
-            create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurse_shifts, shift_requirements)
+            engine = request.POST.get('engine', 'pattern')
+            time_budget = request.POST.get('time_budget')
+            time_budget = float(time_budget) if time_budget else None
+            seed = request.POST.get('seed')
+            seed = int(seed) if seed else None
+            if 'rolling' in request.POST:
+                # 월 단위 구간으로 나눠 직전 구간의 끝 상태를 이어받으며 차례로 생성
+                windows = generate_rolling(request, start_date, end_date, nurse_list, nurse_shifts, shift_requirements, engine=engine, time_budget=time_budget, seed=seed)
+                messages.info(request, f'월 단위 연속 생성: {len(windows)}개 구간을 생성했습니다.')
+            else:
+                create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurse_shifts, shift_requirements, engine=engine, time_budget=time_budget, seed=seed)
             return redirect('view_schedule')
     
     return render(request, 'scheduler/generate_schedule.html', {
@@ -337,18 +378,44 @@ def generate_schedule(request, regenerate=False):
         'nurses': nurse_list
     })
 
-def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurse_shifts, shift_requirements):
-    """패턴 기반으로 스케줄을 생성하는 함수"""
+def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurse_shifts, shift_requirements, engine='pattern', time_budget=None, ward_id=None, seed=None):
+    """
+    패턴 기반으로 스케줄을 생성하는 함수
+    
+    engine:
+        'pattern' - 주간 패턴 라이브러리와 간호사별 DP로 초기 근무표 생성 (기본값)
+        'greedy'  - 나이트 킵 NN 선배정 후 부족 인원을 탐욕적으로 채우는 기존 방식
+    
+    time_budget:
+        생성 제한 시간(초). 시간이 지나면 탐색 단계(패턴 생성, 균형 조정, 부족 인원 보충)를
+        멈추고 그때까지의 근무표로 규칙 검증과 저장을 진행한다. None이면 제한 없음.
+    
+    ward_id:
+        병동 id. 지정하면 nurse_list 간호사의 기존 근무만 삭제하고 저장하는 근무에 근무 병동을 기록한다.
+    
+    seed:
+        난수 시드. 지정하면 같은 입력에서 같은 근무표를 만들며, 입력 지문이 같은 이전 결과가
+        결과 캐시에 있으면 계산 없이 그 근무표를 저장한다. None이면 매번 새로 생성(캐시 미사용).
+    
+    Returns:
+        단계별 소요 시간과 제한 시간 초과 여부를 담은 생성 보고서 (TimeBudget.report())
+    """
+    budget = TimeBudget(time_budget)
+    budget.phase('준비')
+    log = GenerationLog()
     try:
         # 먼저 해당 기간의 기존 스케줄을 삭제
-        existing_schedules = Schedule.objects.filter(date__range=[start_date, end_date])
-        if existing_schedules.exists():
-            delete_count = existing_schedules.count()
-            existing_schedules.delete()
-            messages.info(request, f'기존 스케줄 {delete_count}개가 삭제되었습니다. 새 스케줄을 생성합니다.')
+        # 보관된 달과 겹치면 보관된 칸도 비움 (새 근무표와 겹쳐 조회되거나 통계에 두 번 들어가지 않도록)
+        deleted = delete_schedules(start_date, end_date,
+                                   nurse_ids=[nurse.id for nurse in nurse_list] if ward_id is not None else None)
+        if deleted['deleted']:
+            log.add('info', f'기존 스케줄 {deleted["deleted"]}개가 삭제되었습니다. 새 스케줄을 생성합니다.')
+        
+        # 직전 근무표 끝부분(마지막 근무, 진행 중인 N 블록, 같은 주 근무일 수)을 한 번에 불러와 이어서 생성
+        carry_over = load_carry_over(nurse_list, start_date)
         
         # 전역 변수 선언
-        final_schedule = {}  # 최종 스케줄 결과 (nurse_id, date) -> shift
+        final_schedule = RosterSchedule(nurse_list, start_date, end_date, initial_states=carry_over['states'])  # 최종 스케줄 결과 (nurse_id, date) -> shift
         
         # 날짜 범위 생성
         date_range = []
@@ -359,8 +426,14 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
         
         total_days = len(date_range)
         
-        # 일자별 필요 인원 설정
-        daily_shift_requirements = {day: {'D': 4, 'E': 4, 'N': 4} for day in date_range}  # 모든 교대에 필요 인원 4명으로 설정
+        # 근무별 필요 인원 설정 (입력 없는 근무는 4명)
+        for shift_type in ('D', 'E', 'N'):
+            shift_requirements.setdefault(shift_type, 4)
+        
+        # 일자별 필요 인원 설정 (평일/주말 모두 동일 적용, 배정할 때마다 차감)
+        daily_shift_requirements = {
+            day: {shift_type: shift_requirements[shift_type] for shift_type in ('D', 'E', 'N')} for day in date_range
+        }
         
         # 추가: 근무 유형 최소/최대 비율 설정 - 균형 있는 배정을 위함
         min_ratio_per_shift = 0.2  # 최소 20%는 각 유형의 근무가 배정되어야 함
@@ -379,12 +452,44 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 nurse_preferences[nurse.id]['D'] = 0
                 nurse_preferences[nurse.id]['E'] = 0
         
+        # 원하는 휴무 요청 조정 - 하루 OFF 가능 인원을 넘는 요청은 이력과 연차 순으로 승인
+        arbitration = arbitrate_wanted_offs(nurse_list, start_date, end_date, shift_requirements)
+        if arbitration['contested_days']:
+            log.add('info', f"원티드 OFF 조정: {len(arbitration['contested_days'])}일에서 요청이 가능 인원을 넘어 {arbitration['granted']}건 승인, {len(arbitration['denied'])}건 반려했습니다.")
+        
         # 원하는 휴무 요청 불러오기
         wanted_offs = get_wanted_offs_for_nurses(nurse_list, start_date, end_date)
         for nurse_id, dates in wanted_offs.items():
             for date in dates:
                 off_requests.add((nurse_id, date))
         
+        # 누적 근무 통계는 한 번만 조회해 입력 지문과 근무 가격 보정에 함께 사용
+        ledger = load_ledger([nurse.id for nurse in nurse_list])
+        
+        # 시드가 있으면 입력 지문으로 결과 캐시 확인 - 같은 입력의 이전 결과가 있으면 계산 없이 저장
+        cache_key = None
+        cache_mark = len(log.entries)
+        if seed is not None:
+            random.seed(seed)
+            cache_key = generation_fingerprint(nurse_list, nurse_shifts, shift_requirements, start_date, end_date,
+                                               off_requests, carry_over, ledger, seed, engine, ward_id)
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                budget.phase('저장')
+                rows, entries = cached
+                writer = ScheduleWriter(ward_id=ward_id)
+                for nurse_id, day, shift in rows:
+                    writer.add(nurse_id, day, shift)
+                writer.flush()
+                log.entries.extend(entries)
+                log.add('info', '입력이 같은 이전 생성 결과를 결과 캐시에서 가져와 저장했습니다.')
+                keep_generated(rows, nurse_list, start_date, end_date, shift_requirements, off_requests,
+                               carry_over['states'], ward_id, engine, seed)
+                budget.finish()
+                report = log.save(start_date, end_date, engine, budget.report(), writer.written, ward_id)
+                messages.success(request, f'{log.summary(writer.written, budget.elapsed())} - 결과 캐시 사용 (보고서 #{report.id})')
+                return {**budget.report(), 'report_id': report.id, 'cached': True}
+        
         # 분류: 나이트킵 간호사와 일반 간호사
         night_keepers = [nurse for nurse in nurse_list if nurse.is_night_keeper]
         regular_nurses = [nurse for nurse in nurse_list if not nurse.is_night_keeper]
@@ -419,7 +524,7 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 target_d_per_nurse = total_d_e_shifts / (2 * regular_nurse_count)
                 target_e_per_nurse = target_d_per_nurse
             
-            messages.info(request, f'일반 간호사 목표 근무 배분: D={target_d_per_nurse:.1f}, E={target_e_per_nurse:.1f}, N={target_n_per_nurse:.1f}')
+            log.add('info', f'일반 간호사 목표 근무 배분: D={target_d_per_nurse:.1f}, E={target_e_per_nurse:.1f}, N={target_n_per_nurse:.1f}')
             
             for nurse in regular_nurses:
                 target_shifts_per_nurse[nurse.id] = {
@@ -428,23 +533,8 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                     'N': target_n_per_nurse
                 }
         
-        # 3. 근무별 필요 인원 설정
-        # 기본값 설정 (입력 없으면 각 근무별 1명으로 설정)
-        if 'D' not in shift_requirements: shift_requirements['D'] = 4
-        if 'E' not in shift_requirements: shift_requirements['E'] = 4
-        if 'N' not in shift_requirements: shift_requirements['N'] = 4
-        
-        # 4. 일별 필요 근무 수 계산 (평일/주말 모두 동일 적용)
-        daily_shift_requirements = {}
-        for day in date_range:
-            daily_shift_requirements[day] = {
-                'D': shift_requirements.get('D', 4),
-                'E': shift_requirements.get('E', 4),
-                'N': 4  # N 근무는 항상 4명으로 고정
-            }
-            
-        # 변수명 통일 (daily_requirements를 daily_shift_requirements로 사용)
-        daily_shift_requirements = daily_shift_requirements
+        # 부족 인원 보충 단계의 기준 - 배정 과정에서 차감되지 않는 일별 필요 인원 원본
+        coverage_requirements = {day: dict(daily_shift_requirements[day]) for day in date_range}
         
         # 5. 숙련도 기반 필요 인원 설정
         # 날짜별 각 근무별 필요한 숙련도 인원
@@ -491,8 +581,8 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                         return True
                     skill_level = nurse.skill_level
                 except Exception as e:
-                    # 오류 발생 시 로그 출력하고 기본값으로 진행
-                    print(f"Error in update_skill_requirements: {e}, nurse_id={nurse_id}")
+                    # 오류 발생 시 보고서에 기록하고 기본값으로 진행
+                    log.add('info', f"숙련도 요구사항 갱신 오류 (간호사 id {nurse_id}): {e}", day, shift)
                     return True
             else:
                 # nurse 객체가 전달된 경우
@@ -501,7 +591,7 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                     skill_level = nurse.skill_level
                 except AttributeError:
                     # nurse 객체에 skill_level 속성이 없는 경우
-                    print(f"Error in update_skill_requirements: nurse object has no skill_level attribute, nurse={nurse}")
+                    log.add('info', f"숙련도 요구사항 갱신 오류: 간호사 정보에 숙련도가 없습니다 ({nurse})", day, shift)
                     return True
             
             # 숙련도 카테고리 결정
@@ -536,223 +626,6 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 # 모든 숙련도 범주의 필요 인원이 충족된 경우, 추가 인원으로 배정 가능
                 return True
         
-        # 나머지 코드는 그대로 유지...
-
-        # 최적 근무 배정 함수
-        def assign_optimal_shift(nurse_id, date):
-            """간호사에게 최적의 근무를 배정하는 함수"""
-            nonlocal final_schedule, nurse_shifts, last_5_shifts, daily_shift_requirements, target_shifts_per_nurse
-            
-            # 해당 날짜에 이미 배정되었는지 확인
-            if (nurse_id, date) in final_schedule:
-                return final_schedule[(nurse_id, date)]
-            
-            # 간호사 객체 찾기
-            nurse = next((n for n in nurse_list if n.id == nurse_id), None)
-            
-            # 나이트킵 간호사라면 N 또는 OFF만 가능
-            if nurse and nurse.is_night_keeper:
-                if daily_shift_requirements[date]['N'] > 0 and is_valid_assignment(nurse_id, date, 'N'):
-                    # N 근무 배정
-                    final_schedule[(nurse_id, date)] = 'N'
-                    nurse_shifts[nurse_id]['N'] = nurse_shifts[nurse_id].get('N', 0) + 1
-                    daily_shift_requirements[date]['N'] -= 1
-                    last_5_shifts[nurse_id] = last_5_shifts.get(nurse_id, [])[-4:] + ['N']
-                    update_skill_requirements(nurse_id, date, 'N')
-                    return 'N'
-                else:
-                    # OFF 배정
-                    final_schedule[(nurse_id, date)] = 'OFF'
-                    nurse_shifts[nurse_id]['OFF'] = nurse_shifts[nurse_id].get('OFF', 0) + 1
-                    last_5_shifts[nurse_id] = last_5_shifts.get(nurse_id, [])[-4:] + ['OFF']
-                    return 'OFF'
-            
-            # 각 근무 유형별 가능성 평가
-            shift_candidates = []
-            
-            # 최대 근무 횟수 제한 추가
-            max_shifts_allowed = {
-                'D': 10,  # 데이 근무 최대 10회로 제한
-                'E': 10,  # 이브닝 근무 최대 10회로 제한
-                'N': 10,  # 나이트 근무 최대 10회로 제한
-            }
-            
-            # 각 근무 유형에 대해 점수 계산
-            for shift in ['D', 'E', 'N', 'OFF']:
-                # 휴가 요청이 있으면 무조건 OFF 배정
-                if (nurse_id, date) in off_requests:
-                    if shift == 'OFF':
-                        shift_candidates.append((100, shift))
-                    continue
-                
-                # OFF가 아닌 근무의 경우, 필요한 인원이 이미 충족되었는지 확인
-                if shift != 'OFF' and daily_shift_requirements[date][shift] <= 0:
-                    continue
-                
-                # 기본 점수 시작
-                score = 0
-                
-                # 근무 선호도 점수 추가
-                nurse_preference = nurse_preferences.get(nurse_id, {}).get(shift, 0)
-                score += nurse_preference * 5  # 선호도를 점수에 반영
-                
-                # D와 E 근무 균형 강화 - 두 근무 유형 간의 차이 비교
-                if not nurse.is_night_keeper and shift in ['D', 'E']:
-                    d_count = nurse_shifts[nurse_id].get('D', 0)
-                    e_count = nurse_shifts[nurse_id].get('E', 0)
-                    
-                    # D와 E 근무 간 차이가 크면 적은 쪽 선호
-                    diff = abs(d_count - e_count)
-                    if diff > 2:  # 차이가 2 이상이면 균형 조정
-                        if (shift == 'D' and d_count < e_count) or (shift == 'E' and e_count < d_count):
-                            # 적은 쪽에 가산점
-                            score += 35 + (diff * 5)  # 차이가 클수록 더 높은 점수
-                        else:
-                            # 많은 쪽에 감점
-                            score -= 30 + (diff * 5)  # 차이가 클수록 더 높은 패널티
-                
-                # 균형 점수 추가 - 각 근무 유형의 비율 고려 (가중치 증가)
-                total_shifts = sum(nurse_shifts[nurse_id].values()) + 1  # 이번 근무를 포함
-                current_ratio = (nurse_shifts[nurse_id].get(shift, 0) + 1) / total_shifts
-                
-                # 근무 유형별 이상적인 비율 (조정)
-                ideal_ratios = {'D': 0.3, 'E': 0.3, 'N': 0.15, 'OFF': 0.25}  # D와 E를 동일하게 조정
-                
-                # 이상적인 비율에 가까울수록 높은 점수 (가중치 증가)
-                ratio_score = 40 - abs(current_ratio - ideal_ratios[shift]) * 150
-                score += ratio_score
-                
-                # 최대 근무 횟수 제한 적용
-                if shift in max_shifts_allowed and nurse_shifts[nurse_id].get(shift, 0) >= max_shifts_allowed[shift]:
-                    score -= 100  # 최대 근무 횟수 초과 시 큰 패널티
-                
-                # 아직 한 번도 배정되지 않은 근무 유형에 대해 우선 배정
-                if shift != 'OFF' and nurse_shifts[nurse_id].get(shift, 0) == 0:
-                    score += 30  # 아직 배정되지 않은 근무 유형에 높은 점수 부여
-                
-                # 목표 근무 횟수와의 차이에 따른 보정 점수 추가
-                if not nurse.is_night_keeper and shift in ['D', 'E', 'N'] and nurse_id in target_shifts_per_nurse:
-                    target = target_shifts_per_nurse[nurse_id].get(shift, 0)
-                    current = nurse_shifts[nurse_id].get(shift, 0)
-                    
-                    # 목표보다 적게 배정된 경우 점수 추가
-                    if current < target:
-                        # 목표와의 차이가 클수록 더 높은 점수 (최대 35점)
-                        gap_score = min(35, 25 * (target - current) / target)
-                        score += gap_score
-                    # 목표보다 많이 배정된 경우 점수 감소
-                    elif current > target:
-                        # 초과 정도에 비례해 패널티 부여 (최대 50점)
-                        excess_penalty = min(50, 40 * (current - target) / target)
-                        score -= excess_penalty
-                
-                # 패턴 점수 추가
-                pattern_score = calculate_pattern_score(nurse_id, date, shift, last_5_shifts)
-                score += pattern_score
-                
-                # 특정 패턴 강화 - 자연스러운 로테이션 (D→E→N→OFF 순환 강화)
-                recent_shifts = last_5_shifts.get(nurse_id, [])
-                if recent_shifts:
-                    last_shift = recent_shifts[-1]
-                    # 주/저녁/야간/휴무의 순환 패턴 강화
-                    natural_rotation = {
-                        'D': 'E',  # 주간근무 후 저녁근무 선호
-                        'E': 'N',  # 저녁근무 후 야간근무 선호
-                        'N': 'OFF',  # 야간근무 후 휴무 강력 선호
-                        'OFF': 'D'   # 휴무 후 주간근무로 시작 선호
-                    }
-                    
-                    # 자연스러운 순환이면 추가 점수 (대폭 증가)
-                    if natural_rotation.get(last_shift) == shift:
-                        score += 50  # 순환 근무 패턴 강화를 위해 점수 증가
-                    # 역방향 순환에는 패널티
-                    elif natural_rotation.get(shift) == last_shift:
-                        score -= 40  # 역방향 순환에 패널티
-                
-                # 연속 근무/휴무 제한
-                consecutive_count = 0
-                for s in reversed(recent_shifts):
-                    if s == shift:
-                        consecutive_count += 1
-                    else:
-                        break
-                
-                # 연속 제한 - 같은 근무 타입이 너무 많이 연속되지 않도록
-                max_consecutive = {
-                    'D': 3,  # 최대 3일 연속 주간 근무 (감소)
-                    'E': 3,  # 최대 3일 연속 저녁 근무 (감소)
-                    'N': 2,  # 최대 2일 연속 야간 근무
-                    'OFF': 2  # 최대 2일 연속 휴무
-                }
-                
-                if consecutive_count >= max_consecutive[shift]:
-                    score -= 45  # 연속 제한 초과 시 강한 패널티
-                
-                # 후보 리스트에 추가
-                shift_candidates.append((score, shift))
-            
-            # 점수로 정렬
-            shift_candidates.sort(reverse=True)
-            
-            # 최적의 근무 선택
-            if not shift_candidates:
-                return 'OFF'  # 가능한 근무가 없으면 OFF 반환
-            
-            best_score, best_shift = shift_candidates[0]
-            
-            # 최종 일정에 추가
-            final_schedule[(nurse_id, date)] = best_shift
-            
-            # 간호사별 근무 카운트 업데이트
-            nurse_shifts[nurse_id][best_shift] = nurse_shifts[nurse_id].get(best_shift, 0) + 1
-            
-            # 일일 필요 인원 업데이트
-            if best_shift != 'OFF':
-                daily_shift_requirements[date][best_shift] -= 1
-            
-            # 마지막 5개 근무 기록 업데이트
-            last_5_shifts[nurse_id] = last_5_shifts.get(nurse_id, [])[-4:] + [best_shift]
-            
-            # 스킬 요구사항 업데이트
-            update_skill_requirements(nurse_id, date, best_shift)
-            
-            return best_shift
-        
-        # 스케줄 생성 완료 후 숙련도 1 간호사에 대한 추가 교육 배정
-        for date in date_range:
-            for shift_type in ['D', 'E', 'N']:
-                # 해당 shift_type에 대해 이미 배정된 간호사 숫자 확인
-                assigned_count = sum(1 for (n_id, d), s in final_schedule.items() if d == date and s == shift_type)
-                required_count = daily_shift_requirements[date][shift_type]
-                
-                # 해당 근무에 숙련도 1인 간호사 중 아직 배정되지 않은 간호사 찾기
-                if assigned_count >= required_count:  # 필요 인원이 이미 채워진 경우만 추가 교육 고려
-                    trainee_candidates = []
-                    for nurse in nurse_list:
-                        if nurse.skill_level == 1 and not nurse.is_night_keeper:
-                            # 해당 날짜에 배정되지 않았는지 확인
-                            if (nurse.id, date) not in final_schedule:
-                                # 유효한 배정인지 확인
-                                if is_valid_assignment(nurse.id, date, shift_type):
-                                    trainee_candidates.append(nurse.id)
-                    
-                    # 후보자 중 한 명을 교육용으로 추가 배정
-                    if trainee_candidates:
-                        try:
-                            trainee_id = random.choice(trainee_candidates)
-                            final_schedule[(trainee_id, date)] = shift_type
-                            
-                            # nurse_shift_counts 초기화 확인 및 안전한 업데이트
-                            if trainee_id not in nurse_shift_counts:
-                                nurse_shift_counts[trainee_id] = {'D': 0, 'E': 0, 'N': 0}
-                            
-                            nurse_shift_counts[trainee_id][shift_type] += 1
-                            # 추가 교육 목적으로 배정되었음을 메타데이터로 표시할 수 있음
-                        except Exception as e:
-                            # 오류 발생 시 로그 출력
-                            print(f"Error in trainee assignment: {e}, trainee_id={trainee_id if 'trainee_id' in locals() else 'unknown'}")
-                            continue
-        
         # 특별한 날짜에 대한 처리 (휴일 등)
         for day in date_range:
             if is_holiday(day):
@@ -791,11 +664,11 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
         # 최종 스케줄 결과는 이미 위에서 선언되어 있으므로 제거합니다.
         # final_schedule = {}
         
-        # 간호사별 이전 근무 타입 추적
-        nurse_previous_shifts = {nurse.id: [] for nurse in nurse_list}
+        # 간호사별 이전 근무 타입 추적 (직전 기간의 근무에서 시작)
+        nurse_previous_shifts = {nurse.id: carry_over['last_shifts'][nurse.id][-5:] for nurse in nurse_list}
         
         # 간호사의 마지막 5개 근무 추적
-        last_5_shifts = {nurse.id: [] for nurse in nurse_list}
+        last_5_shifts = {nurse.id: carry_over['last_shifts'][nurse.id][-5:] for nurse in nurse_list}
         
         # 백업용 변수 초기화
         backup_shifts = {nurse.id: [] for nurse in nurse_list}
@@ -822,8 +695,8 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
         
         # 나이트 킵 간호사 먼저 배정 - 매일 N 근무 우선 배정
         night_keepers = [nurse for nurse in nurse_list if nurse.is_night_keeper]
-        if night_keepers:
-            messages.info(request, f'나이트 킵 간호사 {len(night_keepers)}명을 먼저 N 근무에 배정합니다.')
+        if engine == 'greedy' and night_keepers:
+            log.add('info', f'나이트 킵 간호사 {len(night_keepers)}명을 먼저 N 근무에 배정합니다.')
             
             # 일자별로 순회하며 나이트 킵 간호사에게 N 근무 배정
             day_idx = 0
@@ -831,15 +704,17 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 try:
                     # 연속 2일 N 근무 패턴(NN)을 우선적으로 시도
                     if day_idx + 1 < len(date_range):  # 다음 날이 범위 내에 있는지 확인
-                        # 오늘과 내일의 필요 N 근무 인원 확인 - 항상 4명으로 고정
-                        required_n_today = min(daily_shift_requirements[date_range[day_idx]]['N'], 4)
-                        required_n_tomorrow = min(daily_shift_requirements[date_range[day_idx + 1]]['N'], 4)
+                        # 오늘과 내일의 필요 N 근무 인원 확인
+                        required_n_today = daily_shift_requirements[date_range[day_idx]]['N']
+                        required_n_tomorrow = daily_shift_requirements[date_range[day_idx + 1]]['N']
                         
                         # 나이트 킵 간호사에게 연속 2일 N 근무 배정 시도
                         for nurse in night_keepers:
                             # 연속 2일(NN) 모두 배정할 근무가 남아있고, 필요 인원이 아직 미달인 경우에만 배정
+                            # 직전 상태(첫날은 직전 기간의 N 블록/OFF)에서 N을 시작할 수 있어야 함
                             if (nurse_shifts[nurse.id] >= 2 and 
-                                required_n_today > 0 and required_n_tomorrow > 0):
+                                required_n_today > 0 and required_n_tomorrow > 0 and
+                                is_legal(final_schedule.state_before(nurse.id, date_range[day_idx]), 'N', True)):
                                 
                                 # 숙련도 요구사항 확인
                                 today_skill_ok = update_skill_requirements(nurse.id, date_range[day_idx], 'N')
@@ -892,8 +767,8 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                     # 연속 N 배정이 안되면 단일 N 근무 배정 시도하지 않고 그냥 다음 날짜로 넘어감
                     day_idx += 1
                 except Exception as e:
-                    # 오류 발생 시 로그 출력하고 계속 진행
-                    print(f"Error in night keeper assignment: {e}, day_idx={day_idx}")
+                    # 오류 발생 시 보고서에 기록하고 계속 진행
+                    log.add('info', f"나이트킵 N 배정 오류: {e}", date_range[day_idx], 'N')
                     day_idx += 1  # 오류 발생한 날짜는 건너뜀
                     continue
         
@@ -902,11 +777,6 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
             """주어진 간호사, 날짜, 근무가 유효한지 검사하는 함수"""
             nonlocal final_schedule, skill_requirements, daily_shift_requirements
             
-            # 이전/이후 날짜 계산
-            prev_date = date - timedelta(days=1)
-            prev_2_date = date - timedelta(days=2)
-            next_date = date + timedelta(days=1)
-            
             # 간호사 정보 가져오기
             nurse = next((n for n in nurse_list if n.id == nurse_id), None)
             if not nurse:
@@ -926,8 +796,8 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 week_start = date - timedelta(days=date.weekday())
                 week_end = week_start + timedelta(days=6)
                 
-                # 같은 주 내 이미 배정된 근무일 수
-                week_work_days = 0
+                # 같은 주 내 이미 배정된 근무일 수 (시작일 이전 근무는 직전 기간에서 이어받음)
+                week_work_days = carry_over['prior_week_work'][nurse_id] if week_start < start_date else 0
                 current_day = week_start
                 while current_day <= week_end:
                     # 이전에 배정된 근무 확인
@@ -942,46 +812,11 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 if week_work_days >= 6:
                     return False
             
-            # 4. E근무 이후에는 D근무가 올 수 없다 (순환근무 패턴 강화)
-            if shift == 'D' and (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'E':
+            # 4~6. 근무 순서 규칙 (E→D 금지, N 다음 N/OFF, N→OFF→OFF, 나이트킵 NN/NNN)
+            # 간호사별 오토마톤 상태로 앞뒤 날짜를 다시 보지 않고 검사
+            if not final_schedule.allows(nurse_id, date, shift):
                 return False
             
-            # 5. N근무 이후에는 N근무 또는 2일 OFF여야 한다
-            if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'N':
-                # N 다음에는 N 또는 OFF만 가능
-                if shift != 'N' and shift != 'OFF':
-                    return False
-                
-                # N 다음에 OFF면, 그 다음날도 OFF여야 함
-                if shift == 'OFF' and next_date <= end_date:
-                    # 다음날이 범위 내에 있고 이미 배정되었으면 OFF여야 함
-                    if (nurse_id, next_date) in final_schedule and final_schedule[(nurse_id, next_date)] != 'OFF':
-                        return False
-            
-            # 6. 나이트킵 간호사는 NN 근무 또는 NNN 근무만 적용
-            if nurse.is_night_keeper and shift == 'N':
-                # N 근무를 시작할 때는 연속 2일 또는 3일 N을 보장해야 함
-                consecutive_n = 1  # 오늘 배정될 N 포함
-                
-                # 이전에 배정된 N 확인
-                if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'N':
-                    consecutive_n += 1
-                    if (nurse_id, prev_2_date) in final_schedule and final_schedule[(nurse_id, prev_2_date)] == 'N':
-                        consecutive_n += 1
-                
-                # 나이트킵 간호사가 단일 N을 시작하려면, 연속 2-3일 보장 필요
-                if consecutive_n == 1:  # 오늘부터 N 시작이면
-                    next_day = date + timedelta(days=1)
-                    next_2_day = date + timedelta(days=2)
-                    
-                    # 다음날이 범위 내이고 이미 OFF 외 다른 근무로 배정되었으면 N 배정 불가
-                    if next_day <= end_date and (nurse_id, next_day) in final_schedule and final_schedule[(nurse_id, next_day)] != 'N':
-                        return False
-                        
-                    # 최소 NN 패턴 필요, NNN도 가능
-                    if next_day > end_date:  # 다음날이 범위를 넘어가면 N 배정 불가
-                        return False
-            
             # 7. 숙련도에 따른 근무 배정 밸런스
             if shift != 'OFF':
                 # 숙련도 범주 결정 (1-2: 초급, 3-4: 중급, 5-6: 고급)
@@ -1019,11 +854,11 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
         # 최종 스케줄 결과는 이미 위에서 선언되어 있으므로 제거합니다.
         # final_schedule = {}
         
-        # 간호사별 이전 근무 타입 추적
-        nurse_previous_shifts = {nurse.id: [] for nurse in nurse_list}
+        # 간호사별 이전 근무 타입 추적 (직전 기간의 근무에서 시작)
+        nurse_previous_shifts = {nurse.id: carry_over['last_shifts'][nurse.id][-5:] for nurse in nurse_list}
         
         # 간호사의 마지막 5개 근무 추적
-        last_5_shifts = {nurse.id: [] for nurse in nurse_list}
+        last_5_shifts = {nurse.id: carry_over['last_shifts'][nurse.id][-5:] for nurse in nurse_list}
         
         # 백업용 변수 초기화
         backup_shifts = {nurse.id: [] for nurse in nurse_list}
@@ -1050,8 +885,8 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
         
         # 나이트 킵 간호사 먼저 배정 - 매일 N 근무 우선 배정
         night_keepers = [nurse for nurse in nurse_list if nurse.is_night_keeper]
-        if night_keepers:
-            messages.info(request, f'나이트 킵 간호사 {len(night_keepers)}명을 먼저 N 근무에 배정합니다.')
+        if engine == 'greedy' and night_keepers:
+            log.add('info', f'나이트 킵 간호사 {len(night_keepers)}명을 먼저 N 근무에 배정합니다.')
             
             # 일자별로 순회하며 나이트 킵 간호사에게 N 근무 배정
             day_idx = 0
@@ -1059,15 +894,17 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 try:
                     # 연속 2일 N 근무 패턴(NN)을 우선적으로 시도
                     if day_idx + 1 < len(date_range):  # 다음 날이 범위 내에 있는지 확인
-                        # 오늘과 내일의 필요 N 근무 인원 확인 - 항상 4명으로 고정
-                        required_n_today = min(daily_shift_requirements[date_range[day_idx]]['N'], 4)
-                        required_n_tomorrow = min(daily_shift_requirements[date_range[day_idx + 1]]['N'], 4)
+                        # 오늘과 내일의 필요 N 근무 인원 확인
+                        required_n_today = daily_shift_requirements[date_range[day_idx]]['N']
+                        required_n_tomorrow = daily_shift_requirements[date_range[day_idx + 1]]['N']
                         
                         # 나이트 킵 간호사에게 연속 2일 N 근무 배정 시도
                         for nurse in night_keepers:
                             # 연속 2일(NN) 모두 배정할 근무가 남아있고, 필요 인원이 아직 미달인 경우에만 배정
+                            # 직전 상태(첫날은 직전 기간의 N 블록/OFF)에서 N을 시작할 수 있어야 함
                             if (nurse_shifts[nurse.id] >= 2 and 
-                                required_n_today > 0 and required_n_tomorrow > 0):
+                                required_n_today > 0 and required_n_tomorrow > 0 and
+                                is_legal(final_schedule.state_before(nurse.id, date_range[day_idx]), 'N', True)):
                                 
                                 # 숙련도 요구사항 확인
                                 today_skill_ok = update_skill_requirements(nurse.id, date_range[day_idx], 'N')
@@ -1120,11 +957,46 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                     # 연속 N 배정이 안되면 단일 N 근무 배정 시도하지 않고 그냥 다음 날짜로 넘어감
                     day_idx += 1
                 except Exception as e:
-                    # 오류 발생 시 로그 출력하고 계속 진행
-                    print(f"Error in night keeper assignment: {e}, day_idx={day_idx}")
+                    # 오류 발생 시 보고서에 기록하고 계속 진행
+                    log.add('info', f"나이트킵 N 배정 오류: {e}", date_range[day_idx], 'N')
                     day_idx += 1  # 오류 발생한 날짜는 건너뜀
                     continue
         
+        # 패턴 DP 엔진 - 규칙을 만족하는 주간 패턴 조합으로 간호사별 근무표를 한 번에 생성
+        if engine == 'pattern':
+            budget.phase('패턴 생성')
+            log.add('info', f'패턴 DP 방식으로 간호사 {len(nurse_list)}명의 근무표를 생성합니다.')
+            
+            # 남은 필요 인원으로 근무 가격을 정하고, 나이트 킵 간호사부터 순서대로 근무표 확정
+            remaining_coverage = {day: dict(daily_shift_requirements[day]) for day in date_range}
+            # 누적 근무 통계(한 번 조회)로 간호사별 근무 가격 보정 - 지난 기간에 많이 한 근무는 덜 배정
+            ledger_offsets = balance_offsets(nurse_list, date_range, ledger)
+            ordered_nurses = night_keepers + random.sample(regular_nurses, len(regular_nurses))
+            
+            for nurse in ordered_nurses:
+                # 제한 시간이 지나면 남은 간호사는 OFF로 두고 보충 단계에서 채움
+                if budget.expired():
+                    break
+                prices = shift_prices(date_range, remaining_coverage, skill_requirements, nurse.skill_level)
+                prices = prices + ledger_offsets[nurse.id]
+                roster = build_roster(
+                    nurse.is_night_keeper,
+                    date_range,
+                    prices,
+                    wanted_off_days=wanted_offs.get(nurse.id, set()),
+                    work_target=nurse_shifts.get(nurse.id),
+                    initial_state=carry_over['states'][nurse.id],
+                    prior_week_work=carry_over['prior_week_work'][nurse.id],
+                )
+                
+                for day, shift in zip(date_range, roster):
+                    final_schedule[(nurse.id, day)] = shift
+                    if shift != 'OFF':
+                        remaining_coverage[day][shift] -= 1
+                        nurse_shift_counts[nurse.id][shift] += 1
+                        remaining_shifts_per_nurse[nurse.id] -= 1
+                        update_skill_requirements(nurse.id, day, shift)
+        
         # 5. 나머지 날짜는 OFF로 채우기
         for day in date_range:
             for nurse in nurse_list:
@@ -1154,9 +1026,10 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
         # 균형 조정 최대 시도 횟수 설정
         max_balance_attempts = 50
         balance_attempts = 0
+        budget.phase('균형 조정')
         
         # 균형이 맞지 않는 간호사들에 대해 근무 유형 교환 시도 - 강화된 버전
-        while unbalanced_nurses and balance_attempts < max_balance_attempts:
+        while unbalanced_nurses and balance_attempts < max_balance_attempts and not budget.expired():
             nurse_id, counts, max_diff = unbalanced_nurses[0]
             balance_attempts += 1
             
@@ -1174,10 +1047,6 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
             for day in date_range:
                 if (nurse_id, day) in final_schedule and final_schedule[(nurse_id, day)] == max_shift:
                     # 해당 날짜에 min_shift 배정이 가능한지 확인
-                    temp_schedule = copy.deepcopy(final_schedule)
-                    del temp_schedule[(nurse_id, day)]
-                    
-                    # 교체 가능한지 확인
                     if is_valid_assignment(nurse_id, day, min_shift):
                         # 교체 수행
                         final_schedule[(nurse_id, day)] = min_shift
@@ -1202,43 +1071,9 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                         if ((nurse_id, day) in final_schedule and final_schedule[(nurse_id, day)] == max_shift and
                             (other_id, day) in final_schedule and final_schedule[(other_id, day)] == min_shift):
                             
-                            # 교환 전에 유효성 검사
-                            temp_schedule = copy.deepcopy(final_schedule)
-                            temp_schedule[(nurse_id, day)] = min_shift
-                            temp_schedule[(other_id, day)] = max_shift
-                            
-                            valid_for_nurse = True
-                            valid_for_other = True
-                            
-                            # 교환이 제약조건을 위반하는지 검사
-                            for check_day in [day-timedelta(days=1), day+timedelta(days=1)]:
-                                if valid_for_nurse and (nurse_id, check_day) in final_schedule:
-                                    check_shift = min_shift
-                                    prev_or_next_shift = final_schedule[(nurse_id, check_day)]
-                                    
-                                    # 연속 근무 제약 위반 여부 확인
-                                    if ((check_shift == 'N' and prev_or_next_shift == 'E') or
-                                        (check_shift == 'D' and prev_or_next_shift == 'N') or
-                                        (check_shift == 'D' and prev_or_next_shift == 'E') or
-                                        # 추가된 제약 조건
-                                        (check_shift == 'E' and prev_or_next_shift == 'N') or  # E 근무 앞에 N 근무 금지
-                                        (check_shift == 'D' and prev_or_next_shift == 'N') or  # D 근무 앞에 N 근무 금지
-                                        (check_shift == 'E' and prev_or_next_shift == 'E')):   # E 근무 앞에 E 근무 금지
-                                        valid_for_nurse = False
-                                
-                                if valid_for_other and (other_id, check_day) in final_schedule:
-                                    check_shift = max_shift
-                                    prev_or_next_shift = final_schedule[(other_id, check_day)]
-                                    
-                                    # 연속 근무 제약 위반 여부 확인
-                                    if ((check_shift == 'N' and prev_or_next_shift == 'E') or
-                                        (check_shift == 'D' and prev_or_next_shift == 'N') or
-                                        (check_shift == 'D' and prev_or_next_shift == 'E') or
-                                        # 추가된 제약 조건
-                                        (check_shift == 'E' and prev_or_next_shift == 'N') or  # E 근무 앞에 N 근무 금지
-                                        (check_shift == 'D' and prev_or_next_shift == 'N') or  # D 근무 앞에 N 근무 금지
-                                        (check_shift == 'E' and prev_or_next_shift == 'E')):   # E 근무 앞에 E 근무 금지
-                                        valid_for_other = False
+                            # 교환 전에 유효성 검사 - 두 간호사의 오토마톤 상태로 순서 규칙 확인
+                            valid_for_nurse = final_schedule.allows(nurse_id, day, min_shift)
+                            valid_for_other = final_schedule.allows(other_id, day, max_shift)
                             
                             # OFF N OFF 패턴 검사 추가
                             # nurse_id에 대한 OFF N OFF 패턴 검사
@@ -1278,17 +1113,6 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                                 if prev_is_off and next_is_off:
                                     valid_for_other = False
                             
-                            # E 다음에 D가 오는 패턴 추가 검사
-                            if valid_for_nurse and min_shift == 'D':
-                                prev_date = day - timedelta(days=1)
-                                if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'E':
-                                    valid_for_nurse = False
-                            
-                            if valid_for_other and max_shift == 'D':
-                                prev_date = day - timedelta(days=1)
-                                if (other_id, prev_date) in final_schedule and final_schedule[(other_id, prev_date)] == 'E':
-                                    valid_for_other = False
-                            
                             if valid_for_nurse and valid_for_other:
                                 # 교환 수행
                                 final_schedule[(nurse_id, day)] = min_shift
@@ -1323,338 +1147,14 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 if unbalanced_nurses:  # 다음 간호사 있는 경우
                     unbalanced_nurses.sort(key=lambda x: x[2], reverse=True)
         
-        # 균형 조정 후에 다시 각 날짜별로 필요 인원수 확인 및 추가 배정
-        messages.info(request, "균형 조정 후 인원수 검증 및 추가 배정을 시작합니다.")
-        
-        # 정보 수집: 각 날짜/근무별 인원 부족 현황
-        staffing_shortages = []
-        for day in date_range:
-            for shift_type in ['D', 'E', 'N']:
-                required = daily_shift_requirements[day][shift_type]
-                
-                # 현재 배정된 수 확인
-                assigned_count = sum(1 for (n_id, d), s in final_schedule.items() 
-                                  if d == day and s == shift_type)
-                
-                if assigned_count < required:
-                    shortage = required - assigned_count
-                    staffing_shortages.append((day, shift_type, shortage))
-        
-        # 인원 부족이 심각한 순서로 정렬
-        staffing_shortages.sort(key=lambda x: x[2], reverse=True)
+        # 균형 조정 후 부족 인원을 날짜별 최소 비용 유량으로 한 번에 보충
+        budget.phase('부족 인원 보충')
+        repair_result = repair_coverage(final_schedule, nurse_list, date_range, coverage_requirements, off_requests, budget, prior_week_work=carry_over['prior_week_work'])
+        unfilled_count = sum(count for _, _, count in repair_result['unfilled'])
+        log.add('repair', f"부족 인원 보충: {len(repair_result['assigned'])}칸 신규 배정, {len(repair_result['moved'])}칸 근무 이동, {unfilled_count}명 미충원")
         
-        # 크게 부족한 날짜부터 추가 배정 시도
-        for day, shift_type, shortage in staffing_shortages:
-            messages.warning(request, f'{day.strftime("%Y-%m-%d")}에 {shift_type} 근무가 {shortage}명 부족합니다. 추가 배정을 시도합니다.')
-            
-            # 이미 해당 날짜에 배정된 간호사 목록
-            assigned_nurses_today = [n_id for (n_id, d), s in final_schedule.items() if d == day]
-            
-            # 배정 시도할 간호사 후보군
-            candidates = []
-            relaxed_candidates = []
-            extremely_relaxed_candidates = []  # 매우 완화된 제약 조건으로 배정 가능한 간호사
-            
-            for nurse in nurse_list:
-                nurse_id = nurse.id
-                
-                # 이미 오늘 배정된 간호사는 건너뛰기
-                if nurse_id in assigned_nurses_today:
-                    continue
-                
-                # 기본 검증 - 전체 제약 조건 확인
-                if remaining_shifts_per_nurse[nurse_id] > 0 and is_valid_assignment(nurse_id, day, shift_type):
-                    # 기본 점수 계산 - 균형 점수, 패턴 점수 등
-                    d_count = nurse_shift_counts[nurse_id]['D']
-                    e_count = nurse_shift_counts[nurse_id]['E']
-                    n_count = nurse_shift_counts[nurse_id]['N']
-                    
-                    total = sum([d_count, e_count, n_count])
-                    
-                    # 해당 근무 유형의 비율
-                    current_count = nurse_shift_counts[nurse_id][shift_type]
-                    shift_ratio = current_count / (total + 1)  # +1로 나누기 0 방지
-                    
-                    # 해당 타입 근무가 적으면 가산점
-                    if shift_type == 'D':
-                        balance_score = 100 * (0.4 - shift_ratio) if shift_ratio < 0.4 else 0
-                    elif shift_type == 'E':
-                        balance_score = 100 * (0.3 - shift_ratio) if shift_ratio < 0.3 else 0
-                    elif shift_type == 'N':
-                        balance_score = 100 * (0.33 - shift_ratio) if shift_ratio < 0.33 else 0
-                    else:
-                        balance_score = 50  # 아직 근무가 없으면 중간 점수
-                    
-                    # 근무 패턴 점수 - D→E→N 순환 패턴에 높은 점수
-                    pattern_score = 0
-                    
-                    # D→E→N 순환 패턴 우선 (이전 날짜 확인)
-                    prev_date = day - timedelta(days=1)
-                    if (nurse_id, prev_date) in final_schedule:
-                        prev_shift = final_schedule[(nurse_id, prev_date)]
-                        
-                        # D 다음 E 패턴 선호
-                        if prev_shift == 'D' and shift_type == 'E':
-                            pattern_score += 80
-                        
-                        # E 다음 N 패턴 선호
-                        elif prev_shift == 'E' and shift_type == 'N':
-                            pattern_score += 80
-                        
-                        # N 다음 OFF 다음에는 D 선호
-                        elif prev_shift == 'OFF' and shift_type == 'D':
-                            prev_2_date = day - timedelta(days=2)
-                            if (nurse_id, prev_2_date) in final_schedule and final_schedule[(nurse_id, prev_2_date)] == 'N':
-                                pattern_score += 80  # N→OFF→D 패턴에 높은 점수
-                    
-                    # 패턴 점수와 균형 점수를 합산하여 후보군에 추가
-                    total_score = pattern_score + balance_score
-                    candidates.append((total_score, nurse_id))
-                
-                # 완화된 검증 - 일부 선호 제약 조건 완화
-                elif remaining_shifts_per_nurse[nurse_id] > 0:
-                    # 제약 조건 완화 1 - 연속 근무 제한만 확인 (제약 조건 완화)
-                    can_assign_relaxed = True
-                    
-                    # 나이트 킵 간호사는 N 근무만 배정 가능 (이 조건은 절대 완화하지 않음)
-                    nurse = next((n for n in nurse_list if n.id == nurse_id), None)
-                    if nurse and nurse.is_night_keeper and shift_type != 'N':
-                        can_assign_relaxed = False
-                    
-                    # 기본 연속 근무 제약 조건만 확인 (3일 연속 근무 금지)
-                    consecutive_work_days = 0
-                    for i in range(1, 4):
-                        prev_date = day - timedelta(days=i)
-                        if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] != 'OFF':
-                            consecutive_work_days += 1
-                        else:
-                            break
-                    
-                    # 연속 근무 조건 완화 - 최대 5일까지 허용 (기본은 3일)
-                    if consecutive_work_days >= 5:
-                        can_assign_relaxed = False
-                    
-                    # N 근무 후 무조건 OFF 규칙만 준수 - 절대 완화하지 않음
-                    prev_date = day - timedelta(days=1)
-                    if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'N':
-                        can_assign_relaxed = False
-                    
-                    # 2일 전이 N 근무이고 어제가 OFF면 오늘도 무조건 OFF만 가능 - 절대 완화하지 않음
-                    prev_2_date = day - timedelta(days=2)
-                    if ((nurse_id, prev_2_date) in final_schedule and final_schedule[(nurse_id, prev_2_date)] == 'N') and \
-                       ((nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'OFF'):
-                        can_assign_relaxed = False
-                    
-                    # E 근무 다음날에 D 근무 금지 규칙도 유지
-                    if shift_type == 'D':
-                        if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'E':
-                            can_assign_relaxed = False
-                    
-                    # 가능하면 후보자 리스트에 추가
-                    if can_assign_relaxed:
-                        # 균형 점수 계산 (해당 타입의 근무가 적은 간호사 선호)
-                        d_count = nurse_shift_counts[nurse_id]['D']
-                        e_count = nurse_shift_counts[nurse_id]['E']
-                        n_count = nurse_shift_counts[nurse_id]['N']
-                        
-                        total = sum([d_count, e_count, n_count])
-                        avg = total / 3 if total > 0 else 0
-                        
-                        # 해당 근무 유형이 평균보다 적으면 높은 점수
-                        current_count = nurse_shift_counts[nurse_id][shift_type]
-                        balance_score = 30 if current_count < avg else 0
-                        
-                        # 남은 근무수가 많은 간호사 선호
-                        remaining_score = remaining_shifts_per_nurse[nurse_id] * 2
-                        
-                        relaxed_candidates.append((balance_score + remaining_score, nurse_id))
-                
-                # 극단적으로 완화된 제약조건 - 필수 제약 조건 최소화
-                elif remaining_shifts_per_nurse[nurse_id] > 0:
-                    # 극단적인 경우 N 근무 다음날 OFF만 반드시 지키도록 함
-                    can_extreme_assign = True
-                    
-                    # 나이트 킵 간호사는 N 근무만 배정 가능 (이 조건은 절대 완화하지 않음)
-                    nurse = next((n for n in nurse_list if n.id == nurse_id), None)
-                    if nurse and nurse.is_night_keeper and shift_type != 'N':
-                        can_extreme_assign = False
-                    
-                    # N 근무 후 무조건 OFF 규칙만 준수 - 절대 완화하지 않음
-                    prev_date = day - timedelta(days=1)
-                    if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'N':
-                        can_extreme_assign = False
-                    
-                    # 2일 전이 N 근무이고 어제가 OFF면 오늘도 무조건 OFF만 가능 - 절대 완화하지 않음
-                    prev_2_date = day - timedelta(days=2)
-                    if ((nurse_id, prev_2_date) in final_schedule and final_schedule[(nurse_id, prev_2_date)] == 'N') and \
-                       ((nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'OFF'):
-                        can_extreme_assign = False
-                    
-                    # E 근무 직후 D 근무 금지만 유지 (이 조건도 절대 완화하지 않음)
-                    if shift_type == 'D':
-                        if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'E':
-                            can_extreme_assign = False
-                    
-                    # 추가된 제약 조건 (절대 완화하지 않음)
-                    # E 근무 앞에 N 근무 금지
-                    if shift_type == 'E':
-                        if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'N':
-                            can_extreme_assign = False
-                    
-                    # D 근무 앞에 N 근무 금지
-                    if shift_type == 'D':
-                        if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'N':
-                            can_extreme_assign = False
-                    
-                    # E 근무 앞에 E 근무 금지
-                    if shift_type == 'E':
-                        if (nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'E':
-                            can_extreme_assign = False
-                    
-                    # 다른 제약 조건은 모두 완화 (주간 근무일 제한, 연속 근무일 제한 등)
-                    
-                    if can_extreme_assign:
-                        # 이런 경우 남은 근무수에 우선 배정
-                        remaining_score = remaining_shifts_per_nurse[nurse_id] * 3
-                        extremely_relaxed_candidates.append((remaining_score, nurse_id))
-            
-            # 점수가 높은 순으로 정렬
-            candidates.sort(reverse=True)
-            relaxed_candidates.sort(reverse=True)
-            extremely_relaxed_candidates.sort(reverse=True)
-            
-            # 배정 시도 - 가장 점수 높은 후보부터
-            assigned_count = 0
-            for _, nurse_id in candidates:
-                if assigned_count >= shortage:
-                    break
-                
-                # 근무 배정
-                final_schedule[(nurse_id, day)] = shift_type
-                remaining_shifts_per_nurse[nurse_id] -= 1
-                
-                # 간호사의 근무 유형 카운트 업데이트
-                nurse_shift_counts[nurse_id][shift_type] += 1
-                
-                # 간호사의 이전 근무 타입 기록 업데이트
-                nurse_previous_shifts[nurse_id].append(shift_type)
-                if len(nurse_previous_shifts[nurse_id]) > 3:
-                    nurse_previous_shifts[nurse_id].pop(0)
-                
-                assigned_count += 1
-                messages.success(request, f'{day.strftime("%Y-%m-%d")}에 간호사 {nurse_id}에게 {shift_type} 근무를 추가 배정했습니다.')
-            
-            # 아직 부족하면 완화된 제약 조건으로 추가 배정 시도
-            if assigned_count < shortage:
-                for _, nurse_id in relaxed_candidates:
-                    if assigned_count >= shortage:
-                        break
-                    
-                    # 이미 배정됐다면 건너뛰기
-                    if (nurse_id, day) in final_schedule:
-                        continue
-                    
-                    # 근무 배정 (완화된 제약 조건)
-                    final_schedule[(nurse_id, day)] = shift_type
-                    remaining_shifts_per_nurse[nurse_id] -= 1
-                    
-                    # 간호사의 근무 유형 카운트 업데이트
-                    nurse_shift_counts[nurse_id][shift_type] += 1
-                    
-                    # 간호사의 이전 근무 타입 기록 업데이트
-                    nurse_previous_shifts[nurse_id].append(shift_type)
-                    if len(nurse_previous_shifts[nurse_id]) > 3:
-                        nurse_previous_shifts[nurse_id].pop(0)
-                    
-                    assigned_count += 1
-                    messages.warning(request, f'{day.strftime("%Y-%m-%d")}에 간호사 {nurse_id}에게 완화된 제약으로 {shift_type} 근무를 배정했습니다.')
-            
-            # 여전히 부족하면 극단적으로 완화된 제약으로 추가 배정 시도
-            if assigned_count < shortage:
-                for _, nurse_id in extremely_relaxed_candidates:
-                    if assigned_count >= shortage:
-                        break
-                    
-                    # 이미 배정됐다면 건너뛰기
-                    if (nurse_id, day) in final_schedule:
-                        continue
-                    
-                    # 근무 배정 (극단적으로 완화된 제약 조건)
-                    final_schedule[(nurse_id, day)] = shift_type
-                    remaining_shifts_per_nurse[nurse_id] -= 1
-                    
-                    # 간호사의 근무 유형 카운트 업데이트
-                    nurse_shift_counts[nurse_id][shift_type] += 1
-                    
-                    # 간호사의 이전 근무 타입 기록 업데이트
-                    nurse_previous_shifts[nurse_id].append(shift_type)
-                    if len(nurse_previous_shifts[nurse_id]) > 3:
-                        nurse_previous_shifts[nurse_id].pop(0)
-                    
-                    assigned_count += 1
-                    messages.error(request, f'{day.strftime("%Y-%m-%d")}에 {shift_type} 근무에 심각한 인원 부족으로 간호사 {nurse_id}에게 극단적 제약 완화로 배정했습니다.')
-            
-            # 모든 시도 후에도 여전히 부족한 경우, 마지막 대안으로 OFF인 간호사를 찾아 재배정
-            if assigned_count < shortage:
-                # OFF 근무 간호사 찾기
-                for (n_id, d), s in final_schedule.items():
-                    if assigned_count >= shortage:
-                        break
-                        
-                    if d == day and s == 'OFF' and remaining_shifts_per_nurse[n_id] > 0:
-                        nurse = next((n for n in nurse_list if n.id == n_id), None)
-                        
-                        # 나이트 킵 간호사는 N 근무만 배정 가능 (이 조건은 절대 완화하지 않음)
-                        if nurse and nurse.is_night_keeper and shift_type != 'N':
-                            continue
-                            
-                        # N 근무 후 OFF 규칙만 준수 - 절대 완화하지 않음
-                        prev_date = day - timedelta(days=1)
-                        if (n_id, prev_date) in final_schedule and final_schedule[(n_id, prev_date)] == 'N':
-                            continue
-                            
-                        # 2일 전이 N 근무이고 어제가 OFF면 오늘도 무조건 OFF만 가능 - 절대 완화하지 않음
-                        prev_2_date = day - timedelta(days=2)
-                        if ((n_id, prev_2_date) in final_schedule and final_schedule[(n_id, prev_2_date)] == 'N') and \
-                           ((n_id, prev_date) in final_schedule and final_schedule[(n_id, prev_date)] == 'OFF'):
-                            continue
-                            
-                        # E 근무 다음날에 D 근무 금지 규칙도 유지
-                        if shift_type == 'D':
-                            if (n_id, prev_date) in final_schedule and final_schedule[(n_id, prev_date)] == 'E':
-                                continue
-                        
-                        # 추가된 제약 조건 (절대 완화하지 않음)
-                        # E 근무 앞에 N 근무 금지
-                        if shift_type == 'E':
-                            if (n_id, prev_date) in final_schedule and final_schedule[(n_id, prev_date)] == 'N':
-                                continue
-                        
-                        # D 근무 앞에 N 근무 금지
-                        if shift_type == 'D':
-                            if (n_id, prev_date) in final_schedule and final_schedule[(n_id, prev_date)] == 'N':
-                                continue
-                        
-                        # E 근무 앞에 E 근무 금지
-                        if shift_type == 'E':
-                            if (n_id, prev_date) in final_schedule and final_schedule[(n_id, prev_date)] == 'E':
-                                continue
-                        
-                        # OFF를 취소하고 필요한 근무 유형으로 재배정
-                        final_schedule[(n_id, day)] = shift_type
-                        
-                        # 간호사의 근무 유형 카운트 업데이트
-                        nurse_shift_counts[n_id][shift_type] += 1
-                        
-                        # 간호사의 이전 근무 타입 기록 업데이트
-                        nurse_previous_shifts[n_id].append(shift_type)
-                        if len(nurse_previous_shifts[n_id]) > 3:
-                            nurse_previous_shifts[n_id].pop(0)
-                        
-                        assigned_count += 1
-                        messages.error(request, f'{day.strftime("%Y-%m-%d")}에 {shift_type} 근무에 심각한 인원 부족으로 간호사 {n_id}의 OFF를 취소하고 재배정했습니다.')
-        
-        # 최종 스케줄 검증 및 필요 인원 보고서 생성
+        # 최종 스케줄 검증 및 필요 인원 보고서 생성 (규칙 검증은 제한 시간과 관계없이 항상 수행)
+        budget.phase('규칙 검증')
         final_verification_passed = True
         final_report = {}
         
@@ -1673,7 +1173,7 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 
                 if actual < required:
                     final_verification_passed = False
-                    messages.error(request, f'최종 검증: {day.strftime("%Y-%m-%d")}에 {shift_type} 근무가 {required-actual}명 부족합니다.')
+                    log.add('shortage', f'최종 검증: {day.strftime("%Y-%m-%d")}에 {shift_type} 근무가 {required-actual}명 부족합니다.', day, shift_type)
             
             final_report[day] = daily_report
         
@@ -1693,7 +1193,7 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 max_diff = max([abs(counts['D'] - avg), abs(counts['E'] - avg), abs(counts['N'] - avg)])
                 balance_info.append(f"{nurse.name}: D={counts['D']}, E={counts['E']}, N={counts['N']}, 편차={max_diff:.1f}")
         
-        messages.info(request, '각 간호사별 근무 유형 분포: ' + ' | '.join(balance_info))
+        log.add('info', '각 간호사별 근무 유형 분포: ' + ' | '.join(balance_info))
         
         # 최종 스케줄 검증 - 중요 제약 조건 확인
         validation_errors = []
@@ -1710,62 +1210,73 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                         shift = final_schedule[(nurse_id, day)]
                         if shift not in ['N', 'OFF']:
                             error_msg = f"심각한 오류: 나이트킵 간호사 {nurse.name}에게 {day.strftime('%Y-%m-%d')}에 {shift} 근무가 배정됨"
-                            validation_errors.append(error_msg)
+                            validation_errors.append((day, error_msg))
                             # 강제로 수정
                             final_schedule[(nurse_id, day)] = 'OFF'
             
-            # 연속 N 근무 후 2일 OFF 검증
-            for i, day in enumerate(date_range):
-                if (nurse_id, day) in final_schedule and final_schedule[(nurse_id, day)] == 'N':
-                    # 연속된 N 근무 확인
-                    is_last_n = True
-                    next_day = day + timedelta(days=1)
-                    
-                    # 다음날이 N이면 마지막 N이 아님
-                    if i < len(date_range) - 1 and (nurse_id, next_day) in final_schedule and final_schedule[(nurse_id, next_day)] == 'N':
-                        is_last_n = False
-                    
-                    # 마지막 N이면 다음 2일 OFF 확인
-                    if is_last_n:
-                        for j in range(1, 3):  # 다음 2일 확인
-                            if i + j < len(date_range):
-                                check_day = day + timedelta(days=j)
-                                if (nurse_id, check_day) in final_schedule:
-                                    if final_schedule[(nurse_id, check_day)] != 'OFF':
-                                        error_msg = f"심각한 오류: {nurse.name}의 {day.strftime('%Y-%m-%d')} N 근무 후 {check_day.strftime('%Y-%m-%d')}에 OFF가 아닌 {final_schedule[(nurse_id, check_day)]} 근무가 배정됨 (사유: N 근무 후 신체회복을 위해 반드시 2일의 OFF가 필요함)"
-                                        validation_errors.append(error_msg)
-                                        # 강제로 수정
-                                        final_schedule[(nurse_id, check_day)] = 'OFF'
-        
-        # 검증 오류 메시지 표시
-        if validation_errors:
-            for error in validation_errors:
-                messages.error(request, error)
-            messages.warning(request, "일부 제약 조건 위반이 감지되어 자동으로 수정되었습니다. (간호사 안전과 효율적 근무 환경을 위한 필수 제약조건 준수)")
+            # 연속 N 근무 후 2일 OFF 검증 - N 블록 직후 상태에서 허용되지 않는 근무를 오토마톤으로 확인
+            for day in date_range:
+                shift = final_schedule.get((nurse_id, day))
+                if shift is None or shift == 'OFF':
+                    continue
+                state = final_schedule.state_before(nurse_id, day)
+                if state in POST_NIGHT_STATES and not is_legal(state, shift, is_night_keeper):
+                    error_msg = f"심각한 오류: {nurse.name}의 N 근무 후 {day.strftime('%Y-%m-%d')}에 OFF가 아닌 {shift} 근무가 배정됨 (사유: N 근무 후 신체회복을 위해 반드시 2일의 OFF가 필요함)"
+                    validation_errors.append((day, error_msg))
+                    # 강제로 수정
+                    final_schedule[(nurse_id, day)] = 'OFF'
+        
+        # 검증 오류는 자동 수정한 규칙 위반으로 보고서에 기록
+        for day, error in validation_errors:
+            log.add('violation', error, day)
         
         # 단일 N 근무 및 OFF-N-OFF 패턴 검증 및 수정
         single_n_validation_errors = []
         
+        def week_work_days(nurse_id, week_start):
+            """해당 주의 근무일 수 (시작일 이전 근무는 직전 기간에서 이어받음)"""
+            count = carry_over['prior_week_work'][nurse_id] if week_start < start_date else 0
+            for offset in range(7):
+                if final_schedule.get((nurse_id, week_start + timedelta(days=offset)), 'OFF') != 'OFF':
+                    count += 1
+            return count
+        
+        last_prev_date = start_date - timedelta(days=1)
         for nurse in nurse_list:
             nurse_id = nurse.id
             
-            # 모든 날짜에 대해 검사
+            # 직전 기간 마지막 날의 N(전날은 N이 아님)은 첫날 N으로 이어 붙여야 단일 N이 되지 않음
+            # (직전 기간에서는 다음 날 근무를 알 수 없어 검사하지 않고 이 기간 첫날에 확인)
+            if (carry_over['shifts'].get((nurse_id, last_prev_date)) == 'N'
+                    and carry_over['shifts'].get((nurse_id, last_prev_date - timedelta(days=1))) != 'N'
+                    and final_schedule.get((nurse_id, start_date)) != 'N'):
+                first_week = start_date - timedelta(days=start_date.weekday())
+                if ((nurse_id, start_date) not in off_requests
+                        and final_schedule.get((nurse_id, start_date), 'OFF') == 'OFF'
+                        and week_work_days(nurse_id, first_week) < MAX_WORK_DAYS_PER_WEEK
+                        and final_schedule.allows(nurse_id, start_date, 'N')):
+                    final_schedule[(nurse_id, start_date)] = 'N'
+                    log.add('repair', f"단일 N 근무 수정: 직전 기간 마지막 날({last_prev_date.strftime('%Y-%m-%d')})의 N에 이어 {nurse.name}에게 {start_date.strftime('%Y-%m-%d')} N 근무 배정", start_date, 'N')
+                else:
+                    single_n_validation_errors.append((last_prev_date, f"단일 N 근무 감지: {nurse.name}의 {last_prev_date.strftime('%Y-%m-%d')}(직전 기간 마지막 날) N 근무를 이 기간 첫날 N으로 이을 수 없음"))
+            
+            # 모든 날짜에 대해 검사 (첫날의 전날 근무는 직전 기간에서 이어받음)
             for i, day in enumerate(date_range):
-                if i == 0 or i >= len(date_range) - 1:
-                    continue  # 첫날과 마지막 날은 패턴 검사에서 제외
+                if i >= len(date_range) - 1:
+                    continue  # 마지막 날의 N은 다음 기간 생성 때 위에서 첫날과 이어서 확인
                 
                 # 단일 N 근무 검사 (N 근무 앞뒤로 N이 아닌 경우)
                 if (nurse_id, day) in final_schedule and final_schedule[(nurse_id, day)] == 'N':
                     prev_date = day - timedelta(days=1)
                     next_date = day + timedelta(days=1)
                     
-                    prev_shift = final_schedule.get((nurse_id, prev_date), None)
+                    prev_shift = final_schedule.get((nurse_id, prev_date), carry_over['shifts'].get((nurse_id, prev_date)))
                     next_shift = final_schedule.get((nurse_id, next_date), None)
                     
                     # 단일 N 근무 감지 (앞뒤가 N이 아님)
                     if prev_shift != 'N' and next_shift != 'N':
                         error_msg = f"단일 N 근무 감지: {nurse.name}의 {day.strftime('%Y-%m-%d')}에 단일 N 근무가 배정됨"
-                        single_n_validation_errors.append(error_msg)
+                        single_n_validation_errors.append((day, error_msg))
                         
                         # N 근무를 OFF로 변경
                         final_schedule[(nurse_id, day)] = 'OFF'
@@ -1779,249 +1290,68 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                             if (other_nurse.id, day) in final_schedule and final_schedule[(other_nurse.id, day)] != 'OFF':
                                 continue
                             
-                            # 어제가 N이면 오늘은 OFF만 가능
-                            prev_1_date = day - timedelta(days=1)
-                            if (other_nurse.id, prev_1_date) in final_schedule and final_schedule[(other_nurse.id, prev_1_date)] == 'N':
-                                continue
-                            
-                            # 2일 전이 N이고 어제가 OFF면 오늘도 OFF만 가능
-                            prev_2_date = day - timedelta(days=2)
-                            if ((other_nurse.id, prev_2_date) in final_schedule and final_schedule[(other_nurse.id, prev_2_date)] == 'N') and \
-                               ((other_nurse.id, prev_1_date) in final_schedule and final_schedule[(other_nurse.id, prev_1_date)] == 'OFF'):
+                            # 원티드 OFF 요청이 있는 날은 제외 (NN으로 이어지는 다음 날 포함)
+                            if (other_nurse.id, day) in off_requests or (other_nurse.id, day + timedelta(days=1)) in off_requests:
                                 continue
                             
-                            # N 배정 후 다음 2일이 이미 다른 근무로 배정되어 있으면 N 배정 불가
-                            next_1_date = day + timedelta(days=1)
-                            next_2_date = day + timedelta(days=2)
+                            # NN + OFF 2일 블록 전체(기간 끝에서 자름)를 오토마톤으로 확인
+                            # (직전 N과 이어져 NNNN이 되거나, 뒤 근무와 충돌하는 간호사는 제외)
+                            block = ('N', 'N', 'OFF', 'OFF')[:(end_date - day).days + 1]
+                            block_dates = [day + timedelta(days=offset) for offset in range(len(block))]
                             
-                            if next_1_date <= end_date and (other_nurse.id, next_1_date) in final_schedule and final_schedule[(other_nurse.id, next_1_date)] != 'OFF' and final_schedule[(other_nurse.id, next_1_date)] != 'N':
+                            # 블록 자리에 이미 다른 근무가 있으면 그 근무를 지우게 되므로 제외
+                            if any(final_schedule.get((other_nurse.id, d), 'OFF') not in ('OFF', shift)
+                                   for d, shift in zip(block_dates, block)):
                                 continue
                             
-                            if next_2_date <= end_date and (other_nurse.id, next_2_date) in final_schedule and final_schedule[(other_nurse.id, next_2_date)] != 'OFF':
+                            if not final_schedule.allows_sequence(other_nurse.id, day, block):
                                 continue
                             
-                            # N 근무 배정 후 다음날도 N 근무로 지정
-                            final_schedule[(other_nurse.id, day)] = 'N'
+                            # NN 배정 후에도 주간 근무 상한을 넘지 않아야 함
+                            added_weeks = Counter(
+                                d - timedelta(days=d.weekday()) for d, shift in zip(block_dates, block)
+                                if shift == 'N' and final_schedule.get((other_nurse.id, d)) != 'N'
+                            )
+                            if any(week_work_days(other_nurse.id, week) + count > MAX_WORK_DAYS_PER_WEEK
+                                   for week, count in added_weeks.items()):
+                                continue
                             
-                            # 다음날이 아직 배정되지 않았거나 OFF면 N으로 배정
-                            if next_1_date <= end_date and ((other_nurse.id, next_1_date) not in final_schedule or final_schedule[(other_nurse.id, next_1_date)] == 'OFF'):
-                                final_schedule[(other_nurse.id, next_1_date)] = 'N'
-                                
-                                # N 근무 후 2일 OFF 예약
-                                for j in range(1, 3):
-                                    off_date = next_1_date + timedelta(days=j)
-                                    if off_date <= end_date:
-                                        final_schedule[(other_nurse.id, off_date)] = 'OFF'
+                            # 확인한 블록을 그대로 배정
+                            for d, shift in zip(block_dates, block):
+                                final_schedule[(other_nurse.id, d)] = shift
                             
-                            messages.success(request, f"단일 N 근무 수정: {day.strftime('%Y-%m-%d')}에 {nurse.name} 대신 {other_nurse.name}에게 N 근무 배정 (사유: 생체리듬 보호 및 효율적 인력 운영을 위해 연속 N 패턴 적용)")
+                            log.add('repair', f"단일 N 근무 수정: {day.strftime('%Y-%m-%d')}에 {nurse.name} 대신 {other_nurse.name}에게 N 근무 배정 (사유: 생체리듬 보호 및 효율적 인력 운영을 위해 연속 N 패턴 적용)", day, 'N')
                             break
                 
                 # OFF-N-OFF 패턴 검사
-                if i > 0 and i < len(date_range) - 1:
+                if i < len(date_range) - 1:
                     prev_date = day - timedelta(days=1)
                     next_date = day + timedelta(days=1)
                     
-                    if ((nurse_id, prev_date) in final_schedule and final_schedule[(nurse_id, prev_date)] == 'OFF') and \
+                    if final_schedule.get((nurse_id, prev_date), carry_over['shifts'].get((nurse_id, prev_date))) == 'OFF' and \
                        ((nurse_id, day) in final_schedule and final_schedule[(nurse_id, day)] == 'N') and \
                        ((nurse_id, next_date) in final_schedule and final_schedule[(nurse_id, next_date)] == 'OFF'):
                         
                         error_msg = f"OFF-N-OFF 패턴 감지: {nurse.name}의 {day.strftime('%Y-%m-%d')}에 단일 N 근무가 OFF 사이에 배정됨 (사유: 생체리듬 교란 방지 및 효율적 인력 활용을 위해 단일 N 패턴 제거)"
-                        single_n_validation_errors.append(error_msg)
+                        single_n_validation_errors.append((day, error_msg))
                         
                         # N 근무를 OFF로 변경
                         final_schedule[(nurse_id, day)] = 'OFF'
         
-        # 단일 N 근무 검증 오류 메시지 표시
-        if single_n_validation_errors:
-            for error in single_n_validation_errors:
-                messages.error(request, error)
-            messages.warning(request, "단일 N 근무 및 OFF-N-OFF 패턴이 감지되어 자동으로 수정되었습니다. (생체리듬 보호 및 효율적 인력 운영을 위한 연속 N 패턴 적용 필요)")
+        # 단일 N 근무 및 OFF-N-OFF 패턴도 자동 수정한 규칙 위반으로 기록
+        for day, error in single_n_validation_errors:
+            log.add('violation', error, day, 'N')
         
         # 일일 근무 인원수 검증 및 보완 (필요 인원수를 반드시 충족하도록)
-        messages.info(request, "일일 근무 인원수 최종 검증 및 보완 시작...")
-        daily_assignments = {}
+        # 검증 단계에서 OFF로 바뀐 칸까지 최소 비용 유량으로 다시 보충
+        budget.phase('최종 보완')
+        final_repair = repair_coverage(final_schedule, nurse_list, date_range, coverage_requirements, off_requests, budget, prior_week_work=carry_over['prior_week_work'])
         
-        # 일별 근무 배정 현황 파악
-        for (nurse_id, day), shift in final_schedule.items():
-            if shift in ['D', 'E', 'N']:
-                if (day, shift) not in daily_assignments:
-                    daily_assignments[(day, shift)] = []
-                daily_assignments[(day, shift)].append(nurse_id)
+        if final_repair['assigned'] or final_repair['moved']:
+            log.add('repair', f"최종 보완: {len(final_repair['assigned'])}칸 신규 배정, {len(final_repair['moved'])}칸 근무 이동")
         
-        # 부족한 인원 파악
-        additional_assignments_needed = []
-        total_shortage = 0
-        for day in date_range:
-            for shift_type in ['D', 'E', 'N']:
-                required = daily_shift_requirements[day][shift_type]
-                current = len(daily_assignments.get((day, shift_type), []))
-                
-                if current < required:
-                    shortage = required - current
-                    additional_assignments_needed.append((day, shift_type, shortage))
-                    total_shortage += shortage
-        
-        # 부족한 근무 배정 해결
-        if additional_assignments_needed:
-            messages.warning(request, f"{len(additional_assignments_needed)}개의 근무 인원 부족 문제 발견, 총 {total_shortage}명 부족. 추가 배정 시작.")
-            
-            # 부족한 인원이 많은 순서로 정렬
-            additional_assignments_needed.sort(key=lambda x: x[2], reverse=True)
-            
-            for day, shift_type, shortage in additional_assignments_needed:
-                day_idx = (day - start_date).days
-                messages.warning(request, f"{day.strftime('%Y-%m-%d')}의 {shift_type} 근무가 {shortage}명 부족합니다. 추가 배정 시작.")
-                
-                # 근무별 적합한 간호사 후보 찾기
-                candidates = []
-                
-                for nurse_id, nurse in nurses_by_id.items():
-                    # 이미 해당 날짜에 배정된 간호사는 건너뜀
-                    if (nurse_id, day) in final_schedule and final_schedule[(nurse_id, day)] != 'OFF':
-                        continue
-                    
-                    # 나이트 킵 간호사는 N 근무에만 배정 가능
-                    if nurse.is_night_keeper and shift_type != 'N':
-                        continue
-                    
-                    # 필수 제약 조건 확인 (Hard constraints)
-                    can_assign = True
-                    
-                    # 어제가 N이면 오늘은 OFF만 가능 (절대 완화 불가)
-                    prev_1_date = day - timedelta(days=1)
-                    if (nurse_id, prev_1_date) in final_schedule and final_schedule[(nurse_id, prev_1_date)] == 'N':
-                        can_assign = False
-                        continue
-                    
-                    # 2일 전이 N이고 어제가 OFF면 오늘도 OFF만 가능 (절대 완화 불가)
-                    prev_2_date = day - timedelta(days=2)
-                    if ((nurse_id, prev_2_date) in final_schedule and final_schedule[(nurse_id, prev_2_date)] == 'N') and \
-                       ((nurse_id, prev_1_date) in final_schedule and final_schedule[(nurse_id, prev_1_date)] == 'OFF'):
-                        can_assign = False
-                        continue
-                    
-                    # E 근무 다음 날에 D 근무 금지 (필수 규칙)
-                    if shift_type == 'D' and (nurse_id, prev_1_date) in final_schedule and final_schedule[(nurse_id, prev_1_date)] == 'E':
-                        can_assign = False
-                        continue
-                    
-                    # 일주일에 6회 이상 근무 금지 검증 (필수 규칙)
-                    # 현재 날짜가 속한 주의 시작일과 종료일 계산
-                    week_start = day - timedelta(days=day.weekday())
-                    week_end = week_start + timedelta(days=6)
-                    
-                    # 주간 근무 수 계산
-                    week_work_count = 0
-                    for d in [week_start + timedelta(days=i) for i in range(7)]:
-                        if d in date_range:  # 스케줄 범위 내의 날짜만 확인
-                            if (nurse_id, d) in final_schedule and final_schedule[(nurse_id, d)] in ['D', 'E', 'N']:
-                                week_work_count += 1
-                    
-                    # 현재 날짜에 근무 배정 시 주간 근무 수가 6을 초과하면 배정 금지
-                    if (nurse_id, day) not in final_schedule or final_schedule[(nurse_id, day)] == 'OFF':  # 새 근무 배정일 경우
-                        if week_work_count >= 6:
-                            can_assign = False
-                            continue
-                    
-                    # 연속 6일 이상 근무 금지 (필수 규칙)
-                    consecutive_work_days = 0
-                    for i in range(6):  # 오늘 기준 이전 5일 확인
-                        check_date = day - timedelta(days=i+1)
-                        if check_date >= start_date:  # 스케줄 범위 내의 날짜만 확인
-                            if (nurse_id, check_date) in final_schedule and final_schedule[(nurse_id, check_date)] in ['D', 'E', 'N']:
-                                consecutive_work_days += 1
-                            else:
-                                break  # 연속이 끊기면 중단
-                    
-                    # 이미 5일 연속 근무했다면 오늘은 OFF여야 함
-                    if consecutive_work_days >= 5:
-                        can_assign = False
-                        continue
-                    
-                    # 배정 가능한 경우 점수 계산
-                    if can_assign:
-                        # 근무 유형 분포 점수
-                        d_count = sum(1 for (n_id, d), s in final_schedule.items() if n_id == nurse_id and s == 'D')
-                        e_count = sum(1 for (n_id, d), s in final_schedule.items() if n_id == nurse_id and s == 'E')
-                        n_count = sum(1 for (n_id, d), s in final_schedule.items() if n_id == nurse_id and s == 'N')
-                        
-                        current_count = {'D': d_count, 'E': e_count, 'N': n_count}
-                        total_shifts = d_count + e_count + n_count
-                        
-                        if total_shifts > 0:
-                            # 현재 근무 유형의 비율이 낮은 간호사 선호
-                            shift_ratio = current_count[shift_type] / total_shifts
-                            balance_score = 100 * (0.33 - shift_ratio) if shift_ratio < 0.33 else 0
-                        else:
-                            balance_score = 50
-                        
-                        # 총 근무수가 적은 간호사 우선
-                        workload_score = 100 - (total_shifts * 5)  # 근무수가 적을수록 높은 점수
-                        
-                        # 최종 점수
-                        total_score = balance_score + workload_score
-                        candidates.append((total_score, nurse_id))
-                
-                # 점수 높은 순으로 정렬
-                candidates.sort(reverse=True)
-                
-                # 필요한 만큼 추가 배정
-                assigned_count = 0
-                for _, nurse_id in candidates:
-                    if assigned_count >= shortage:
-                        break
-                    
-                    nurse = nurses_by_id[nurse_id]
-                    
-                    # 최종 배정 전 제약 조건 확인
-                    can_final_assign = True
-                    
-                    # N 근무 배정 시 다음 2일 OFF 예약
-                    if shift_type == 'N':
-                        next_1_date = day + timedelta(days=1)
-                        next_2_date = day + timedelta(days=2)
-                        
-                        # 다음 날짜들에 OFF 배정 가능한지 확인
-                        if next_1_date <= end_date:
-                            # 다음 날이 이미 다른 근무로 배정되어 있고 N이 아니면 배정 불가
-                            if (nurse_id, next_1_date) in final_schedule and final_schedule[(nurse_id, next_1_date)] != 'N' and final_schedule[(nurse_id, next_1_date)] != 'OFF':
-                                can_final_assign = False
-                                continue
-                                
-                            # 다음 날이 N이 아니면 반드시 OFF 배정
-                            if (nurse_id, next_1_date) not in final_schedule or final_schedule[(nurse_id, next_1_date)] != 'N':
-                                final_schedule[(nurse_id, next_1_date)] = 'OFF'
-                                
-                        if next_2_date <= end_date:
-                            # 다음 날이 N이 아니면 다다음 날도 OFF 배정
-                            if next_1_date <= end_date and ((nurse_id, next_1_date) not in final_schedule or final_schedule[(nurse_id, next_1_date)] != 'N'):
-                                # 다다음 날이 이미 다른 근무로 배정되어 있으면 배정 불가
-                                if (nurse_id, next_2_date) in final_schedule and final_schedule[(nurse_id, next_2_date)] != 'OFF':
-                                    can_final_assign = False
-                                    # 앞서 배정한 OFF 취소
-                                    if next_1_date <= end_date and (nurse_id, next_1_date) in final_schedule and final_schedule[(nurse_id, next_1_date)] == 'OFF':
-                                        del final_schedule[(nurse_id, next_1_date)]
-                                    continue
-                                    
-                                # 다다음 날짜에 OFF 배정
-                                final_schedule[(nurse_id, next_2_date)] = 'OFF'
-                    
-                    # 최종 배정
-                    if can_final_assign:
-                        # 이전 배정이 있으면 OFF로 변경
-                        if (nurse_id, day) in final_schedule:
-                            final_schedule[(nurse_id, day)] = shift_type
-                        else:
-                            final_schedule[(nurse_id, day)] = shift_type
-                        
-                        # 배정 성공 카운트
-                        assigned_count += 1
-                        messages.success(request, f"{day.strftime('%Y-%m-%d')}에 {nurse.name}을(를) {shift_type} 근무에 추가 배정했습니다.")
-                
-                # 여전히 부족하면 경고
-                if assigned_count < shortage:
-                    remaining = shortage - assigned_count
-                    messages.error(request, f"{day.strftime('%Y-%m-%d')}의 {shift_type} 근무가 여전히 {remaining}명 부족합니다. 제약 조건으로 인해 더 이상 배정할 수 없습니다.")
+        for day, shift_type, remaining in final_repair['unfilled']:
+            log.add('shortage', f"{day.strftime('%Y-%m-%d')}의 {shift_type} 근무가 여전히 {remaining}명 부족합니다. 제약 조건으로 인해 더 이상 배정할 수 없습니다.", day, shift_type)
         
         # 11. 데이터베이스에 스케줄 저장
         # 최종 근무 인원 현황 파악 및 보고
@@ -2040,38 +1370,52 @@ def create_schedule_with_pattern(request, start_date, end_date, nurse_list, nurs
                 status = "충족" if current >= required else f"부족 ({current}/{required})"
                 staffing_report.append(f"{day.strftime('%Y-%m-%d')}의 {shift_type} 근무: {status}")
         
-        messages.info(request, "최종 근무 인원 현황: " + " | ".join(staffing_report[:10]) + (f" 외 {len(staffing_report)-10}건" if len(staffing_report) > 10 else ""))
+        log.add('info', "최종 근무 인원 현황: " + " | ".join(staffing_report[:10]) + (f" 외 {len(staffing_report)-10}건" if len(staffing_report) > 10 else ""))
         
         # 스케줄 저장 - 중복 방지 로직 추가
-        saved_count = 0
-        skipped_count = 0
-        for (nurse_id, date), shift in final_schedule.items():
-            try:
-                nurse = Nurse.objects.get(id=nurse_id)
-                # get_or_create 사용하여 중복 방지
-                schedule, created = Schedule.objects.get_or_create(
-                    nurse=nurse,
-                    date=date,
-                    defaults={'shift': shift}
-                )
-                
-                # 기존 스케줄이 있지만 근무 유형이 다른 경우 업데이트
-                if not created and schedule.shift != shift:
-                    schedule.shift = shift
-                    schedule.save()
-                
-                saved_count += 1
-            except Exception as e:
-                print(f"스케줄 저장 중 오류 발생: {str(e)}, 간호사 ID: {nurse_id}, 날짜: {date}, 근무: {shift}")
-                skipped_count += 1
+        budget.phase('저장')
+        # 기간의 기존 근무는 위에서 지웠으므로 배치로 한 번에 저장 (PostgreSQL은 COPY, 누적 근무 통계도 함께 갱신)
+        writer = ScheduleWriter(ward_id=ward_id)
+        for (nurse_id, day), shift in final_schedule.items():
+            if start_date <= day <= end_date:
+                writer.add(nurse_id, day, shift)
+        writer.flush()
+        saved_count = writer.written
+        budget.finish()
+        
+        # 제한 시간 안에 끝난 시드 지정 생성만 결과 캐시에 보관
+        if cache_key is not None and not budget.timed_out:
+            result_cache.put(
+                cache_key,
+                [(nurse_id, day, shift) for (nurse_id, day), shift in final_schedule.items()],
+                log.entries[cache_mark:],
+            )
         
-        messages.success(request, f'성공: 근무표가 생성되었습니다. {saved_count}개의 스케줄이 저장되었습니다. {skipped_count}개는 건너뛰었습니다.')
+        # 저장한 근무표를 적용 중인 후보로 후보 풀에 보관 (상위 후보는 다시 계산하지 않고 바꿔 적용 가능)
+        candidate = keep_generated(
+            [(nurse_id, day, shift) for (nurse_id, day), shift in final_schedule.items()],
+            nurse_list, start_date, end_date, shift_requirements, off_requests, carry_over['states'],
+            ward_id, engine, seed,
+        )
+        log.add('info', f'근무표 후보 #{candidate.id} (점수 {candidate.score:.0f})로 보관했습니다.')
+        
+        # 상세 내역은 보고서로 저장하고 화면 메시지는 한 줄 요약만 남김
+        report = log.save(start_date, end_date, engine, budget.report(), saved_count, ward_id)
+        summary = log.summary(saved_count, budget.elapsed())
+        if budget.timed_out:
+            messages.warning(request, f'{summary} - 제한 시간 {time_budget}초가 지나 "{budget.interrupted_phase}" 단계에서 탐색을 멈췄습니다. (보고서 #{report.id})')
+        else:
+            messages.success(request, f'{summary} (보고서 #{report.id})')
+        return {**budget.report(), 'report_id': report.id, 'cached': False}
         
     except Exception as e:
         # 오류 발생 시 로그 출력
         import traceback
         traceback.print_exc()
         messages.error(request, f'오류: 근무표 생성 중 오류가 발생했습니다. {str(e)}')
+        budget.finish()
+    
+    return budget.report()
         
 def regenerate_schedule(request):
     """기존 근무표를 동일한 조건으로 재생성하는 함수"""
@@ -2087,7 +1431,7 @@ def regenerate_schedule(request):
         nurses = Nurse.objects.all()
         
         # 2. 현재 근무 요구사항 정보 가져오기
-        staffing_requirements = StaffingRequirement.objects.all()
+        staffing_requirements = StaffingRequirement.objects.filter(ward__isnull=True)
         if not staffing_requirements.exists():
             messages.error(request, '근무별 필요 인원 설정이 되어 있지 않습니다.')
             return redirect('view_schedule')
@@ -2120,11 +1464,9 @@ def regenerate_schedule(request):
             nurse_shifts[nurse.id] = d_count + e_count + n_count
         
         # 6. 기존 스케줄 삭제
-        existing_schedules = Schedule.objects.filter(date__range=[min_date, max_date])
-        if existing_schedules.exists():
-            delete_count = existing_schedules.count()
-            existing_schedules.delete()
-            messages.info(request, f'기존 스케줄 {delete_count}개가 삭제되었습니다. 새 스케줄을 생성합니다.')
+        deleted = delete_schedules(min_date, max_date)
+        if deleted['deleted']:
+            messages.info(request, f'기존 스케줄 {deleted["deleted"]}개가 삭제되었습니다. 새 스케줄을 생성합니다.')
         
         # 7. 스케줄 생성 로직 호출 - 같은 간호사 구성, 같은 날짜 범위, 같은 필요 인원으로 재생성
         # 근무 패턴은 랜덤성으로 인해 달라질 수 있음
@@ -2138,17 +1480,14 @@ def regenerate_schedule(request):
         return redirect('view_schedule')
 
 def view_schedule(request):
-    """스케줄 조회 뷰"""
-    schedules = Schedule.objects.all().order_by('date')
+    """스케줄 조회 뷰 (보관된 달도 함께 표시)"""
+    # 날짜 범위 계산 - 근무 테이블과 보관 근무표 전체
+    min_date, max_date = schedule_bounds()
     
-    if not schedules.exists():
+    if min_date is None:
         messages.warning(request, '생성된 스케줄이 없습니다.')
         return render(request, 'scheduler/view_schedule.html', {'has_schedules': False})
     
-    # 날짜 범위 계산
-    min_date = schedules.order_by('date').first().date
-    max_date = schedules.order_by('-date').first().date
-    
     # 모든 간호사 정보 가져오기
     nurses = Nurse.objects.all().order_by('name')
     
@@ -2164,9 +1503,10 @@ def view_schedule(request):
     for nurse in nurses:
         schedule_data[nurse.id] = {}
         
-    for schedule in schedules:
+    for nurse_id, day, shift in schedule_rows(min_date, max_date):
         # 날짜를 문자열로 변환하지 않고 직접 사용
-        schedule_data[schedule.nurse.id][schedule.date] = schedule.shift
+        if nurse_id in schedule_data:
+            schedule_data[nurse_id][day] = shift
     
     # 변경 이력 가져오기
     shift_change_history = {}
@@ -2198,7 +1538,7 @@ def view_schedule(request):
     
     # 근무별 필요 인원 설정
     staffing_requirements = {}
-    for req in StaffingRequirement.objects.all():
+    for req in StaffingRequirement.objects.filter(ward__isnull=True):
         staffing_requirements[req.shift] = req.required_staff
     
     # 기본값 설정
@@ -2215,6 +1555,7 @@ def view_schedule(request):
         'staffing_requirements': staffing_requirements,
         'min_date': min_date,
         'max_date': max_date,
+        'wards': Ward.objects.all(),
         'has_schedules': True
     }
     
@@ -2224,16 +1565,13 @@ def analyze_schedule_view(request):
     """스케줄 분석 뷰"""
     from .utils import analyze_schedule
     
-    schedules = Schedule.objects.all().order_by('date')
+    # 날짜 범위 계산 - 근무 테이블과 보관 근무표 전체
+    min_date, max_date = schedule_bounds()
     
-    if not schedules.exists():
+    if min_date is None:
         messages.warning(request, '분석할 스케줄이 없습니다.')
         return redirect('generate_schedule')
     
-    # 날짜 범위 계산
-    min_date = schedules.order_by('date').first().date
-    max_date = schedules.order_by('-date').first().date
-    
     # 날짜 범위
     date_range = []
     current_date = min_date
@@ -2243,12 +1581,12 @@ def analyze_schedule_view(request):
     
     # 각 간호사별 스케줄 정보
     schedule_data = {}
-    for schedule in schedules:
-        schedule_data[(schedule.nurse.id, schedule.date)] = schedule.shift
+    for nurse_id, day, shift in schedule_rows(min_date, max_date):
+        schedule_data[(nurse_id, day)] = shift
     
     # 근무별 필요 인원 설정
     staffing_requirements = {}
-    for req in StaffingRequirement.objects.all():
+    for req in StaffingRequirement.objects.filter(ward__isnull=True):
         staffing_requirements[req.shift] = req.required_staff
     
     # 기본값 설정
@@ -2310,21 +1648,248 @@ def calculate_pattern_score(nurse_id, date, shift, last_5_shifts=None):
     # ... existing code ...
 
 def delete_schedule(request):
-    """모든 근무표를 삭제하는 기능"""
+    """
+    근무표를 삭제하는 기능
+
+    POST start_date/end_date(YYYY-MM-DD)를 주면 그 기간만, ward_id를 주면 그 병동 간호사의 근무만 지운다.
+    아무것도 주지 않으면 모든 근무표와 누적 근무 통계를 지운다. archive가 있으면 지우는 대신 보관한다.
+    """
     if request.method == 'POST':
         try:
-            # 모든 스케줄 삭제
-            Schedule.objects.all().delete()
-            
-            # 변경 이력도 삭제 (선택 사항)
-            try:
-                from .models import ShiftChangeHistory
-                ShiftChangeHistory.objects.all().delete()
-            except:
-                pass  # 변경 이력 삭제 실패해도 계속 진행
-                
-            messages.success(request, '모든 근무표가 성공적으로 삭제되었습니다.')
+            start_date = request.POST.get('start_date') or None
+            end_date = request.POST.get('end_date') or None
+            if start_date:
+                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            if end_date:
+                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            if start_date and end_date and start_date > end_date:
+                messages.error(request, '시작 날짜가 종료 날짜보다 늦습니다.')
+                return redirect('view_schedule')
+            ward_id = request.POST.get('ward_id') or None
+            archive = bool(request.POST.get('archive'))
+
+            # 근무 변경 이력도 같은 범위만큼 삭제 (보관할 때는 남김)
+            result = delete_schedules(start_date, end_date, ward_id=int(ward_id) if ward_id else None,
+                                      archive=archive, history=not archive)
+            if archive:
+                messages.success(request, f'근무 {result["archived"]}칸을 보관했습니다.')
+            elif start_date or end_date or ward_id:
+                messages.success(request, f'근무 {result["deleted"] + result["cleared"]}칸을 삭제했습니다.')
+            else:
+                messages.success(request, '모든 근무표가 성공적으로 삭제되었습니다.')
         except Exception as e:
             messages.error(request, f'근무표 삭제 중 오류가 발생했습니다: {str(e)}')
     
     return redirect('view_schedule')
+
+REPORT_PAGE_SIZE = 50  # 보고서 화면 한 페이지의 항목 수
+
+def generation_reports(request):
+    """근무표 생성 보고서 목록 (최근 순, 페이지 단위)"""
+    page = Paginator(GenerationReport.objects.select_related('ward'), REPORT_PAGE_SIZE).get_page(request.GET.get('page'))
+    return render(request, 'scheduler/generation_reports.html', {'page': page})
+
+def generation_report(request, pk):
+    """근무표 생성 보고서 상세 - 종류별 항목 수와 항목 목록 (GET kind로 종류 필터, page로 페이지 이동)"""
+    report = get_object_or_404(GenerationReport.objects.select_related('ward'), pk=pk)
+    counts = dict(report.entries.order_by().values_list('kind').annotate(count=models.Count('id')))
+    kind = request.GET.get('kind', '')
+    entries = report.entries.all()
+    if kind in dict(GenerationReportEntry.KIND_CHOICES):
+        entries = entries.filter(kind=kind)
+    else:
+        kind = ''
+    page = Paginator(entries, REPORT_PAGE_SIZE).get_page(request.GET.get('page'))
+    return render(request, 'scheduler/generation_report.html', {
+        'report': report,
+        'page': page,
+        'kind': kind,
+        'kinds': [(value, label, counts.get(value, 0)) for value, label in GenerationReportEntry.KIND_CHOICES],
+    })
+
+def parse_shift_edits(request):
+    """
+    근무 수정 요청 파싱
+
+    JSON 본문 {"edits": [{"nurse_id", "date", "shift"}, ...], "strict": bool, "repair": bool} 또는
+    단일 칸 폼 데이터(nurse_id, date, shift, strict, repair)를 받아 ({(nurse_id, date): shift}, strict, repair)로 변환
+    """
+    if request.content_type == 'application/json':
+        payload = json.loads(request.body or b'{}')
+        if not isinstance(payload, dict):
+            raise ValueError('요청 본문은 JSON 객체여야 합니다.')
+        if not isinstance(payload.get('edits', []), list):
+            raise ValueError('edits는 목록이어야 합니다.')
+    else:
+        payload = {
+            'edits': [{
+                'nurse_id': request.POST.get('nurse_id'),
+                'date': request.POST.get('date'),
+                'shift': request.POST.get('shift'),
+            }],
+            'strict': request.POST.get('strict') in ('1', 'true', 'on'),
+            'repair': request.POST.get('repair') in ('1', 'true', 'on'),
+        }
+    
+    valid_shifts = {code for code, _ in Schedule.SHIFT_CHOICES}
+    edits = {}
+    for item in payload.get('edits', []):
+        if not isinstance(item, dict):
+            raise ValueError(f'수정 항목은 JSON 객체여야 합니다: {item}')
+        shift = item['shift']
+        if shift not in valid_shifts:
+            raise ValueError(f'알 수 없는 근무 코드입니다: {shift}')
+        day = datetime.strptime(item['date'], '%Y-%m-%d').date()
+        edits[(int(item['nurse_id']), day)] = shift
+    return edits, bool(payload.get('strict')), bool(payload.get('repair'))
+
+def edit_shifts(request):
+    """
+    근무 칸 수정 (단일/다중) - 변경 이력과 함께 저장하고 영향받는 규칙 구간만 다시 검사
+
+    repair이면 수정한 칸을 고정하고 주변 구간을 국소 보정(repair_locally)해 규칙 위반과 부족 인원을 함께 고침
+    """
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'POST 요청만 지원합니다.'}, status=405)
+    
+    try:
+        edits, strict, repair = parse_shift_edits(request)
+    except (ValueError, KeyError, TypeError) as e:
+        return JsonResponse({'status': 'error', 'message': f'잘못된 수정 요청입니다: {e}'}, status=400)
+    
+    if not edits:
+        return JsonResponse({'status': 'error', 'message': '수정할 근무가 없습니다.'}, status=400)
+    
+    nurse_ids = {nurse_id for nurse_id, _ in edits}
+    if Nurse.objects.filter(id__in=nurse_ids).count() != len(nurse_ids):
+        return JsonResponse({'status': 'error', 'message': '존재하지 않는 간호사가 포함되어 있습니다.'}, status=400)
+    
+    # 저장과 재검사를 한 트랜잭션에서 처리 - strict 모드에서 위반이 있으면 되돌림
+    unfilled = []
+    with transaction.atomic():
+        if repair:
+            # 주변 구간에서 함께 바뀐 칸도 변경 이력과 재검사 대상에 포함
+            result = repair_locally(edits)
+            changes = result['changes']
+            unfilled = result['unfilled']
+        else:
+            # 수정 전 근무 조회 후 실제로 바뀌는 칸만 저장
+            edit_days = [day for _, day in edits]
+            previous = {
+                (nurse_id, day): shift
+                for nurse_id, day, shift in schedule_rows(min(edit_days), max(edit_days), nurse_ids)
+            }
+            changes = [
+                (nurse_id, day, previous.get((nurse_id, day)), shift)
+                for (nurse_id, day), shift in edits.items()
+                if previous.get((nurse_id, day)) != shift
+            ]
+            if changes:
+                save_changes(changes)
+        violations = validate_edit_windows(set(edits) | {(nurse_id, day) for nurse_id, day, _, _ in changes})
+        saved = not (strict and violations)
+        if not saved:
+            transaction.set_rollback(True)
+    
+    return JsonResponse({
+        'status': 'ok' if saved else 'rejected',
+        'saved': saved,
+        'changes': [
+            {'nurse_id': nurse_id, 'date': day, 'previous_shift': prev, 'new_shift': shift}
+            for nurse_id, day, prev, shift in changes
+        ],
+        'violations': violations,
+        'unfilled': [{'date': day, 'shift': shift, 'count': count} for day, shift, count in unfilled],
+    }, status=200 if saved else 409)
+
+def substitute_candidates(request):
+    """대체 근무자 후보 조회 - GET date, shift, nurse_id(빠지는 간호사, 선택), ward_id(빠지는 간호사가 없을 때 병동, 선택), limit"""
+    try:
+        day = datetime.strptime(request.GET['date'], '%Y-%m-%d').date()
+        shift = request.GET['shift']
+        if shift not in ('D', 'E', 'N'):
+            raise ValueError(f'알 수 없는 근무 코드입니다: {shift}')
+        absent_nurse_id = int(request.GET['nurse_id']) if request.GET.get('nurse_id') else None
+        ward_id = int(request.GET['ward_id']) if request.GET.get('ward_id') else None
+        limit = int(request.GET.get('limit', 10))
+    except (KeyError, ValueError) as e:
+        return JsonResponse({'status': 'error', 'message': f'잘못된 조회 요청입니다: {e}'}, status=400)
+    
+    candidates = find_substitutes(day, shift, absent_nurse_id, limit, ward_id)
+    return JsonResponse({'status': 'ok', 'date': day, 'shift': shift, 'candidates': candidates})
+
+def swap_partners(request):
+    """근무 교환 상대 조회 - GET nurse_id, date, any_skill(숙련도 범주 무시, 선택), limit"""
+    try:
+        nurse_id = int(request.GET['nurse_id'])
+        day = datetime.strptime(request.GET['date'], '%Y-%m-%d').date()
+        limit = int(request.GET.get('limit', 10))
+    except (KeyError, ValueError) as e:
+        return JsonResponse({'status': 'error', 'message': f'잘못된 조회 요청입니다: {e}'}, status=400)
+    
+    same_skill_category = request.GET.get('any_skill') not in ('1', 'true')
+    partners = find_swap_partners(nurse_id, day, same_skill_category, limit)
+    return JsonResponse({'status': 'ok', 'nurse_id': nurse_id, 'date': day, 'partners': partners})
+
+def candidate_summary(candidate):
+    """근무표 후보 목록/상세 응답에 공통으로 넣는 정보"""
+    return {
+        'id': candidate.id,
+        'start_date': candidate.start_date,
+        'end_date': candidate.end_date,
+        'ward_id': candidate.ward_id,
+        'engine': candidate.engine,
+        'seed': candidate.seed,
+        'score': candidate.score,
+        'metrics': candidate.metrics,
+        'is_active': candidate.is_active,
+        'created_at': candidate.created_at,
+    }
+
+def roster_candidates(request):
+    """기간의 근무표 후보 목록 (점수 순) - GET start_date, end_date, ward_id(선택)"""
+    try:
+        start_date = datetime.strptime(request.GET['start_date'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.GET['end_date'], '%Y-%m-%d').date()
+        ward_id = int(request.GET['ward_id']) if request.GET.get('ward_id') else None
+    except (KeyError, ValueError) as e:
+        return JsonResponse({'status': 'error', 'message': f'잘못된 조회 요청입니다: {e}'}, status=400)
+    
+    candidates = period_candidates(start_date, end_date, ward_id).defer('packed')
+    return JsonResponse({'status': 'ok', 'candidates': [candidate_summary(candidate) for candidate in candidates]})
+
+def roster_candidate(request, pk):
+    """근무표 후보 미리 보기 - 간호사별 근무 문자열 (D/E/N, OFF는 O)"""
+    candidate = get_object_or_404(RosterCandidate, pk=pk)
+    names = dict(Nurse.objects.filter(id__in=[int(nurse_id) for nurse_id in candidate.packed]).values_list('id', 'name'))
+    rows = [
+        {'nurse_id': int(nurse_id), 'name': names.get(int(nurse_id)), 'shifts': codes}
+        for nurse_id, codes in sorted(candidate.packed.items(), key=lambda item: int(item[0]))
+    ]
+    return JsonResponse({'status': 'ok', 'candidate': candidate_summary(candidate), 'rows': rows})
+
+def compare_roster_candidates(request):
+    """같은 기간의 두 근무표 후보 비교 - GET first, second (후보 id)"""
+    try:
+        first = RosterCandidate.objects.get(pk=int(request.GET['first']))
+        second = RosterCandidate.objects.get(pk=int(request.GET['second']))
+    except (KeyError, ValueError, RosterCandidate.DoesNotExist) as e:
+        return JsonResponse({'status': 'error', 'message': f'잘못된 비교 요청입니다: {e}'}, status=400)
+    if (first.start_date, first.end_date, first.ward_id) != (second.start_date, second.end_date, second.ward_id):
+        return JsonResponse({'status': 'error', 'message': '같은 기간의 후보끼리만 비교할 수 있습니다.'}, status=400)
+    
+    comparison = compare_candidates(first, second)
+    return JsonResponse({
+        'status': 'ok',
+        'first': candidate_summary(first),
+        'second': candidate_summary(second),
+        'differences': comparison['differences'],
+    })
+
+def activate_roster_candidate(request, pk):
+    """근무표 후보를 다시 계산하지 않고 근무표로 적용 (POST)"""
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'POST 요청만 허용됩니다.'}, status=405)
+    candidate = get_object_or_404(RosterCandidate, pk=pk)
+    saved = activate_candidate(candidate)
+    return JsonResponse({'status': 'ok', 'candidate': candidate_summary(candidate), 'saved': saved})
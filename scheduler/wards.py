@@ -0,0 +1,217 @@
+"""
+병동별 근무표 병렬 생성 모듈
+
+병동끼리는 간호사와 필요 인원이 겹치지 않으므로 서로 독립적으로 풀 수 있다.
+DB 조회와 저장은 주 프로세스에서 종류별로 한 번씩 모아서 하고, 계산(패턴 DP, 부족 인원 보충)만
+병동 단위 작업으로 작업자 프로세스에 나눠 맡긴다. 작업자는 DB에 접근하지 않는다.
+"""
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import django
+from django.db.models import Q
+
+from .arbitration import arbitrate_wanted_offs
+from .budget import TimeBudget
+from .feasibility import max_night_keeper_shifts
+from .horizon import load_carry_over
+from .ledger import load_ledger
+from .local_repair import DEFAULT_REQUIRED_STAFF
+from .models import Nurse, StaffingRequirement, WantedOff
+from .persistence import FLUSH_BATCH_SIZE, ScheduleWriter
+from .purge import delete_schedules
+from .reporting import GenerationLog
+from .solution_pool import keep_generated
+from .streaming import solve_window
+
+WORK_SHIFTS = ('D', 'E', 'N')
+
+# 병동 작업이 쓰는 생성 방식 (보고서, 후보 풀 기록용)
+WARD_ENGINE = 'pattern'
+
+# 작업자 프로세스로 보내는 간호사 정보 (모델 인스턴스 대신 가벼운 튜플)
+WardNurse = namedtuple('WardNurse', ['id', 'is_night_keeper', 'skill_level'])
+
+
+def ward_requirements(ward_ids):
+    """
+    병동별 근무 필요 인원을 한 번에 조회하는 함수
+
+    병동 설정이 없으면 병동 구분 없는 기본 설정, 그것도 없으면 DEFAULT_REQUIRED_STAFF를 쓴다.
+
+    Returns:
+        {ward_id: {'D': int, 'E': int, 'N': int}}
+    """
+    defaults = dict.fromkeys(WORK_SHIFTS, DEFAULT_REQUIRED_STAFF)
+    by_ward = {}
+    for ward_id, shift, required in StaffingRequirement.objects.filter(
+        Q(ward_id__in=list(ward_ids)) | Q(ward__isnull=True)
+    ).values_list('ward_id', 'shift', 'required_staff'):
+        if ward_id is None:
+            defaults[shift] = required
+        else:
+            by_ward.setdefault(ward_id, {})[shift] = required
+    return {ward_id: {**defaults, **by_ward.get(ward_id, {})} for ward_id in ward_ids}
+
+
+def even_targets(nurse_list, days, requirements):
+    """
+    병동 필요 근무 수를 간호사에게 고르게 나눈 목표 근무 수
+
+    나이트킵 간호사는 기간 내 최대 N 근무 수를 넘지 않게 잡고, 나머지를 일반 간호사에게 나눈다.
+    """
+    total = sum(requirements[shift] for shift in WORK_SHIFTS) * days
+    night_keepers = [nurse for nurse in nurse_list if nurse.is_night_keeper]
+    regular_nurses = [nurse for nurse in nurse_list if not nurse.is_night_keeper]
+    targets = {}
+    if night_keepers:
+        per_keeper = min(max_night_keeper_shifts(days), requirements['N'] * days // len(night_keepers))
+        for nurse in night_keepers:
+            targets[nurse.id] = per_keeper
+            total -= per_keeper
+    for nurse in regular_nurses:
+        targets[nurse.id] = max(0, round(total / len(regular_nurses)))
+    return targets
+
+
+def solve_ward(task):
+    """
+    작업자 프로세스에서 병동 하나의 근무표를 계산하는 함수 (DB 미사용)
+
+    Args:
+        task: generate_wards()가 만든 병동 작업 dict
+
+    Returns:
+        {'ward_id', 'rows': [(nurse_id, date, shift), ...], 'unfilled': [(date, shift, 부족 인원), ...],
+         'log': 병동 GenerationLog, 'budget': TimeBudget.report() 결과}
+    """
+    budget = TimeBudget()
+    log = GenerationLog()
+    nurses = [WardNurse(*row) for row in task['nurses']]
+    log.add('info', f"병동 작업: 간호사 {len(nurses)}명, 필요 인원 D={task['requirements']['D']}, "
+                    f"E={task['requirements']['E']}, N={task['requirements']['N']}")
+
+    budget.phase('패턴 DP')
+    roster, unfilled = solve_window(
+        nurses, task['date_range'], task['requirements'], task['carry'], task['off_requests'],
+        task['ledger'], task['targets'], random.Random(task['seed']),
+    )
+    budget.finish()
+    for day, shift, missing in unfilled:
+        log.add('shortage', f"{day.strftime('%Y-%m-%d')}의 {shift} 근무가 {missing}명 부족합니다.", day, shift)
+
+    rows = [(nurse_id, day, shift) for (nurse_id, day), shift in roster.items()]
+    return {'ward_id': task['ward_id'], 'rows': rows, 'unfilled': unfilled, 'log': log, 'budget': budget.report()}
+
+
+def generate_wards(ward_ids, start_date, end_date, workers=None, seed=None, batch_size=FLUSH_BATCH_SIZE):
+    """
+    여러 병동의 근무표를 작업자 프로세스에서 병렬로 생성하고 저장하는 함수
+
+    병동마다 생성 보고서(GenerationReport)와 적용 중인 후보(RosterCandidate)를 함께 남긴다.
+
+    Args:
+        ward_ids: 생성할 병동 id 목록
+        start_date: 시작 날짜
+        end_date: 종료 날짜
+        workers: 작업자 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 차례로 계산)
+        seed: 병동별 간호사 처리 순서를 정하는 난수 시드
+        batch_size: 한 번에 저장하는 근무 칸 수
+
+    Returns:
+        {
+            'wards': {ward_id: {'nurses': 간호사 수, 'saved': 저장한 칸 수,
+                                'unfilled': [(date, shift, 부족 인원), ...],
+                                'report_id': 생성 보고서 id, 'candidate_id': 후보 id}},
+            'elapsed': 소요 시간(초),
+        }
+    """
+    started = time.perf_counter()
+    ward_ids = list(ward_ids)
+    date_range = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+    # 병동 간호사, 필요 인원, 직전 상태, 누적 통계를 종류별로 한 번씩 조회
+    nurses = list(Nurse.objects.filter(ward_id__in=ward_ids))
+    nurses_by_ward = {ward_id: [] for ward_id in ward_ids}
+    for nurse in nurses:
+        nurses_by_ward[nurse.ward_id].append(nurse)
+    requirements = ward_requirements(ward_ids)
+    carry = load_carry_over(nurses, start_date)
+    ledger = load_ledger([nurse.id for nurse in nurses])
+
+    # 기간의 기존 근무표 삭제
+    delete_schedules(start_date, end_date, nurse_ids=[nurse.id for nurse in nurses])
+
+    # 원티드 OFF는 병동별 가능 인원으로 조정한 뒤 한 번에 조회
+    for ward_id in ward_ids:
+        if nurses_by_ward[ward_id]:
+            arbitrate_wanted_offs(nurses_by_ward[ward_id], start_date, end_date, requirements[ward_id])
+    off_requests = {}
+    ward_of = {nurse.id: nurse.ward_id for nurse in nurses}
+    for nurse_id, day in WantedOff.objects.filter(
+        date__range=[start_date, end_date], nurse_id__in=list(ward_of)
+    ).exclude(status='denied').values_list('nurse_id', 'date'):
+        off_requests.setdefault(ward_of[nurse_id], set()).add((nurse_id, day))
+
+    tasks = []
+    for order, ward_id in enumerate(ward_ids):
+        ward_nurses = nurses_by_ward[ward_id]
+        if not ward_nurses:
+            continue
+        nurse_ids = [nurse.id for nurse in ward_nurses]
+        tasks.append({
+            'ward_id': ward_id,
+            'nurses': [(nurse.id, nurse.is_night_keeper, nurse.skill_level) for nurse in ward_nurses],
+            'date_range': date_range,
+            'requirements': requirements[ward_id],
+            'carry': {key: {nurse_id: values[nurse_id] for nurse_id in nurse_ids}
+                      for key, values in carry.items() if key != 'shifts'},
+            'off_requests': off_requests.get(ward_id, set()),
+            'ledger': {nurse_id: ledger[nurse_id] for nurse_id in nurse_ids},
+            'targets': even_targets(ward_nurses, len(date_range), requirements[ward_id]),
+            'seed': None if seed is None else seed + order,
+        })
+
+    if workers == 1 or len(tasks) <= 1:
+        results = map(solve_ward, tasks)
+        executor = None
+    else:
+        # spawn 방식 플랫폼에서도 작업자가 모델을 불러올 수 있도록 Django 초기화
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+        results = executor.map(solve_ward, tasks)
+
+    report = {'wards': {}, 'elapsed': 0.0}
+    try:
+        for task, result in zip(tasks, results):
+            ward_id = result['ward_id']
+            writer = ScheduleWriter(batch_size, ward_id=ward_id)
+            for nurse_id, day, shift in result['rows']:
+                writer.add(nurse_id, day, shift)
+            writer.flush()
+
+            # 저장한 근무표를 병동의 적용 중인 후보로 보관하고 보고서 저장
+            log = result['log']
+            candidate = keep_generated(
+                result['rows'], nurses_by_ward[ward_id], start_date, end_date, requirements[ward_id],
+                off_requests.get(ward_id, set()), task['carry']['states'],
+                ward_id, WARD_ENGINE, task['seed'],
+            )
+            log.add('info', f'근무표 후보 #{candidate.id} (점수 {candidate.score:.0f})로 보관했습니다.')
+            generation_report = log.save(start_date, end_date, WARD_ENGINE, result['budget'], writer.written, ward_id)
+
+            report['wards'][ward_id] = {
+                'nurses': len(nurses_by_ward[ward_id]),
+                'saved': writer.written,
+                'unfilled': result['unfilled'],
+                'report_id': generation_report.id,
+                'candidate_id': candidate.id,
+            }
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    report['elapsed'] = round(time.perf_counter() - started, 3)
+    return report